@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 import sentry_sdk
@@ -65,6 +66,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'simple_history.middleware.HistoryRequestMiddleware',
+    'vacancies.history.HistoryFlushMiddleware',
 ]
 
 if DEBUG:
@@ -101,6 +103,63 @@ DATABASES = {
 }
 
 
+# Cache
+# Списки вакансий кэшируются в отдельном алиасе; бэкенд выбирается переменной
+# окружения VACANCY_CACHE_BACKEND: locmem, file или redis (любой сервер с
+# протоколом Redis, адрес в VACANCY_CACHE_URL). Поколение кэша хранится в нём
+# же, поэтому locmem (свой в каждом процессе) допустим только при DEBUG;
+# по умолчанию без DEBUG используется file, для нескольких серверов — redis.
+
+VACANCY_CACHE_ALIAS = 'vacancies'
+
+VACANCY_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vacancies',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('VACANCY_CACHE_URL', str(BASE_DIR / 'cache' / 'vacancies')),
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('VACANCY_CACHE_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    VACANCY_CACHE_ALIAS: {
+        **VACANCY_CACHE_BACKENDS[os.environ.get('VACANCY_CACHE_BACKEND', 'locmem' if DEBUG else 'file')],
+        'TIMEOUT': int(os.environ.get('VACANCY_CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': 'vacancies',
+    },
+}
+
+
+# History
+# Исторические записи simple_history (vacancies/history.py): sync — писать
+# сразу (по умолчанию), request — буферизовать до конца запроса, background —
+# сбрасывать фоновым потоком раз в HISTORY_BUFFER_INTERVAL секунд. Буфер
+# сбрасывается и при HISTORY_BUFFER_FLUSH_SIZE строках, и при завершении
+# процесса. Буферизация включается явно: до сброса истории нет в БД, а при
+# аварийном завершении процесса она теряется.
+
+HISTORY_BUFFER_MODE = os.environ.get('HISTORY_BUFFER_MODE', 'sync')
+HISTORY_BUFFER_FLUSH_SIZE = int(os.environ.get('HISTORY_BUFFER_FLUSH_SIZE', 500))
+HISTORY_BUFFER_INTERVAL = float(os.environ.get('HISTORY_BUFFER_INTERVAL', 1.0))
+
+# Политики команды compact_history поверх DEFAULT_RETENTION из vacancies/history.py:
+# keep_last — последние версии объекта, keep_days — все версии за N дней,
+# collapse — удалять правки без изменений.
+HISTORY_RETENTION = {
+    'vacancies.Application': {'keep_last': 10, 'keep_days': 90},
+    'vacancies.Vacancy': {'keep_last': 30, 'keep_days': 365},
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -145,6 +204,12 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# ModelBackend остаётся в списке: сессии хранят путь бэкенда, которым был выполнен вход
+AUTHENTICATION_BACKENDS = [
+    'vacancies.backends.StudentModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
 
@@ -1,10 +1,16 @@
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.urls import path
+from django.db.models import Count
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
 from import_export.formats import base_formats
 from simple_history.admin import SimpleHistoryAdmin
 
-from .models import Vacancy, Student, Company, Resume, Application, Skill
+from .exports import EXPORT_WRITERS, export_resource_rows
+from .models import Vacancy, Student, Company, Resume, Application, Skill, Review
+from .services import set_application_status
 
 
 class VacancyResource(resources.ModelResource):
@@ -15,14 +21,27 @@ class VacancyResource(resources.ModelResource):
 
     applications_count = resources.Field()  #количетсво заявок создаем поле, так как его нету в бд
 
+    def get_queryset(self):
+        # компания и число заявок одним запросом, без запросов на каждую строку
+        return (
+            super().get_queryset()
+            .select_related('company')
+            .annotate(applications_count=Count('applications'))
+        )
+
     def get_export_queryset(self, request):
-        queryset = super().get_export_queryset(request)
+        return self.filter_export(self.get_queryset())
+
+    def filter_export(self, queryset):
+        # выгружаются только активные вакансии
         return queryset.filter(status='active')
 
     def dehydrate_company(self, vacancy):
         return f"{vacancy.company.name} ({vacancy.company.industry})"
 
     def dehydrate_applications_count(self, vacancy):
+        if hasattr(vacancy, 'applications_count'):
+            return vacancy.applications_count
         return vacancy.applications.count()
 
 
@@ -37,6 +56,7 @@ class ApplicationInline(admin.TabularInline):
 class VacancyAdmin(ImportExportModelAdmin, SimpleHistoryAdmin):
     resource_class = VacancyResource
     formats = [base_formats.XLSX, base_formats.CSV]
+    import_export_change_list_template = 'admin/vacancies/vacancy/change_list.html'
     list_display = ['title', 'company', 'status', 'salary', 'published_at', 'get_applications_count']
     list_display_links = ['title', 'company']
     list_filter = ['status', 'employment_type', 'company', 'published_at']
@@ -63,11 +83,50 @@ class VacancyAdmin(ImportExportModelAdmin, SimpleHistoryAdmin):
     )
 
     inlines = [ApplicationInline]
+    list_select_related = ['company']
 
-    @admin.display(description='Количество заявок')
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(applications_count=Count('applications'))
+
+    @admin.display(description='Заявок', ordering='applications_count')
     def get_applications_count(self, obj):
-        return obj.applications.count()
-    get_applications_count.short_description = 'Заявок'
+        return obj.applications_count
+
+    def get_urls(self):
+        urls = [
+            path(
+                'export-stream/<str:file_format>/',
+                self.admin_site.admin_view(self.export_stream_view),
+                name='vacancies_vacancy_export_stream',
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def export_stream_view(self, request, file_format):
+        """Потоковая выгрузка активных вакансий из текущего фильтра changelist (формат csv или xlsx)."""
+        if not self.has_export_permission(request):
+            raise PermissionDenied
+        writer = EXPORT_WRITERS.get(file_format)
+        if writer is None:
+            raise Http404
+        resource = self.resource_class()
+        queryset = resource.filter_export(self.get_export_queryset(request)).order_by('pk')
+        return writer(
+            f'vacancies.{file_format}',
+            resource.get_export_headers(),
+            export_resource_rows(resource, queryset),
+        )
+
+
+def status_action(code, label):
+    """Действие changelist «сменить статус выбранных заявок на code» одним UPDATE."""
+    @admin.action(description=f'Сменить статус на «{label}»', permissions=['change'])
+    def action(modeladmin, request, queryset):
+        updated = set_application_status(queryset.values_list('pk', flat=True), code, request.user)
+        modeladmin.message_user(request, f'Статус «{label}» установлен заявкам: {updated}')
+
+    action.__name__ = f'set_status_{code}'
+    return action
 
 
 @admin.register(Application)
@@ -80,6 +139,8 @@ class ApplicationAdmin(ImportExportModelAdmin, SimpleHistoryAdmin):
     readonly_fields = ['submitted_at']
     date_hierarchy = 'submitted_at'
     raw_id_fields = ['student', 'vacancy', 'resume']
+    list_select_related = ['student', 'vacancy__company']
+    actions = [status_action(code, label) for code, label in Application.STATUS_CHOICES]
 
     fieldsets = (
         ('Основная информация', {
@@ -115,10 +176,11 @@ class StudentAdmin(SimpleHistoryAdmin):
     list_display_links = ['last_name', 'first_name']
     list_filter = ['course', 'faculty']
     search_fields = ['first_name', 'last_name', 'email']
+    raw_id_fields = ['user']
 
     fieldsets = (
         ('Личные данные', {
-            'fields': ('first_name', 'last_name', 'email', 'phone', 'birth_date', 'photo')
+            'fields': ('user', 'first_name', 'last_name', 'email', 'phone', 'birth_date', 'photo')
         }),
         ('Учебная информация', {
             'fields': ('course', 'specialty', 'group', 'faculty')
@@ -127,9 +189,12 @@ class StudentAdmin(SimpleHistoryAdmin):
 
     inlines = [ResumeInline]
 
-    @admin.display(description='Резюме')
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(resumes_count=Count('resumes'))
+
+    @admin.display(description='Резюме', ordering='resumes_count')
     def get_resumes_count(self, obj):
-        return obj.resumes.count()
+        return obj.resumes_count
 
 
 class VacancyInline(admin.TabularInline):
@@ -156,9 +221,12 @@ class CompanyAdmin(SimpleHistoryAdmin):
 
     inlines = [VacancyInline]
 
-    @admin.display(description='Вакансий')
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(vacancies_count=Count('vacancies'))
+
+    @admin.display(description='Вакансий', ordering='vacancies_count')
     def get_vacancies_count(self, obj):
-        return obj.vacancies.count()
+        return obj.vacancies_count
 
 
 @admin.register(Resume)
@@ -169,6 +237,7 @@ class ResumeAdmin(SimpleHistoryAdmin):
     search_fields = ['student__first_name', 'student__last_name', 'title']
     raw_id_fields = ['student', 'created_by', 'updated_by']
     filter_horizontal = ['skills']
+    list_select_related = ['student']
 
     fieldsets = (
         ('Основная информация', {
@@ -186,9 +255,12 @@ class ResumeAdmin(SimpleHistoryAdmin):
         }),
     )
 
-    @admin.display(description='Навыков')
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(skills_count=Count('skills'))
+
+    @admin.display(description='Навыков', ordering='skills_count')
     def get_skills_count(self, obj):
-        return obj.skills.count()
+        return obj.skills_count
 
 
 @admin.register(Skill)
@@ -202,3 +274,12 @@ class SkillAdmin(admin.ModelAdmin):
         if obj.description:
             return obj.description[:50] + '...' if len(obj.description) > 50 else obj.description
         return '-'
+
+
+@admin.register(Review)
+class ReviewAdmin(SimpleHistoryAdmin):
+    list_display = ['company', 'student', 'rating', 'is_approved', 'created_at']
+    list_filter = ['is_approved', 'rating']
+    search_fields = ['company__name', 'student__last_name', 'text']
+    raw_id_fields = ['student', 'company']
+    readonly_fields = ['created_at']
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class VacanciesConfig(AppConfig):
     name = 'vacancies'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import AbstractBaseUser
+
+
+class StudentModelBackend(ModelBackend):
+    """ModelBackend, загружающий профиль студента вместе с пользователем сессии."""
+
+    def get_user(self, user_id: int) -> AbstractBaseUser | None:
+        """
+        Пользователь сессии с профилем Student одним запросом (select_related).
+
+        Args:
+            user_id: Id пользователя из сессии.
+
+        Returns:
+            Пользователь или None, если он не найден или неактивен.
+        """
+        user_model = get_user_model()
+        try:
+            user = user_model._default_manager.select_related('student').get(pk=user_id)
+        except user_model.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
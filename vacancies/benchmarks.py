@@ -0,0 +1,314 @@
+"""
+Бенчмарки горячих путей API и веб-интерфейса.
+
+seed_benchmark_data() наполняет БД генератором fixtures.py, run_scenarios()
+прогоняет сценарии через тестовый клиент Django и для каждого считает
+время (медиана, минимум, максимум по повторам), число SQL-запросов и
+пиковую память Python (tracemalloc). Результат сохраняется в JSON и
+сравнивается с предыдущим baseline функцией compare_results().
+Запускается командой run_benchmarks на отдельной тестовой БД.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from datetime import date
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+
+from .cache import invalidate_vacancy_cache
+from .fixtures import SKILLS_PER_RESUME, generate_fixtures, insert_rows, refresh_derived_data
+from .models import Application, Company, Resume, Review, ShortlistEntry, Skill, Student, Vacancy
+
+SEARCH_QUERY = 'python'
+SHORTLIST_SIZE = 50
+DEEP_PAGE = 50
+
+Scenario = Callable[['BenchmarkData', int], Callable[[], HttpResponse]]
+SCENARIOS: dict[str, Scenario] = {}
+
+
+class BenchmarkData:
+    """Пользователи и id объектов, на которых работают сценарии."""
+
+    def __init__(self, admin: User, student_user: User, student: Student, resume: Resume,
+                 company_ids: list[int], free_vacancy_ids: list[int], vacancy_count: int) -> None:
+        self.admin = admin
+        self.student_user = student_user
+        self.student = student
+        self.resume = resume
+        self.company_ids = company_ids
+        # активные вакансии, на которые студент бенчмарка ещё не откликался
+        self.free_vacancy_ids = free_vacancy_ids
+        self.vacancy_count = vacancy_count
+        self.clients: dict[str, Client] = {}
+
+    def client(self, role: str) -> Client:
+        """Клиент с сессией гостя ('guest'), студента ('student') или администратора ('admin')."""
+        if role not in self.clients:
+            client = Client()
+            if role == 'student':
+                client.force_login(self.student_user)
+            elif role == 'admin':
+                client.force_login(self.admin)
+            self.clients[role] = client
+        return self.clients[role]
+
+
+def seed_benchmark_data(vacancies: int, students: int, applications: int,
+                        batch_size: int = 5000, seed: int = 0) -> BenchmarkData:
+    """
+    Наполнить БД данными для бенчмарка.
+
+    Основной объём создаёт generate_fixtures() без исторических записей;
+    сверху добавляются пользователи, студент бенчмарка с shortlist и
+    заявками и одобренные отзывы по компаниям.
+
+    Args:
+        vacancies: Число вакансий.
+        students: Число студентов (у каждого одно активное резюме).
+        applications: Общее число заявок (не больше students × vacancies).
+        batch_size: Размер порции bulk_create.
+        seed: Зерно генератора случайных чисел.
+
+    Returns:
+        BenchmarkData для сценариев.
+    """
+    generate_fixtures(
+        companies=max(vacancies // 20, 1), vacancies=vacancies, students=students,
+        applications=applications, batch_size=batch_size, history=False, seed=seed, refresh=False,
+    )
+    rng = random.Random(seed)
+    company_ids = list(Company.objects.order_by('id').values_list('id', flat=True))
+    student_ids = list(Student.objects.order_by('id').values_list('id', flat=True))
+    insert_rows(Review, ['student', 'company', 'rating', 'text', 'is_approved'], (
+        (student_ids[i % len(student_ids)], company_id, rng.randint(1, 5), 'Отзыв', True)
+        for i, company_id in enumerate(company_ids)
+    ), batch_size)
+
+    admin = User.objects.create_user('bench-admin', password='bench', is_staff=True)
+    student_user = User.objects.create_user('bench-student', password='bench')
+    student = Student.objects.create(
+        user=student_user, first_name='Бенч', last_name='Студент', email='bench-student@bench.ru',
+        birth_date=date(2003, 1, 1), specialty='Информатика',
+    )
+    resume = Resume.objects.create(student=student, experience='Опыт', contacts='mail', status='active')
+    resume.skills.set(Skill.objects.order_by('id')[:SKILLS_PER_RESUME])
+    active = list(Vacancy.objects.filter(status='active').order_by('id').values_list('id', 'company_id'))
+    ShortlistEntry.objects.bulk_create(
+        ShortlistEntry(student=student, vacancy_id=vacancy_id) for vacancy_id, _ in active[:SHORTLIST_SIZE]
+    )
+    # отклик на вакансию каждой компании, чтобы студент бенчмарка мог оставлять отзывы
+    applied = {}
+    for vacancy_id, company_id in active:
+        applied.setdefault(company_id, vacancy_id)
+    Application.objects.bulk_create(
+        Application(student=student, vacancy_id=vacancy_id, resume=resume, employer_comment='-')
+        for vacancy_id in applied.values()
+    )
+    applied_ids = set(applied.values())
+
+    refresh_derived_data()
+    return BenchmarkData(
+        admin, student_user, student, resume,
+        company_ids=list(applied),
+        free_vacancy_ids=[vacancy_id for vacancy_id, _ in active if vacancy_id not in applied_ids],
+        vacancy_count=vacancies,
+    )
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+def cold_get(client: Client, path: str) -> Callable[[], HttpResponse]:
+    """GET без кэша списков: поколение кэша меняется до замера."""
+    invalidate_vacancy_cache()
+    return lambda: client.get(path)
+
+
+@scenario('api_vacancy_list')
+def api_vacancy_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return cold_get(data.client('student'), '/api/vacancies/')
+
+
+@scenario('api_vacancy_list_cached')
+def api_vacancy_list_cached(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('student').get('/api/vacancies/')
+
+
+@scenario('api_vacancy_list_deep_page')
+def api_vacancy_list_deep_page(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    page = max(min(DEEP_PAGE, data.vacancy_count // api_settings.PAGE_SIZE), 1)
+    return cold_get(data.client('student'), f'/api/vacancies/?page={page}&ordering=-salary')
+
+
+@scenario('api_vacancy_search')
+def api_vacancy_search(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return cold_get(data.client('student'), f'/api/vacancies/?search={SEARCH_QUERY}')
+
+
+@scenario('api_my_shortlist')
+def api_my_shortlist(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('student').get('/api/vacancies/my_shortlist/')
+
+
+@scenario('api_application_create')
+def api_application_create(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    payload = {
+        'student': data.student.pk,
+        'vacancy': data.free_vacancy_ids.pop(),
+        'resume': data.resume.pk,
+        'employer_comment': '-',
+    }
+    return lambda: data.client('student').post('/api/applications/', payload)
+
+
+@scenario('api_application_list')
+def api_application_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('admin').get('/api/applications/')
+
+
+@scenario('api_resume_matches')
+def api_resume_matches(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('student').get(f'/api/resumes/{data.resume.pk}/matches/')
+
+
+@scenario('api_reviews_list')
+def api_reviews_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('guest').get('/api/reviews/')
+
+
+@scenario('api_review_create')
+def api_review_create(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    payload = {'company_id': data.company_ids[iteration % len(data.company_ids)], 'rating': 5, 'text': 'Отзыв'}
+    return lambda: data.client('student').post('/api/reviews/create/', payload)
+
+
+@scenario('web_vacancy_list')
+def web_vacancy_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return cold_get(data.client('student'), '/vacancies/')
+
+
+@scenario('web_vacancy_list_staff')
+def web_vacancy_list_staff(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return cold_get(data.client('admin'), '/vacancies/?page=20')
+
+
+@scenario('web_shortlist')
+def web_shortlist(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('student').get('/shortlist/')
+
+
+@scenario('web_application_list')
+def web_application_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('admin').get('/manage/applications/')
+
+
+@scenario('web_review_list')
+def web_review_list(data: BenchmarkData, iteration: int) -> Callable[[], HttpResponse]:
+    return lambda: data.client('student').get('/reviews/')
+
+
+def run_scenario(name: str, data: BenchmarkData, repeat: int) -> dict[str, Any]:
+    """
+    Прогнать сценарий: прогрев, repeat замеров времени и отдельный замер запросов и памяти.
+
+    Args:
+        name: Имя сценария из SCENARIOS.
+        data: Данные бенчмарка.
+        repeat: Число замеров времени.
+
+    Returns:
+        Словарь с time_ms (median/min/max), queries и peak_memory_kb.
+    """
+    make_request = SCENARIOS[name]
+    iteration = 0
+
+    def call() -> float:
+        nonlocal iteration
+        request = make_request(data, iteration)
+        iteration += 1
+        started = time.perf_counter()
+        response = request()
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            raise RuntimeError(f'{name}: ответ {response.status_code}')
+        return elapsed
+
+    call()
+    timings = [call() for _ in range(repeat)]
+
+    # tracemalloc замедляет выполнение, поэтому запросы и память меряются отдельным прогоном
+    request = make_request(data, iteration)
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as context:
+            request()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'time_ms': {
+            'median': round(statistics.median(timings) * 1000, 3),
+            'min': round(min(timings) * 1000, 3),
+            'max': round(max(timings) * 1000, 3),
+        },
+        'queries': len(context.captured_queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run_scenarios(data: BenchmarkData, names: Iterable[str], repeat: int) -> dict[str, dict[str, Any]]:
+    return {name: run_scenario(name, data, repeat) for name in names}
+
+
+def compare_results(baseline: dict[str, Any], current: dict[str, Any],
+                    threshold: float) -> list[tuple[str, str, bool]]:
+    """
+    Сравнить результаты с baseline.
+
+    Args:
+        baseline: Результаты предыдущего прогона (ключ 'results' JSON-файла).
+        current: Результаты текущего прогона.
+        threshold: Допустимый рост медианы времени и памяти, в процентах.
+
+    Returns:
+        Список (сценарий, описание изменений, регрессия ли это).
+    """
+    report = []
+    for name, result in current.items():
+        old = baseline.get(name)
+        if old is None:
+            report.append((name, 'нет в baseline', False))
+            continue
+        time_change = percent_change(old['time_ms']['median'], result['time_ms']['median'])
+        memory_change = percent_change(old['peak_memory_kb'], result['peak_memory_kb'])
+        queries_change = result['queries'] - old['queries']
+        regression = time_change > threshold or memory_change > threshold or queries_change > 0
+        report.append((
+            name,
+            f'время {time_change:+.1f}%, запросы {queries_change:+d}, память {memory_change:+.1f}%',
+            regression,
+        ))
+    return report
+
+
+def percent_change(old: float, new: float) -> float:
+    if not old:
+        return 0.0 if not new else 100.0
+    return (new - old) / old * 100
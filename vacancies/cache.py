@@ -0,0 +1,215 @@
+"""
+Кэш списков вакансий (API и веб).
+
+Используется отдельный алиас кэша VACANCY_CACHE_ALIAS: locmem, файловый
+или Redis-совместимый бэкенд (настраивается в settings.CACHES). Ключ
+строится из хоста, пути, отсортированных query-параметров (фильтры, поиск,
+сортировка, страница) и текущего поколения. Инвалидация не удаляет ключи,
+а меняет поколение, поэтому работает одинаково на всех бэкендах; старые
+записи истекают по таймауту. Поколение меняют сигналы моделей и функции,
+обновляющие счётчики через F(); смена откладывается до коммита транзакции,
+иначе параллельный запрос успел бы закэшировать ещё не изменённые данные
+под новым поколением.
+
+Поколение хранится в том же кэше, поэтому инвалидация видна всем процессам
+только на общем бэкенде (file на одном сервере, Redis на нескольких). locmem
+у каждого процесса свой и годится лишь для разработки и тестов в одном
+процессе: он выбирается по умолчанию только при DEBUG (settings.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.paginator import Page, Paginator
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import HttpRequest
+from rest_framework.response import Response
+
+GENERATION_KEY = 'generation'
+
+
+def get_vacancy_cache() -> BaseCache:
+    return caches[getattr(settings, 'VACANCY_CACHE_ALIAS', 'vacancies')]
+
+
+def new_generation() -> str:
+    return f'{time.time():.6f}-{uuid.uuid4().hex[:12]}'
+
+
+def versioned_key(key: str, timeout: float | None = None) -> str:
+    """
+    Текущая версия под ключом key в кэше вакансий; создаётся при первом обращении.
+
+    Args:
+        key: Ключ версии.
+        timeout: Время жизни версии в секундах (None — без ограничения).
+
+    Returns:
+        Маркер версии от new_generation().
+    """
+    cache = get_vacancy_cache()
+    version = cache.get(key)
+    if version is None:
+        # add(): из параллельно созданных версий остаётся одна
+        cache.add(key, new_generation(), timeout=timeout)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key: str, timeout: float | None = None) -> None:
+    """Заменить версию под ключом key новой."""
+    get_vacancy_cache().set(key, new_generation(), timeout=timeout)
+
+
+_on_commit = threading.local()
+
+
+def on_commit_once(func: Callable[[], None]) -> None:
+    """
+    Вызвать func после коммита текущей транзакции один раз, сколько бы раз её ни запросили.
+
+    Вне транзакции func вызывается сразу. Отложенные вызовы одной транзакции
+    выполняет первый, остальные ничего не делают.
+
+    Args:
+        func: Функция без аргументов (одна и та же для объединяемых вызовов).
+    """
+    pending = _on_commit.__dict__.setdefault('funcs', set())
+    pending.add(func)
+
+    def run() -> None:
+        if func in pending:
+            pending.discard(func)
+            func()
+
+    transaction.on_commit(run)
+
+
+def get_generation() -> str:
+    """
+    Текущее поколение кэша; создаётся при первом обращении.
+
+    Returns:
+        Строковый маркер поколения: время смены и случайный суффикс.
+    """
+    return versioned_key(GENERATION_KEY)
+
+
+def generation_time(generation: str) -> datetime:
+    """Момент, когда поколение сменилось (последняя инвалидация)."""
+    return datetime.fromtimestamp(float(generation.split('-', 1)[0]), tz=timezone.utc)
+
+
+def bump_generation() -> None:
+    bump_version(GENERATION_KEY)
+
+
+def invalidate_vacancy_cache() -> None:
+    """Сделать недействительными все закэшированные списки вакансий после коммита транзакции."""
+    on_commit_once(bump_generation)
+
+
+def cache_key(request: HttpRequest, scope: str) -> str:
+    """
+    Ключ кэша для запроса списка.
+
+    Args:
+        request: HTTP-запрос (учитываются хост, путь и query-параметры).
+        scope: Область кэша, например 'api' или 'web:public'.
+
+    Returns:
+        Ключ вида '<scope>:<поколение>:<хэш запроса>'.
+    """
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    raw = f'{request.get_host()}{request.path}?{params!r}'
+    digest = hashlib.md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'{scope}:{get_generation()}:{digest}'
+
+
+def mark_favorites(data: Any, favorite_ids: frozenset[int]) -> Any:
+    """
+    Проставить is_favorite текущего студента в закэшированном ответе API.
+
+    Args:
+        data: Данные ответа списка (словарь с results или список).
+        favorite_ids: Id вакансий в shortlist студента.
+
+    Returns:
+        Копия данных с is_favorite в каждой вакансии.
+    """
+    if isinstance(data, dict) and 'results' in data:
+        return {**data, 'results': mark_favorites(data['results'], favorite_ids)}
+    return [{**item, 'is_favorite': item['id'] in favorite_ids} for item in data]
+
+
+class CachedListMixin:
+    """
+    Кэширование ответа list() ViewSet'а.
+
+    Ответ общий для всех пользователей; personalize() дополняет его данными
+    текущего пользователя после чтения из кэша.
+    """
+
+    list_cache_scope = 'api'
+
+    def personalize(self, data: Any) -> Any:
+        return data
+
+    def list(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
+        cache = get_vacancy_cache()
+        key = cache_key(request, self.list_cache_scope)
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data)
+        return Response(self.personalize(data))
+
+
+class CachedRows:
+    """Последовательность для Paginator: длина — общее число строк, срез — строки страницы из кэша."""
+
+    def __init__(self, rows: list[Any], count: int, offset: int) -> None:
+        self.rows = rows
+        self.total = count
+        self.offset = offset
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __getitem__(self, index: slice) -> list[Any]:
+        return self.rows[index.start - self.offset:index.stop - self.offset]
+
+
+def cached_page(request: HttpRequest, queryset: QuerySet, per_page: int, scope: str) -> Page:
+    """
+    Страница Paginator, строки и общее число которой берутся из кэша.
+
+    Args:
+        request: HTTP-запрос с ?page=.
+        queryset: Упорядоченный QuerySet списка.
+        per_page: Размер страницы.
+        scope: Область кэша.
+
+    Returns:
+        Объект Page, совместимый с шаблоном пагинации.
+    """
+    cache = get_vacancy_cache()
+    key = cache_key(request, scope)
+    cached = cache.get(key)
+    if cached is None:
+        page_obj = Paginator(queryset, per_page).get_page(request.GET.get('page'))
+        offset = (page_obj.number - 1) * per_page
+        cached = (list(page_obj.object_list), page_obj.paginator.count, offset)
+        cache.set(key, cached)
+    rows, count, offset = cached
+    return Paginator(CachedRows(rows, count, offset), per_page).get_page(request.GET.get('page'))
@@ -0,0 +1,130 @@
+"""
+Условные GET-запросы (ETag / Last-Modified) для ViewSet'ов.
+
+Валидаторы считаются до сериализации и без запросов по всей таблице. Для
+списка с use_cache_generation это поколение кэша вакансий (без обращения
+к БД, поэтому попадание в кэш списка и keyset-страница не выполняют
+агрегатов); для остальных списков — id и updated_at строк текущей
+страницы; для объекта — updated_at одной строки. Если If-None-Match
+совпадает с ETag или If-Modified-Since не старше Last-Modified, сразу
+возвращается 304, сериализатор не вызывается.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .cache import generation_time, get_generation
+
+
+class ConditionalGetMixin:
+    """
+    ETag и Last-Modified для list() и retrieve().
+
+    ETag строится из строк страницы (или id объекта), времени последнего
+    изменения и get_etag_extra(). При use_cache_generation ETag и
+    Last-Modified списка строятся только из поколения кэша вакансий: оно
+    меняется при любом изменении данных ответа, в том числе не трогающем
+    updated_at (заявки, рейтинги, shortlist), а list() отдаётся через
+    super().list() (например, из CachedListMixin).
+    """
+
+    updated_field = 'updated_at'
+    use_cache_generation = False
+
+    def get_conditional_queryset(self) -> QuerySet:
+        """QuerySet для расчёта валидаторов; по умолчанию get_queryset()."""
+        return self.get_queryset()
+
+    def get_etag_extra(self) -> str:
+        """Часть ETag, зависящая от пользователя (по умолчанию пустая)."""
+        return ''
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if self.use_cache_generation:
+            return self.conditional_response(request, 'list', None, super().list, request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        # число строк уже посчитано постраничной пагинацией; keyset-режим его не считает
+        paginator_page = getattr(self.paginator, 'page', None)
+        count = paginator_page.paginator.count if page is not None and paginator_page is not None else len(rows)
+        updated = [getattr(row, self.updated_field) for row in rows]
+        identity = f'{count}:' + ','.join(str(row.pk) for row in rows)
+
+        def render() -> Response:
+            data = self.get_serializer(rows, many=True).data
+            return Response(data) if page is None else self.get_paginated_response(data)
+
+        return self.conditional_response(request, identity, max(updated, default=None), render)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            last_modified = (
+                self.get_conditional_queryset()
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list(self.updated_field, flat=True)
+                .first()
+            )
+        except (TypeError, ValueError, ValidationError):
+            # некорректное значение в URL: get_object() ответит 404, как get_object_or_404 в DRF
+            last_modified = None
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            request, self.kwargs[lookup_url_kwarg], last_modified, super().retrieve, request, *args, **kwargs,
+        )
+
+    def conditional_response(
+        self,
+        request: Request,
+        identity: Any,
+        last_modified: datetime | None,
+        view: Callable[..., HttpResponseBase],
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """
+        Вернуть 304 по валидаторам или выполнить view и добавить к ответу ETag и Last-Modified.
+
+        Args:
+            request: HTTP-запрос.
+            identity: Число строк списка или id объекта.
+            last_modified: Время последнего изменения данных.
+            view: Обработчик, формирующий полный ответ.
+
+        Returns:
+            HttpResponseNotModified или ответ view с заголовками валидаторов.
+        """
+        parts = [identity, last_modified.isoformat() if last_modified else '', self.get_etag_extra()]
+        if self.use_cache_generation:
+            generation = get_generation()
+            parts.append(generation)
+            changed_at = generation_time(generation)
+            if last_modified is None or changed_at > last_modified:
+                last_modified = changed_at
+        digest = hashlib.md5(':'.join(map(str, parts)).encode('utf-8'), usedforsecurity=False).hexdigest()
+        etag = f'"{digest}"'
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = view(*args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,152 @@
+"""
+Быстрая сериализация для list/retrieve.
+
+ModelSerializer на каждую строку создаёт и обходит поля, вызывает
+get_attribute/to_representation каждого поля и для PrimaryKeyRelatedField
+строит PKOnlyObject. Для чтения это лишняя работа: compile_row_serializer
+один раз разбирает поля сериализатора в план «атрибут модели → значение»
+и возвращает функцию, превращающую объект в словарь простым getattr.
+Результат совпадает с ModelSerializer(...).data; поля, для которых
+быстрого пути нет, сериализуются штатным to_representation поля.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+# поля, у которых to_representation для значения из модели возвращает его же
+PLAIN_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+)
+
+MISSING = object()
+
+RowFunction = Callable[[Any], dict[str, Any]]
+
+
+def datetime_to_iso(value: datetime, tz: Any) -> str:
+    """То же, что DateTimeField.to_representation для формата ISO 8601."""
+    if timezone.is_aware(value):
+        value = value.astimezone(tz)
+    else:
+        value = timezone.make_aware(value, tz)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def compile_field(field: serializers.Field, model: type) -> tuple[str, str, Any]:
+    """
+    План чтения одного поля: (атрибут, способ, параметр).
+
+    Способы: 'plain' — значение атрибута как есть, 'datetime' — ISO 8601,
+    'pks' — список pk связанных объектов, 'field' — to_representation поля.
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return model._meta.get_field(field.source).attname, 'plain', None
+    if isinstance(field, serializers.ManyRelatedField) and isinstance(
+        field.child_relation, serializers.PrimaryKeyRelatedField,
+    ):
+        return field.source, 'pks', None
+    if (
+        isinstance(field, serializers.DateTimeField)
+        and getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601
+        and not hasattr(field, 'timezone')
+    ):
+        return field.source, 'datetime', None
+    if type(field) in PLAIN_FIELDS and '.' not in field.source and field.source != '*':
+        return field.source, 'plain', None
+    return field.source, 'field', field
+
+
+@lru_cache(maxsize=None)
+def compile_row_serializer(serializer_class: type[serializers.ModelSerializer]) -> RowFunction:
+    """
+    Скомпилировать функцию объект → словарь по полям ModelSerializer.
+
+    Args:
+        serializer_class: Класс ModelSerializer.
+
+    Returns:
+        Функция row(instance) -> dict с теми же ключами и значениями, что serializer.data.
+    """
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        attr, kind, param = compile_field(field, model)
+        default = field.default if field.default is not serializers.empty else MISSING
+        plan.append((name, attr, kind, param, default))
+
+    def row(instance: Any, tz: Any = None) -> dict[str, Any]:
+        data = {}
+        prefetched = getattr(instance, '_prefetched_objects_cache', {})
+        for name, attr, kind, param, default in plan:
+            if kind == 'pks' and attr in prefetched:
+                # объекты из prefetch_related: без создания related manager и клона QuerySet
+                data[name] = [obj.pk for obj in prefetched[attr]]
+                continue
+            value = getattr(instance, attr, MISSING)
+            if value is MISSING:
+                # как ModelSerializer: значение по умолчанию или поле пропускается
+                if default is not MISSING:
+                    data[name] = default() if callable(default) else default
+                continue
+            if value is None or kind == 'plain':
+                data[name] = value
+            elif kind == 'datetime':
+                data[name] = datetime_to_iso(value, tz or timezone.get_current_timezone())
+            elif kind == 'pks':
+                data[name] = [obj.pk for obj in value.all()]
+            else:
+                data[name] = param.to_representation(value)
+        return data
+
+    return row
+
+
+def serialize_rows(serializer_class: type[serializers.ModelSerializer], instances: Iterable[Any]) -> list[dict]:
+    """
+    Сериализовать объекты быстрым путём.
+
+    Args:
+        serializer_class: Класс ModelSerializer, задающий поля.
+        instances: Объекты модели (страница или QuerySet).
+
+    Returns:
+        Список словарей, равный serializer_class(instances, many=True).data.
+    """
+    row = compile_row_serializer(serializer_class)
+    tz = timezone.get_current_timezone()
+    return [row(instance, tz) for instance in instances]
+
+
+class FastReadMixin:
+    """list() и retrieve() ViewSet'а через compile_row_serializer вместо полного ModelSerializer."""
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize_rows(self.get_serializer_class(), page))
+        return Response(serialize_rows(self.get_serializer_class(), queryset))
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        instance = self.get_object()
+        return Response(compile_row_serializer(self.get_serializer_class())(instance))
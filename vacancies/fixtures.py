@@ -0,0 +1,244 @@
+"""
+Генератор синтетических данных для нагрузочного тестирования.
+
+Объекты создаются потоком порций через bulk_create: в памяти держится
+только текущая порция и id уже созданных строк, поэтому миллион заявок
+не требует миллиона объектов одновременно. bulk_create не вызывает
+save() и сигналы, поэтому исторические записи simple_history пишутся
+отдельно через bulk_history_create (или не пишутся при history=False).
+Строки, id которых дальше не нужны (заявки без истории, навыки резюме),
+вставляются кортежами через executemany без создания объектов модели —
+это в несколько раз быстрее bulk_create. Производные данные (поисковый
+индекс, снимок аналитики, кэш списков, индекс навыков) пересчитываются
+один раз в конце функцией refresh_derived_data().
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any
+
+from django.db import connection, transaction
+from django.db.models import Model
+from django.utils import timezone
+
+from .cache import invalidate_vacancy_cache
+from .matching import invalidate_matching_index
+from .models import Application, Company, Resume, Skill, Student, Vacancy
+from .search import get_search_backend
+from .services import refresh_analytics_snapshot
+
+SKILLS = (
+    'python', 'django', 'sql', 'postgresql', 'javascript', 'react', 'docker', 'linux',
+    'git', 'java', 'kotlin', 'excel', 'analytics', 'english', 'figma', 'testing',
+)
+INDUSTRIES = ('IT', 'Финансы', 'Ритейл', 'Телеком', 'Производство')
+TITLES = ('Python-разработчик', 'Аналитик', 'Тестировщик', 'Frontend-разработчик', 'DevOps-инженер', 'Стажёр')
+SKILLS_PER_RESUME = 3
+SKILLS_PER_VACANCY = 4
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def bulk_insert(model: type[Model], objects: Iterable[Model], batch_size: int, history: bool = False) -> list[int]:
+    """
+    bulk_create порциями по batch_size строк.
+
+    Args:
+        model: Модель.
+        objects: Объекты (можно генератор).
+        batch_size: Размер порции.
+        history: Записывать ли исторические строки simple_history.
+
+    Returns:
+        Id созданных объектов.
+    """
+    ids = []
+    for batch in batched(objects, batch_size):
+        created = model.objects.bulk_create(batch, batch_size=batch_size)
+        if history:
+            model.history.bulk_history_create(created, batch_size=batch_size)
+        ids.extend(obj.pk for obj in created)
+    return ids
+
+
+def insert_rows(model: type[Model], fields: list[str], rows: Iterable[tuple], batch_size: int) -> int:
+    """
+    INSERT кортежей значений через executemany, минуя объекты модели и сигналы.
+
+    Остальные поля получают значения по умолчанию, auto_now/auto_now_add —
+    текущее время.
+
+    Args:
+        model: Модель.
+        fields: Имена полей в порядке значений кортежа (значения уже в виде для БД).
+        rows: Кортежи значений (можно генератор).
+        batch_size: Размер порции executemany.
+
+    Returns:
+        Число вставленных строк.
+    """
+    now = timezone.now()
+    given = [model._meta.get_field(name) for name in fields]
+    defaults = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field in given:
+            continue
+        auto = getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+        defaults.append((field, field.get_db_prep_save(now if auto else field.get_default(), connection)))
+
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(field.column) for field in given + [field for field, _ in defaults])
+    placeholders = ', '.join(['%s'] * (len(given) + len(defaults)))
+    sql = f'INSERT INTO {qn(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+    constants = tuple(value for _, value in defaults)
+    count = 0
+    with connection.cursor() as cursor:
+        for batch in batched(rows, batch_size):
+            cursor.executemany(sql, [row + constants for row in batch])
+            count += len(batch)
+    return count
+
+
+def generate_fixtures(
+    companies: int,
+    vacancies: int,
+    students: int,
+    applications: int,
+    batch_size: int = 5000,
+    history: bool = True,
+    seed: int = 0,
+    refresh: bool = True,
+    progress: Callable[[str, int], None] | None = None,
+) -> dict[str, int]:
+    """
+    Создать компании, вакансии, студентов с резюме и навыками и заявки.
+
+    У каждого студента одно активное резюме; заявки распределяются по
+    студентам поровну, у студента — разные вакансии (unique_together).
+    Email студентов содержат случайную метку, поэтому генератор можно
+    запускать на непустой БД повторно.
+
+    Args:
+        companies: Число компаний.
+        vacancies: Число вакансий (распределяются по компаниям по кругу).
+        students: Число студентов.
+        applications: Число заявок (не больше students × vacancies).
+        batch_size: Размер порции bulk_create.
+        history: Записывать ли исторические строки simple_history.
+        seed: Зерно генератора случайных чисел.
+        refresh: Пересчитать производные данные (refresh_derived_data) в конце.
+        progress: Вызывается после каждого этапа с названием модели и числом строк.
+
+    Returns:
+        Число созданных объектов по моделям.
+    """
+    if applications > students * vacancies:
+        raise ValueError('Заявок больше, чем пар студент–вакансия')
+    if vacancies and not companies:
+        raise ValueError('Для вакансий нужна хотя бы одна компания')
+    rng = random.Random(seed)
+    mark = uuid.uuid4().hex[:8]
+    now = timezone.now()
+    report = progress or (lambda name, count: None)
+    counts = {}
+
+    with transaction.atomic():
+        Skill.objects.bulk_create([Skill(name=name) for name in SKILLS], ignore_conflicts=True)
+        skill_ids = list(Skill.objects.filter(name__in=SKILLS).values_list('id', flat=True))
+
+        company_ids = bulk_insert(Company, (
+            Company(name=f'Компания {i}', email=f'hr{i}@company.ru', industry=INDUSTRIES[i % len(INDUSTRIES)])
+            for i in range(companies)
+        ), batch_size, history)
+        counts['companies'] = len(company_ids)
+        report('Company', len(company_ids))
+
+        vacancy_ids = bulk_insert(Vacancy, (
+            Vacancy(
+                company_id=company_ids[i % len(company_ids)],
+                title=f'{TITLES[i % len(TITLES)]} {i}',
+                description='Описание вакансии',
+                requirements=', '.join(rng.sample(SKILLS, SKILLS_PER_VACANCY)),
+                salary=rng.randrange(30_000, 300_000, 1000),
+                status='active' if i % 10 else 'closed',
+                published_at=now - timedelta(minutes=i),
+            )
+            for i in range(vacancies)
+        ), batch_size, history)
+        counts['vacancies'] = len(vacancy_ids)
+        report('Vacancy', len(vacancy_ids))
+
+        student_ids = bulk_insert(Student, (
+            Student(
+                first_name='Студент', last_name=str(i), email=f'student{i}.{mark}@example.com',
+                birth_date=date(2000 + i % 6, 1 + i % 12, 1), specialty='Информатика', course=i % 4 + 1,
+            )
+            for i in range(students)
+        ), batch_size, history)
+        counts['students'] = len(student_ids)
+        report('Student', len(student_ids))
+
+        resume_skills = [rng.sample(skill_ids, SKILLS_PER_RESUME) for _ in student_ids]
+        resume_ids = bulk_insert(Resume, (
+            Resume(student_id=student_id, experience='Опыт', contacts='Контакты', status='active')
+            for student_id in student_ids
+        ), batch_size, history)
+        insert_rows(Resume.skills.through, ['resume', 'skill'], (
+            (resume_id, skill_id) for resume_id, skills in zip(resume_ids, resume_skills) for skill_id in skills
+        ), batch_size)
+        counts['resumes'] = len(resume_ids)
+        report('Resume', len(resume_ids))
+
+        statuses = [code for code, _ in Application.STATUS_CHOICES]
+        per_student, extra = divmod(applications, max(students, 1))
+
+        def application_rows() -> Iterator[tuple]:
+            # у каждого студента — подряд идущие вакансии со случайного сдвига, без повторов
+            for index, (student_id, resume_id) in enumerate(zip(student_ids, resume_ids)):
+                offset = rng.randrange(vacancies) if vacancies else 0
+                for k in range(per_student + (index < extra)):
+                    yield student_id, vacancy_ids[(offset + k) % vacancies], resume_id, rng.choice(statuses), '-'
+
+        if history:
+            # историческим записям нужны объекты с pk, поэтому здесь bulk_create
+            counts['applications'] = len(bulk_insert(Application, (
+                Application(
+                    student_id=student_id, vacancy_id=vacancy_id, resume_id=resume_id,
+                    status=status, employer_comment=comment,
+                )
+                for student_id, vacancy_id, resume_id, status, comment in application_rows()
+            ), batch_size, history))
+        else:
+            counts['applications'] = insert_rows(
+                Application, ['student', 'vacancy', 'resume', 'status', 'employer_comment'],
+                application_rows(), batch_size,
+            )
+        report('Application', counts['applications'])
+
+    if refresh:
+        refresh_derived_data()
+    return counts
+
+
+def refresh_derived_data() -> int:
+    """
+    Пересобрать поисковый индекс и снимок аналитики, сбросить кэш списков и индекс навыков.
+
+    Returns:
+        Число проиндексированных вакансий.
+    """
+    with transaction.atomic():
+        indexed = get_search_backend().rebuild()
+    refresh_analytics_snapshot()
+    invalidate_vacancy_cache()
+    invalidate_matching_index()
+    return indexed
@@ -0,0 +1,288 @@
+"""
+Буферизованная запись истории simple_history.
+
+BufferedHistoricalRecords может собирать исторические строки в общий
+буфер процесса вместо save() каждой строки внутри запроса; буфер пишет их
+bulk_create — по одному INSERT на историческую модель. Режим задаётся
+настройкой HISTORY_BUFFER_MODE:
+
+- 'sync' (по умолчанию) — как обычный HistoricalRecords, строка пишется
+  сразу;
+- 'request' — буфер сбрасывается HistoryFlushMiddleware в конце запроса;
+- 'background' — буфер сбрасывает фоновый поток раз в
+  HISTORY_BUFFER_INTERVAL секунд.
+
+Буферизация включается явно: пока буфер не сброшен, истории нет в БД
+(её не видят команды и другие процессы), а при аварийном завершении
+процесса она теряется. Буфер сбрасывается досрочно, когда в нём
+набирается HISTORY_BUFFER_FLUSH_SIZE строк, и при завершении процесса
+(atexit). Строка попадает в буфер только после коммита транзакции, в
+которой изменён объект, поэтому откат не оставляет истории несостоявшихся
+изменений. history_date и пользователь фиксируются в момент изменения.
+
+Рост исторических таблиц ограничивает history_deletions() (команда
+compact_history): политика хранения модели оставляет последние keep_last
+версий объекта и все версии моложе keep_days дней, а collapse удаляет
+правки, не изменившие ни одного отслеживаемого поля.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from simple_history.models import HistoricalRecords
+from simple_history.signals import post_create_historical_record, pre_create_historical_record
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODE = 'sync'
+DEFAULT_FLUSH_SIZE = 500
+DEFAULT_INTERVAL = 1.0
+DEFAULT_RETENTION = {'keep_last': 20, 'keep_days': 180, 'collapse': True}
+
+
+def get_mode() -> str:
+    return getattr(settings, 'HISTORY_BUFFER_MODE', DEFAULT_MODE)
+
+
+class HistoryBuffer:
+    """Потокобезопасный буфер исторических строк, сгруппированных по модели и БД."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # (историческая модель, БД) -> [(историческая строка, исходный объект)]
+        self.rows: dict[tuple[type[Model], str | None], list[tuple[Model, Model]]] = {}
+        self.size = 0
+        self.worker: threading.Thread | None = None
+        self.stopping = threading.Event()
+        self.wakeup = threading.Event()
+
+    @property
+    def flush_size(self) -> int:
+        return getattr(settings, 'HISTORY_BUFFER_FLUSH_SIZE', DEFAULT_FLUSH_SIZE)
+
+    def add(self, history_instance: Model, instance: Model, using: str | None) -> None:
+        """
+        Добавить историческую строку; при переполнении — сбросить буфер.
+
+        Args:
+            history_instance: Несохранённый объект исторической модели.
+            instance: Изменённый объект (для сигнала post_create_historical_record).
+            using: Алиас БД или None.
+        """
+        with self.lock:
+            self.rows.setdefault((type(history_instance), using), []).append((history_instance, instance))
+            self.size += 1
+            full = self.size >= self.flush_size
+        if get_mode() == 'background':
+            self.start_worker()
+            if full:
+                self.wakeup.set()
+        elif full:
+            self.flush()
+
+    def take(self) -> dict[tuple[type[Model], str | None], list[tuple[Model, Model]]]:
+        with self.lock:
+            rows, self.rows, self.size = self.rows, {}, 0
+        return rows
+
+    def flush(self) -> int:
+        """
+        Записать все накопленные строки bulk_create.
+
+        Если запись не удалась, строки возвращаются в буфер для следующей
+        попытки, а ошибка логируется.
+
+        Returns:
+            Число записанных строк.
+        """
+        written = 0
+        pending = self.take()
+        for (model, using), rows in pending.items():
+            try:
+                with transaction.atomic(using=using):
+                    model.objects.using(using).bulk_create([history_instance for history_instance, _ in rows])
+            except Exception:
+                logger.exception('Не удалось записать историю %s (%d строк)', model.__name__, len(rows))
+                with self.lock:
+                    self.rows.setdefault((model, using), [])[:0] = rows
+                    self.size += len(rows)
+                continue
+            written += len(rows)
+            for history_instance, instance in rows:
+                post_create_historical_record.send(
+                    sender=model,
+                    instance=instance,
+                    history_instance=history_instance,
+                    history_date=history_instance.history_date,
+                    history_user=history_instance.history_user,
+                    history_change_reason=history_instance.history_change_reason,
+                    using=using,
+                )
+        return written
+
+    def start_worker(self) -> None:
+        """Запустить фоновый поток сброса, если он ещё не запущен."""
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.stopping.clear()
+            self.worker = threading.Thread(target=self.run_worker, name='history-buffer', daemon=True)
+            self.worker.start()
+
+    def run_worker(self) -> None:
+        interval = getattr(settings, 'HISTORY_BUFFER_INTERVAL', DEFAULT_INTERVAL)
+        try:
+            while not self.stopping.is_set():
+                self.wakeup.wait(interval)
+                self.wakeup.clear()
+                self.flush()
+        finally:
+            connections.close_all()
+
+    def shutdown(self) -> None:
+        """Остановить фоновый поток и записать остаток буфера (вызывается через atexit)."""
+        worker = self.worker
+        if worker is not None and worker.is_alive():
+            self.stopping.set()
+            self.wakeup.set()
+            worker.join()
+        self.flush()
+
+
+history_buffer = HistoryBuffer()
+atexit.register(history_buffer.shutdown)
+
+
+class BufferedHistoricalRecords(HistoricalRecords):
+    """
+    HistoricalRecords, который в режимах 'request' и 'background' не сохраняет
+    историческую строку сразу, а передаёт её в history_buffer после коммита.
+
+    Модели с историей m2m-полей пишутся синхронно: их строкам m2m нужен pk
+    исторической записи.
+    """
+
+    def create_historical_record(self, instance: Model, history_type: str, using: str | None = None) -> None:
+        if get_mode() == 'sync' or self.m2m_fields:
+            return super().create_historical_record(instance, history_type, using)
+
+        using = using if self.use_base_model_db else None
+        history_date = getattr(instance, '_history_date', timezone.now())
+        history_user = self.get_history_user(instance)
+        history_change_reason = self.get_change_reason_for_object(instance, history_type, using)
+        manager = getattr(instance, self.manager_name)
+
+        attrs = {field.attname: getattr(instance, field.attname) for field in self.fields_included(instance)}
+        if getattr(manager.model, 'history_relation', None) is not None:
+            attrs['history_relation'] = instance
+
+        history_instance = manager.model(
+            history_date=history_date,
+            history_type=history_type,
+            history_user=history_user,
+            history_change_reason=history_change_reason,
+            **attrs,
+        )
+        pre_create_historical_record.send(
+            sender=manager.model,
+            instance=instance,
+            history_date=history_date,
+            history_user=history_user,
+            history_change_reason=history_change_reason,
+            history_instance=history_instance,
+            using=using,
+        )
+        transaction.on_commit(lambda: history_buffer.add(history_instance, instance, using), using=using)
+
+
+def HistoryFlushMiddleware(get_response: Callable[[HttpRequest], HttpResponse]) -> Callable[..., Any]:
+    """Сбрасывает буфер истории в конце запроса в режиме 'request'."""
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        try:
+            return get_response(request)
+        finally:
+            if get_mode() == 'request':
+                history_buffer.flush()
+
+    return middleware
+
+
+def get_retention_policy(model: type[Model]) -> dict[str, Any]:
+    """
+    Политика хранения истории модели: DEFAULT_RETENTION, дополненная HISTORY_RETENTION['app_label.Model'].
+
+    Returns:
+        Словарь с keep_last, keep_days (None — без ограничения) и collapse.
+    """
+    overrides = getattr(settings, 'HISTORY_RETENTION', {})
+    return {**DEFAULT_RETENTION, **overrides.get(model._meta.label, {})}
+
+
+def history_deletions(
+    history_model: type[Model],
+    keep_last: int | None,
+    keep_days: int | None,
+    collapse: bool,
+    now: datetime | None = None,
+) -> Iterator[int]:
+    """
+    history_id исторических строк, которые удаляет политика хранения.
+
+    Строки читаются одним проходом, упорядоченными по объекту и времени.
+    Версия объекта удаляется, если она не входит в последние keep_last и
+    старше keep_days дней; при collapse удаляются правки ('~'), у которых
+    отслеживаемые поля (кроме auto_now) совпадают с предыдущей версией.
+    Последний снимок состояния объекта сохраняется всегда.
+
+    Args:
+        history_model: Историческая модель (Model.history.model).
+        keep_last: Сколько последних версий объекта хранить всегда.
+        keep_days: Сколько дней хранить все версии.
+        collapse: Удалять ли повторяющиеся снимки.
+        now: Текущее время (для тестов).
+
+    Returns:
+        Итератор history_id к удалению.
+    """
+    object_field = history_model.instance_type._meta.pk.attname
+    fields = [
+        field.attname for field in history_model.tracked_fields
+        if field.attname != object_field and not getattr(field, 'auto_now', False)
+    ]
+    cutoff = (now or timezone.now()) - timedelta(days=keep_days) if keep_days is not None else None
+    protected = max(keep_last or 0, 1)
+    rows = (
+        history_model.objects
+        .order_by(object_field, 'history_date', 'history_id')
+        .values_list(object_field, 'history_id', 'history_date', 'history_type', *fields)
+        .iterator(chunk_size=5000)
+    )
+    for _, versions in groupby(rows, key=itemgetter(0)):
+        kept = []
+        previous = None
+        for row in versions:
+            snapshot = row[4:]
+            if collapse and row[3] == '~' and snapshot == previous:
+                yield row[1]
+                continue
+            previous = snapshot
+            kept.append(row)
+        if keep_last is None and cutoff is None:
+            continue
+        for row in kept[:-protected]:
+            if cutoff is None or row[2] < cutoff:
+                yield row[1]
@@ -0,0 +1,195 @@
+"""
+Потоковый импорт вакансий из NDJSON и CSV.
+
+Тело запроса читается построчно и не загружается в память целиком.
+Строки проверяются правилами VacancySerializers порциями по
+IMPORT_CHUNK_SIZE: компании порции загружаются одним запросом, валидные
+строки вставляются bulk_create, ошибки собираются с номером строки
+файла (в отчёт попадают первые MAX_REPORTED_ERRORS). Каждая порция —
+отдельная транзакция, поэтому ошибка в конце файла не отменяет уже
+загруженные порции. bulk_create не вызывает сигналы модели, поэтому
+поисковый индекс, история и снимок аналитики обновляются по порциям, а
+кэш списков и индекс подбора по навыкам сбрасываются один раз в конце.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any
+
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .cache import invalidate_vacancy_cache
+from .matching import invalidate_matching_index
+from .models import Company, Vacancy
+from .search import get_search_backend
+from .serializers import VacancyImportSerializer
+from .services import record_vacancies_created
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+# (номер строки файла, данные строки или None, текст ошибки разбора или None)
+Record = tuple[int, Any, str | None]
+
+
+def decode_lines(lines: Iterable[bytes]) -> Iterator[tuple[int, str | None]]:
+    """Номер и текст строк UTF-8; строка, которую не удалось декодировать, — None."""
+    for number, line in enumerate(lines, 1):
+        try:
+            yield number, line.decode('utf-8-sig' if number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            yield number, None
+
+
+def read_ndjson(lines: Iterable[bytes]) -> Iterator[Record]:
+    """
+    Записи NDJSON: один JSON-объект на строку, пустые строки пропускаются.
+
+    Args:
+        lines: Строки тела запроса (bytes).
+
+    Returns:
+        Итератор (номер строки, объект, ошибка разбора).
+    """
+    for number, text in decode_lines(lines):
+        if text is None:
+            yield number, None, 'Строка не в кодировке UTF-8'
+        elif text.strip():
+            try:
+                yield number, json.loads(text), None
+            except json.JSONDecodeError as exc:
+                yield number, None, f'Некорректный JSON: {exc.msg}'
+
+
+def read_csv(lines: Iterable[bytes]) -> Iterator[Record]:
+    """
+    Записи CSV с заголовком; пустые ячейки не передаются (действуют значения по умолчанию).
+
+    Args:
+        lines: Строки тела запроса (bytes).
+
+    Returns:
+        Итератор (номер строки, словарь колонок, ошибка разбора).
+    """
+    undecoded = []
+
+    def text_lines() -> Iterator[str]:
+        for number, text in decode_lines(lines):
+            if text is None:
+                undecoded.append(number)
+                text = '\n'
+            yield text
+
+    reader = csv.DictReader(text_lines())
+    for row in reader:
+        while undecoded:
+            yield undecoded.pop(0), None, 'Строка не в кодировке UTF-8'
+        if None in row:
+            yield reader.line_num, None, 'Лишние значения без заголовка колонки'
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if value not in ('', None)}, None
+    for number in undecoded:
+        yield number, None, 'Строка не в кодировке UTF-8'
+
+
+IMPORT_READERS = {
+    'application/x-ndjson': read_ndjson,
+    'application/jsonl': read_ndjson,
+    'text/csv': read_csv,
+}
+
+
+class ImportReport:
+    """Итог импорта: число созданных и отклонённых строк и первые ошибки."""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.failed = 0
+        self.errors: list[dict[str, Any]] = []
+
+    def add_error(self, line: int, errors: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def chunk_company_ids(chunk: list[Record]) -> set[int]:
+    ids = set()
+    for _, row, _ in chunk:
+        try:
+            ids.add(int(row['company']))
+        except (TypeError, ValueError, KeyError):
+            continue
+    return ids
+
+
+def import_chunk(chunk: list[Record], report: ImportReport, user: AbstractBaseUser | None) -> None:
+    """
+    Проверить порцию строк и вставить валидные одним bulk_create.
+
+    Args:
+        chunk: Записи порции.
+        report: Отчёт, в который добавляются счётчики и ошибки.
+        user: Автор вакансий (created_by/updated_by и история).
+    """
+    companies = Company.objects.in_bulk(chunk_company_ids(chunk))
+    serializer = VacancyImportSerializer(context={'companies': companies})
+    vacancies = []
+    for line, row, parse_error in chunk:
+        if parse_error is not None:
+            report.add_error(line, {'non_field_errors': [parse_error]})
+            continue
+        try:
+            data = serializer.run_validation(row)
+        except ValidationError as exc:
+            report.add_error(line, exc.detail)
+            continue
+        vacancies.append(Vacancy(**data, created_by=user, updated_by=user))
+    if not vacancies:
+        return
+    with transaction.atomic():
+        created = Vacancy.objects.bulk_create(vacancies)
+        Vacancy.history.bulk_history_create(created, default_user=user)
+        get_search_backend().index(created)
+        record_vacancies_created(created)
+    report.created += len(created)
+
+
+def import_vacancies(
+    records: Iterable[Record],
+    user: AbstractBaseUser | None = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportReport:
+    """
+    Импортировать вакансии из потока записей порциями.
+
+    Args:
+        records: Записи от read_ndjson() или read_csv().
+        user: Пользователь, выполняющий импорт.
+        chunk_size: Размер порции.
+
+    Returns:
+        ImportReport.
+    """
+    report = ImportReport()
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        import_chunk(chunk, report, user)
+    if report.created:
+        invalidate_vacancy_cache()
+        invalidate_matching_index()
+    return report
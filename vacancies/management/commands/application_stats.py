@@ -1,15 +1,15 @@
 from django.core.management.base import BaseCommand
 from vacancies.models import Application
+from vacancies.services import application_status_counts
 
 
 class Command(BaseCommand):
     help = 'Выводит статистику по заявкам'
 
     def handle(self, *args, **options):
-        total = Application.objects.count()
+        counts = application_status_counts()
 
-        self.stdout.write(self.style.SUCCESS(f'Всего заявок: {total}'))
+        self.stdout.write(self.style.SUCCESS(f'Всего заявок: {counts["total"]}'))
 
         for status_code, status_name in Application.STATUS_CHOICES:
-            count = Application.objects.filter(status=status_code).count()
-            self.stdout.write(self.style.SUCCESS(f'{status_name}: {count}'))
+            self.stdout.write(self.style.SUCCESS(f'{status_name}: {counts[status_code]}'))
@@ -0,0 +1,83 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from vacancies.fastread import serialize_rows
+from vacancies.models import Application, Company, Resume, Skill, Student, Vacancy
+from vacancies.serializers import ApplicationSerializers, ResumeSerializers, VacancySerializers
+from vacancies.views import annotate_vacancies
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость ModelSerializer(many=True).data и быстрого пути fastread '
+        'на страницах вакансий, резюме и заявок (тестовые данные откатываются)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Строк на странице')
+        parser.add_argument('--repeat', type=int, default=50, help='Повторов замера')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        if rows < 1 or repeat < 1:
+            raise CommandError('--rows и --repeat должны быть положительными')
+
+        with transaction.atomic():
+            pages = self.seed(rows)
+            for serializer_class, page in pages:
+                if serializer_class(page, many=True).data != serialize_rows(serializer_class, page):
+                    raise CommandError(f'{serializer_class.__name__}: результаты не совпадают')
+                full = self.measure(lambda: serializer_class(page, many=True).data, repeat)
+                fast = self.measure(lambda: serialize_rows(serializer_class, page), repeat)
+                self.stdout.write(
+                    f'{serializer_class.__name__}: {full * 1000:.2f} мс → {fast * 1000:.2f} мс '
+                    f'на {len(page)} строк, ускорение ×{full / fast:.1f}'
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def measure(func, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    @staticmethod
+    def seed(rows):
+        company = Company.objects.create(name='Benchmark Co', email='bench@co.ru', industry='IT')
+        skills = [Skill.objects.create(name=f'benchmark-skill-{i}') for i in range(3)]
+        vacancies = Vacancy.objects.bulk_create(
+            Vacancy(company=company, title=f'Вакансия {i}', description='d', salary=50000 + i, status='active')
+            for i in range(rows)
+        )
+        students = Student.objects.bulk_create(
+            Student(
+                first_name='Bench', last_name=str(i), email=f'bench{i}@test.ru',
+                birth_date=date(2004, 1, 1), specialty='IT',
+            )
+            for i in range(rows)
+        )
+        resumes = Resume.objects.bulk_create(
+            Resume(student=student, title='Резюме', experience='exp', contacts='mail')
+            for student in students
+        )
+        Resume.skills.through.objects.bulk_create(
+            Resume.skills.through(resume=resume, skill=skill) for resume in resumes for skill in skills
+        )
+        Application.objects.bulk_create(
+            Application(student=student, vacancy=vacancy, resume=resume, cover_letter='c')
+            for student, vacancy, resume in zip(students, vacancies, resumes)
+        )
+
+        ids = [vacancy.pk for vacancy in vacancies]
+        return [
+            (VacancySerializers, list(annotate_vacancies(Vacancy.objects.filter(pk__in=ids)).order_by('id'))),
+            (ResumeSerializers, list(
+                Resume.objects.filter(student__in=students).prefetch_related('skills').order_by('id')
+            )),
+            (ApplicationSerializers, list(Application.objects.filter(vacancy_id__in=ids).order_by('id'))),
+        ]
@@ -0,0 +1,59 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from vacancies.history import get_retention_policy, history_deletions
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет старые и повторяющиеся исторические записи по политикам хранения '
+        '(HISTORY_RETENTION) порциями, не блокируя таблицы надолго'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', help='Только эти модели (например, vacancies.Application)')
+        parser.add_argument('--keep-last', type=int, help='Сколько последних версий объекта хранить всегда')
+        parser.add_argument('--keep-days', type=int, help='Сколько дней хранить все версии')
+        parser.add_argument('--no-collapse', action='store_true', help='Не удалять повторяющиеся снимки')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Строк в одном DELETE')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Пауза между порциями, с')
+        parser.add_argument('--dry-run', action='store_true', help='Только посчитать, ничего не удалять')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным')
+        models = [
+            model for model in apps.get_app_config('vacancies').get_models()
+            if hasattr(model._meta, 'simple_history_manager_attribute')
+        ]
+        if options['model']:
+            labels = {model._meta.label for model in models}
+            unknown = set(options['model']) - labels
+            if unknown:
+                raise CommandError(f'Нет истории у моделей: {", ".join(sorted(unknown))}')
+            models = [model for model in models if model._meta.label in options['model']]
+
+        for model in models:
+            policy = get_retention_policy(model)
+            if options['keep_last'] is not None:
+                policy['keep_last'] = options['keep_last']
+            if options['keep_days'] is not None:
+                policy['keep_days'] = options['keep_days']
+            if options['no_collapse']:
+                policy['collapse'] = False
+
+            history_model = model.history.model
+            total = history_model.objects.count()
+            ids = list(history_deletions(history_model, **policy))
+            if not options['dry_run']:
+                size = options['batch_size']
+                for start in range(0, len(ids), size):
+                    history_model.objects.filter(history_id__in=ids[start:start + size]).delete()
+                    if options['sleep']:
+                        time.sleep(options['sleep'])
+
+            verb = 'к удалению' if options['dry_run'] else 'удалено'
+            self.stdout.write(self.style.SUCCESS(
+                f'{history_model._meta.object_name}: {verb} {len(ids)} из {total}'
+            ))
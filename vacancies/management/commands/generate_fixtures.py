@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from vacancies.fixtures import generate_fixtures
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет БД синтетическими компаниями, вакансиями, студентами с резюме и заявками '
+        '(bulk_create порциями) для нагрузочного тестирования'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=500, help='Число компаний')
+        parser.add_argument('--vacancies', type=int, default=10_000, help='Число вакансий')
+        parser.add_argument('--students', type=int, default=10_000, help='Число студентов')
+        parser.add_argument('--applications', type=int, default=100_000, help='Число заявок')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Размер порции bulk_create')
+        parser.add_argument('--no-history', action='store_true',
+                            help='Не создавать исторические записи simple_history')
+        parser.add_argument('--seed', type=int, default=0, help='Зерно генератора случайных чисел')
+
+    def handle(self, *args, **options):
+        if min(options['companies'], options['vacancies'], options['students'], options['applications']) < 0:
+            raise CommandError('Количества не могут быть отрицательными')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть положительным')
+
+        started = time.perf_counter()
+
+        def progress(name, count):
+            self.stdout.write(f'{name}: {count} ({time.perf_counter() - started:.1f} с)')
+
+        try:
+            counts = generate_fixtures(
+                companies=options['companies'],
+                vacancies=options['vacancies'],
+                students=options['students'],
+                applications=options['applications'],
+                batch_size=options['batch_size'],
+                history=not options['no_history'],
+                seed=options['seed'],
+                progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано объектов: {sum(counts.values())} за {time.perf_counter() - started:.1f} с'
+        ))
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from vacancies.models import Company, Review, Student
+
+REQUIRED_KEYS = ('id', 'student_id', 'company_id', 'rating')
+
+
+class Command(BaseCommand):
+    help = 'Однократно переносит отзывы из reviews.json в таблицу Review'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=str(Path(settings.BASE_DIR) / 'reviews.json'),
+            help='Путь к JSON-файлу со списком отзывов',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'Файл не найден: {path}')
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+        if not isinstance(rows, list):
+            raise CommandError('Ожидается JSON-список отзывов')
+
+        student_ids = set(Student.objects.values_list('id', flat=True))
+        company_ids = set(Company.objects.values_list('id', flat=True))
+        reviews = []
+        skipped = []
+        for number, row in enumerate(rows, 1):
+            review, error = self.build_review(row, student_ids, company_ids)
+            if error:
+                skipped.append((number, error))
+            else:
+                reviews.append(review)
+
+        ids = [review.id for review in reviews]
+        with transaction.atomic():
+            existing = Review.objects.filter(pk__in=ids).count()
+            Review.objects.bulk_create(reviews, ignore_conflicts=True)
+            inserted = Review.objects.filter(pk__in=ids).count() - existing
+            # явные id не сдвигают последовательность в PostgreSQL
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [Review]):
+                    cursor.execute(sql)
+
+        self.stdout.write(self.style.SUCCESS(f'Импортировано отзывов: {inserted}'))
+        if len(reviews) > inserted:
+            self.stdout.write(self.style.WARNING(f'Пропущено (id уже занят): {len(reviews) - inserted}'))
+        for number, error in skipped:
+            self.stdout.write(self.style.WARNING(f'Запись {number} пропущена: {error}'))
+        call_command('rebuild_company_ratings', stdout=self.stdout)
+
+    def build_review(self, row, student_ids, company_ids):
+        if not isinstance(row, dict):
+            return None, 'ожидается объект'
+        missing = [key for key in REQUIRED_KEYS if key not in row]
+        if missing:
+            return None, f'нет полей {", ".join(missing)}'
+        review = Review(
+            id=row['id'],
+            student_id=row['student_id'],
+            company_id=row['company_id'],
+            rating=row['rating'],
+            text=row.get('text') or '',
+            is_approved=bool(row.get('is_approved')),
+        )
+        try:
+            # валидаторы модели (оценка 1..5); связи проверяются по множествам id ниже
+            review.clean_fields(exclude=['student', 'company', 'text'])
+        except ValidationError as exc:
+            return None, '; '.join(f'{field}: {" ".join(errors)}' for field, errors in exc.message_dict.items())
+        if review.student_id not in student_ids:
+            return None, f'нет студента {review.student_id}'
+        if review.company_id not in company_ids:
+            return None, f'нет компании {review.company_id}'
+        return review, None
@@ -0,0 +1,37 @@
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from vacancies.models import ShortlistEntry, Student, Vacancy
+
+SESSION_KEY_PREFIX = 'shortlist_'
+
+
+class Command(BaseCommand):
+    help = 'Однократно переносит shortlist студентов из активных сессий в таблицу ShortlistEntry'
+
+    def handle(self, *args, **options):
+        store = SessionStore()
+        wanted = set()
+        sessions = Session.objects.filter(expire_date__gt=timezone.now()).iterator()
+        for session in sessions:
+            data = store.decode(session.session_data)
+            for key, vacancy_ids in data.items():
+                if key.startswith(SESSION_KEY_PREFIX) and key[len(SESSION_KEY_PREFIX):].isdigit():
+                    student_id = int(key[len(SESSION_KEY_PREFIX):])
+                    wanted.update((student_id, int(vid)) for vid in vacancy_ids)
+
+        student_ids = set(Student.objects.filter(id__in={s for s, _ in wanted}).values_list('id', flat=True))
+        vacancy_ids = set(Vacancy.objects.filter(id__in={v for _, v in wanted}).values_list('id', flat=True))
+        entries = [
+            ShortlistEntry(student_id=student_id, vacancy_id=vacancy_id)
+            for student_id, vacancy_id in sorted(wanted)
+            if student_id in student_ids and vacancy_id in vacancy_ids
+        ]
+        # счётчики VacancyShortlistStat уже учитывают эти добавления
+        ShortlistEntry.objects.bulk_create(entries, ignore_conflicts=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Перенесено записей shortlist: {len(entries)}'))
+        skipped = len(wanted) - len(entries)
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Пропущено (нет студента или вакансии): {skipped}'))
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from vacancies.models import Vacancy, VacancyShortlistStat
+
+
+class Command(BaseCommand):
+    help = 'Переносит счётчики shortlist из shortlist_stats.json в таблицу VacancyShortlistStat'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=str(Path(settings.BASE_DIR) / 'shortlist_stats.json'),
+            help='Путь к JSON-файлу со счётчиками {vacancy_id: count}',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f'Файл не найден: {path}')
+        with open(path, encoding='utf-8') as f:
+            stats = json.load(f)
+
+        existing = set(Vacancy.objects.filter(id__in=[int(vid) for vid in stats]).values_list('id', flat=True))
+        counters = [
+            VacancyShortlistStat(vacancy_id=int(vid), count=max(int(cnt), 0))
+            for vid, cnt in stats.items()
+            if int(vid) in existing
+        ]
+        VacancyShortlistStat.objects.bulk_create(
+            counters,
+            update_conflicts=True,
+            unique_fields=['vacancy'],
+            update_fields=['count'],
+        )
+
+        skipped = len(stats) - len(counters)
+        self.stdout.write(self.style.SUCCESS(f'Перенесено счётчиков: {len(counters)}'))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Пропущено (вакансия не найдена): {skipped}'))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from vacancies.models import CompanyRating, Review
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает таблицу рейтингов компаний по одобренным отзывам'
+
+    def handle(self, *args, **options):
+        aggregates = (
+            Review.objects.filter(is_approved=True)
+            .values('company_id')
+            .annotate(rating_sum=Sum('rating'), rating_count=Count('id'))
+            .order_by()
+        )
+        ratings = [
+            CompanyRating(
+                company_id=row['company_id'],
+                rating_sum=row['rating_sum'],
+                rating_count=row['rating_count'],
+                rating_avg=round(row['rating_sum'] / row['rating_count'], 1),
+            )
+            for row in aggregates
+        ]
+        with transaction.atomic():
+            CompanyRating.objects.all().delete()
+            CompanyRating.objects.bulk_create(ratings)
+
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано рейтингов компаний: {len(ratings)}'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from vacancies.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает полнотекстовый индекс вакансий'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            count = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано вакансий: {count} ({type(backend).__name__})'
+        ))
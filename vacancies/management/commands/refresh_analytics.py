@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from vacancies.services import refresh_analytics_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересчитывает снимок аналитики (запускать периодически, например из cron)'
+
+    def handle(self, *args, **options):
+        snapshot = refresh_analytics_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'Снимок аналитики обновлён: вакансий {snapshot.vacancies_total}, '
+            f'заявок {snapshot.applications_total}, студентов {snapshot.students_total}'
+        ))
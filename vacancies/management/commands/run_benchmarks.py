@@ -0,0 +1,85 @@
+import json
+import platform
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils import timezone
+from vacancies.benchmarks import SCENARIOS, compare_results, run_scenarios, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет отдельную тестовую БД и замеряет время, число SQL-запросов и пиковую память '
+        'горячих путей API и веб-интерфейса; результат сохраняется в JSON и сравнивается с baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vacancies', type=int, default=10_000, help='Число вакансий')
+        parser.add_argument('--students', type=int, default=5_000, help='Число студентов')
+        parser.add_argument('--applications', type=int, default=50_000, help='Число заявок')
+        parser.add_argument('--repeat', type=int, default=5, help='Замеров времени на сценарий')
+        parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Только эти сценарии')
+        parser.add_argument('--output', help='Куда сохранить результаты (JSON)')
+        parser.add_argument('--compare', help='Baseline (JSON) для сравнения')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='Допустимый рост времени и памяти относительно baseline, %%')
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help='Завершиться с ошибкой при регрессии')
+
+    def handle(self, *args, **options):
+        if min(options['vacancies'], options['students'], options['repeat']) < 1:
+            raise CommandError('--vacancies, --students и --repeat должны быть положительными')
+        baseline = None
+        if options['compare']:
+            path = Path(options['compare'])
+            if not path.exists():
+                raise CommandError(f'Файл не найден: {path}')
+            baseline = json.loads(path.read_text(encoding='utf-8'))
+
+        # профилировщик silk пишет каждый запрос в БД и искажает замеры
+        middleware = [name for name in settings.MIDDLEWARE if not name.startswith('silk.')]
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(MIDDLEWARE=middleware, ALLOWED_HOSTS=['*']):
+                self.stdout.write('Наполнение БД...')
+                data = seed_benchmark_data(options['vacancies'], options['students'], options['applications'])
+                results = run_scenarios(data, options['scenario'] or SCENARIOS, options['repeat'])
+            vendor = connection.vendor
+        finally:
+            teardown_databases(old_config, verbosity=0)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: {result["time_ms"]["median"]:.1f} мс, запросов {result["queries"]}, '
+                f'память {result["peak_memory_kb"]:.0f} КБ'
+            )
+
+        if options['output']:
+            report = {
+                'meta': {
+                    'created_at': timezone.now().isoformat(),
+                    'database': vendor,
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'vacancies': options['vacancies'],
+                    'students': options['students'],
+                    'applications': options['applications'],
+                    'repeat': options['repeat'],
+                },
+                'results': results,
+            }
+            Path(options['output']).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Результаты сохранены: {options["output"]}'))
+
+        if baseline is not None:
+            regressions = 0
+            for name, change, regression in compare_results(baseline['results'], results, options['threshold']):
+                style = self.style.ERROR if regression else self.style.SUCCESS
+                self.stdout.write(style(f'{name}: {change}'))
+                regressions += regression
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'Регрессий: {regressions}')
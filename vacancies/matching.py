@@ -0,0 +1,237 @@
+"""
+Подбор вакансий под резюме по навыкам.
+
+Навыки вакансии извлекаются из текста requirements по справочнику Skill
+(целые слова и фразы без учёта регистра). SkillIndex хранит активные
+вакансии как битовые множества Python int: для каждого навыка — маска
+позиций вакансий, где он требуется, и для каждого числа навыков — маска
+вакансий с таким числом требований. Позиции упорядочены от новых
+вакансий к старым.
+
+Оценка вакансии — доля её требований, которые покрывает резюме.
+SkillIndex.top() считает число совпадений сразу по всем вакансиям
+побитовыми операциями над масками (O(k²) операций над int длиной в число
+вакансий для k навыков резюме) и перебирает уровни оценки по убыванию,
+доставая из масок только первые limit позиций, поэтому время почти не
+зависит от числа вакансий.
+
+Индекс строится лениво в памяти процесса и перестраивается, когда меняется
+его версия в кэше вакансий: её сбрасывают после коммита сигналы Vacancy и
+Skill, импорт вакансий и refresh_derived_data(). На общем бэкенде кэша
+(file, Redis) смена версии видна всем процессам сразу; версия к тому же
+живёт не дольше VERSION_TIMEOUT, поэтому даже без общего кэша (locmem)
+индекс процесса отстаёт от БД не больше чем на это время.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from array import array
+from collections.abc import Collection
+
+from .cache import bump_version, on_commit_once, versioned_key
+from .models import Resume, Skill, Vacancy
+
+VERSION_KEY = 'matching-version'
+VERSION_TIMEOUT = 300
+MATCH_LIMIT = 20
+MAX_MATCH_LIMIT = 100
+
+
+def get_index_version() -> str:
+    """Текущая версия индекса; создаётся при первом обращении."""
+    return versioned_key(VERSION_KEY, VERSION_TIMEOUT)
+
+
+def bump_index_version() -> None:
+    bump_version(VERSION_KEY, VERSION_TIMEOUT)
+
+
+def invalidate_matching_index() -> None:
+    """Пометить индекс навыков устаревшим после коммита: он перестроится при следующем подборе."""
+    on_commit_once(bump_index_version)
+
+
+class SkillExtractor:
+    """Поиск навыков из справочника в тексте одним регулярным выражением."""
+
+    def __init__(self, names: dict[int, str]) -> None:
+        self.names = names
+        self.ids = {name.lower(): pk for pk, name in names.items()}
+        # длинные названия первыми, чтобы «c++» не распознавался как «c»
+        alternatives = '|'.join(re.escape(name) for name in sorted(self.ids, key=len, reverse=True))
+        self.pattern = re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)') if names else None
+
+    @classmethod
+    def load(cls) -> SkillExtractor:
+        return cls(dict(Skill.objects.values_list('pk', 'name')))
+
+    def extract(self, text: str) -> set[int]:
+        """
+        Id навыков, упомянутых в тексте.
+
+        Args:
+            text: Текст требований или навыков резюме.
+
+        Returns:
+            Множество id Skill.
+        """
+        if self.pattern is None or not text:
+            return set()
+        return {self.ids[name] for name in self.pattern.findall(text.lower())}
+
+
+def set_bit(bits: bytearray, position: int) -> None:
+    byte = position >> 3
+    if byte >= len(bits):
+        bits.extend(bytes(byte + 1 - len(bits)))
+    bits[byte] |= 1 << (position & 7)
+
+
+class SkillIndex:
+    """Активные вакансии как битовые маски по навыкам и по числу требований."""
+
+    def __init__(self, version: str, extractor: SkillExtractor, vacancy_ids: array,
+                 skill_masks: dict[int, int], size_masks: dict[int, int]) -> None:
+        self.version = version
+        self.extractor = extractor
+        # позиция в масках -> id вакансии
+        self.vacancy_ids = vacancy_ids
+        self.skill_masks = skill_masks
+        self.size_masks = size_masks
+        self.all_mask = (1 << len(vacancy_ids)) - 1
+
+    @classmethod
+    def build(cls, version: str) -> SkillIndex:
+        """
+        Построить индекс по активным вакансиям за один проход по таблице.
+
+        Args:
+            version: Версия индекса (get_index_version()).
+
+        Returns:
+            SkillIndex.
+        """
+        extractor = SkillExtractor.load()
+        vacancy_ids = array('q')
+        skill_bits: dict[int, bytearray] = {}
+        size_bits: dict[int, bytearray] = {}
+        rows = (
+            Vacancy.objects.filter(status='active')
+            .order_by('-published_at', '-id')
+            .values_list('id', 'requirements')
+            .iterator(chunk_size=5000)
+        )
+        for position, (vacancy_id, requirements) in enumerate(rows):
+            vacancy_ids.append(vacancy_id)
+            skills = extractor.extract(requirements)
+            if not skills:
+                continue
+            for skill_id in skills:
+                set_bit(skill_bits.setdefault(skill_id, bytearray()), position)
+            set_bit(size_bits.setdefault(len(skills), bytearray()), position)
+
+        def to_masks(bits: dict[int, bytearray]) -> dict[int, int]:
+            return {key: int.from_bytes(value, 'little') for key, value in bits.items()}
+
+        return cls(version, extractor, vacancy_ids, to_masks(skill_bits), to_masks(size_bits))
+
+    def top(self, skill_ids: Collection[int], limit: int = MATCH_LIMIT) -> list[tuple[int, int, int]]:
+        """
+        Лучшие вакансии для набора навыков.
+
+        Порядок: доля покрытых требований, затем число совпавших навыков,
+        затем новизна вакансии.
+
+        Args:
+            skill_ids: Id навыков резюме.
+            limit: Сколько вакансий вернуть.
+
+        Returns:
+            Список (id вакансии, совпало навыков, требуется навыков).
+        """
+        masks = [self.skill_masks[skill_id] for skill_id in set(skill_ids) if skill_id in self.skill_masks]
+        if not masks or limit <= 0:
+            return []
+        # at_least[c] — вакансии, у которых совпало не меньше c навыков резюме
+        at_least = [self.all_mask] + [0] * len(masks)
+        for added, mask in enumerate(masks, 1):
+            for count in range(added, 0, -1):
+                at_least[count] |= at_least[count - 1] & mask
+        at_least.append(0)
+        exactly = [at_least[count] & ~at_least[count + 1] for count in range(len(at_least) - 1)]
+
+        levels = sorted(
+            (
+                (matched, required)
+                for required in self.size_masks
+                for matched in range(1, min(required, len(masks)) + 1)
+            ),
+            key=lambda level: (-level[0] / level[1], -level[0], level[1]),
+        )
+        result = []
+        for matched, required in levels:
+            candidates = exactly[matched] & self.size_masks[required]
+            while candidates:
+                lowest = candidates & -candidates
+                result.append((self.vacancy_ids[lowest.bit_length() - 1], matched, required))
+                if len(result) == limit:
+                    return result
+                candidates ^= lowest
+        return result
+
+
+_index: SkillIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index() -> SkillIndex:
+    """
+    Индекс навыков текущей версии; при смене версии перестраивается.
+
+    Returns:
+        SkillIndex.
+    """
+    global _index
+    version = get_index_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = SkillIndex.build(version)
+        return _index
+
+
+def resume_skill_ids(resume: Resume, extractor: SkillExtractor) -> set[int]:
+    """
+    Навыки резюме: связь skills, а если она пуста — навыки из текста skills_text.
+
+    Args:
+        resume: Резюме (skills лучше загрузить prefetch_related).
+        extractor: Справочник навыков индекса.
+
+    Returns:
+        Множество id Skill.
+    """
+    skill_ids = {skill.pk for skill in resume.skills.all()}
+    return skill_ids or extractor.extract(resume.skills_text)
+
+
+def match_vacancies(resume: Resume, limit: int = MATCH_LIMIT) -> tuple[list[str], list[tuple[int, int, int]]]:
+    """
+    Подобрать вакансии под резюме.
+
+    Args:
+        resume: Резюме.
+        limit: Сколько вакансий вернуть.
+
+    Returns:
+        Названия навыков резюме и список (id вакансии, совпало навыков,
+        требуется навыков) от лучших вакансий к худшим.
+    """
+    index = get_skill_index()
+    skill_ids = resume_skill_ids(resume, index.extractor)
+    names = sorted(index.extractor.names[pk] for pk in skill_ids if pk in index.extractor.names)
+    return names, index.top(skill_ids, limit)
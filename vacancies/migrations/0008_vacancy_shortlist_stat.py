@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 15:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0007_remove_legacy_resume_skills_column'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyShortlistStat',
+            fields=[
+                ('vacancy', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='shortlist_stat', serialize=False, to='vacancies.vacancy', verbose_name='Вакансия')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Добавлений в shortlist')),
+            ],
+            options={
+                'verbose_name': 'Счётчик shortlist',
+                'verbose_name_plural': 'Счётчики shortlist',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0008_vacancy_shortlist_stat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyRating',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to='vacancies.company', verbose_name='Компания')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('rating_count', models.PositiveIntegerField(default=0, verbose_name='Число оценок')),
+                ('rating_avg', models.FloatField(default=0.0, verbose_name='Средняя оценка')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг компании',
+                'verbose_name_plural': 'Рейтинги компаний',
+            },
+        ),
+    ]
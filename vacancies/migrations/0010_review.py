@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-18 15:22
+
+import django.core.validators
+import django.db.models.deletion
+import simple_history.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0009_company_rating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoricalReview',
+            fields=[
+                ('id', models.BigIntegerField(auto_created=True, blank=True, db_index=True, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)], verbose_name='Оценка')),
+                ('text', models.TextField(verbose_name='Текст отзыва')),
+                ('is_approved', models.BooleanField(default=False, verbose_name='Одобрен')),
+                ('created_at', models.DateTimeField(blank=True, editable=False, verbose_name='Дата создания')),
+                ('history_id', models.AutoField(primary_key=True, serialize=False)),
+                ('history_date', models.DateTimeField(db_index=True)),
+                ('history_change_reason', models.CharField(max_length=100, null=True)),
+                ('history_type', models.CharField(choices=[('+', 'Created'), ('~', 'Changed'), ('-', 'Deleted')], max_length=1)),
+                ('company', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='vacancies.company', verbose_name='Компания')),
+                ('history_user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('student', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='vacancies.student', verbose_name='Студент')),
+            ],
+            options={
+                'verbose_name': 'historical Отзыв',
+                'verbose_name_plural': 'historical Отзывы',
+                'ordering': ('-history_date', '-history_id'),
+                'get_latest_by': ('history_date', 'history_id'),
+            },
+            bases=(simple_history.models.HistoricalChanges, models.Model),
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rating', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)], verbose_name='Оценка')),
+                ('text', models.TextField(verbose_name='Текст отзыва')),
+                ('is_approved', models.BooleanField(default=False, verbose_name='Одобрен')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='vacancies.company', verbose_name='Компания')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='vacancies.student', verbose_name='Студент')),
+            ],
+            options={
+                'verbose_name': 'Отзыв',
+                'verbose_name_plural': 'Отзывы',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['company', 'is_approved'], name='vacancies_r_company_6a64ee_idx'), models.Index(fields=['student'], name='vacancies_r_student_b3efd5_idx'), models.Index(fields=['is_approved'], name='vacancies_r_is_appr_a9d71a_idx')],
+            },
+        ),
+    ]
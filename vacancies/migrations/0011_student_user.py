@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 15:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_students_to_users(apps, schema_editor):
+    """Привязать студентов к пользователям с тем же email (по старой схеме сопоставления)."""
+    Student = apps.get_model('vacancies', 'Student')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    user_by_email = {}
+    for user_id, email in User.objects.exclude(email='').order_by('-id').values_list('id', 'email'):
+        user_by_email[email] = user_id
+    students = []
+    for student in Student.objects.filter(user__isnull=True).only('id', 'email'):
+        user_id = user_by_email.get(student.email)
+        if user_id is not None:
+            student.user_id = user_id
+            students.append(student)
+    Student.objects.bulk_update(students, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0010_review'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalstudent',
+            name='user',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='student', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        migrations.RunPython(link_students_to_users, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0 on 2026-10-18 15:40
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS vacancies_vacancy_fts '
+                'USING fts5(title, description, requirements, tokenize="unicode61 remove_diacritics 2")'
+            )
+            cursor.execute(
+                'INSERT INTO vacancies_vacancy_fts (rowid, title, description, requirements) '
+                'SELECT id, title, description, requirements FROM vacancies_vacancy'
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                'CREATE TABLE IF NOT EXISTS vacancies_vacancy_search ('
+                'vacancy_id integer PRIMARY KEY REFERENCES vacancies_vacancy (id) ON DELETE CASCADE, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS vacancies_vacancy_search_document_idx '
+                'ON vacancies_vacancy_search USING GIN (document)'
+            )
+            cursor.execute(
+                "INSERT INTO vacancies_vacancy_search (vacancy_id, document) "
+                "SELECT id, "
+                "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('russian', coalesce(requirements, '')), 'B') || "
+                "setweight(to_tsvector('russian', coalesce(description, '')), 'C') "
+                "FROM vacancies_vacancy"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('DROP TABLE IF EXISTS vacancies_vacancy_fts')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('DROP TABLE IF EXISTS vacancies_vacancy_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0011_student_user'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
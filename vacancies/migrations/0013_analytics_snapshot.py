@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-18 15:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0012_vacancy_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vacancies_total', models.IntegerField(default=0, verbose_name='Всего вакансий')),
+                ('vacancies_active', models.IntegerField(default=0, verbose_name='Активных вакансий')),
+                ('applications_total', models.IntegerField(default=0, verbose_name='Всего заявок')),
+                ('applications_by_status', models.JSONField(default=dict, verbose_name='Заявки по статусам')),
+                ('students_total', models.IntegerField(default=0, verbose_name='Всего студентов')),
+                ('popular_vacancies', models.JSONField(default=list, verbose_name='Популярные вакансии')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Снимок аналитики',
+                'verbose_name_plural': 'Снимки аналитики',
+            },
+        ),
+    ]
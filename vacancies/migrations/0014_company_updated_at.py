@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 15:42
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0013_analytics_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата обновления'),
+        ),
+        migrations.AddField(
+            model_name='historicalcompany',
+            name='updated_at',
+            field=models.DateTimeField(blank=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата обновления'),
+            preserve_default=False,
+        ),
+    ]
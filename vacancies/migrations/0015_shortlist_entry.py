@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 15:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vacancies', '0014_company_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShortlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата добавления')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shortlist_entries', to='vacancies.student', verbose_name='Студент')),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shortlist_entries', to='vacancies.vacancy', verbose_name='Вакансия')),
+            ],
+            options={
+                'verbose_name': 'Вакансия в shortlist',
+                'verbose_name_plural': 'Shortlist студентов',
+                'ordering': ['-created_at', '-id'],
+                'constraints': [models.UniqueConstraint(fields=('student', 'vacancy'), name='unique_shortlist_entry')],
+            },
+        ),
+    ]
@@ -1,8 +1,9 @@
 from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth.models import User
-from simple_history.models import HistoricalRecords
+from .history import BufferedHistoricalRecords
 
 
 class Vacancy(models.Model):
@@ -38,7 +39,7 @@ class Vacancy(models.Model):
     created_at = models.DateTimeField('Дата создания', auto_now_add=True)
     updated_at = models.DateTimeField('Дата обновления', auto_now=True)
 
-    history = HistoricalRecords()
+    history = BufferedHistoricalRecords()
 
     class Meta:
         verbose_name = 'Вакансия'
@@ -77,6 +78,10 @@ class Skill(models.Model):
 
 
 class Student(models.Model):
+    user = models.OneToOneField(
+        User, verbose_name='Пользователь', on_delete=models.SET_NULL,
+        null=True, blank=True, related_name='student',
+    )
     first_name = models.CharField('Имя', max_length=30)
     last_name = models.CharField('Фамилия', max_length=30)
     email = models.EmailField('Email', unique=True)
@@ -88,7 +93,7 @@ class Student(models.Model):
     faculty = models.CharField('Факультет', max_length=150, blank=True)
     photo = models.ImageField('Фото', upload_to='students/photos/', null=True, blank=True)
 
-    history = HistoricalRecords()
+    history = BufferedHistoricalRecords()
 
     def clean(self):
         super().clean()
@@ -119,8 +124,9 @@ class Company(models.Model):
     address = models.CharField('Адрес', max_length=255, blank=True)
     logo = models.ImageField('Логотип', upload_to='companies/logos/', null=True, blank=True)
     size = models.CharField('Размер компании', max_length=50, blank=True)
+    updated_at = models.DateTimeField('Дата обновления', auto_now=True)
 
-    history = HistoricalRecords()
+    history = BufferedHistoricalRecords()
 
     def __str__(self):
         return f'{self.name} ({self.email})'
@@ -153,7 +159,7 @@ class Resume(models.Model):
     created_by = models.ForeignKey(User, verbose_name='Создал', on_delete=models.SET_NULL, null=True, blank=True, related_name='created_resumes')
     updated_by = models.ForeignKey(User, verbose_name='Изменил', on_delete=models.SET_NULL, null=True, blank=True, related_name='updated_resumes')
 
-    history = HistoricalRecords()
+    history = BufferedHistoricalRecords()
 
     class Meta:
         verbose_name = 'Резюме'
@@ -182,7 +188,7 @@ class Application(models.Model):
     response_date = models.DateTimeField('Дата ответа', null=True, blank=True)
     employer_comment = models.TextField('Комментарий работодателя')
 
-    history = HistoricalRecords()
+    history = BufferedHistoricalRecords()
 
     class Meta:
         verbose_name = 'Заявка'
@@ -205,3 +211,99 @@ class Application(models.Model):
 
     def __str__(self):
         return f'{self.student} - {self.vacancy}'
+
+
+class VacancyShortlistStat(models.Model):
+    vacancy = models.OneToOneField(
+        Vacancy, verbose_name='Вакансия', on_delete=models.CASCADE,
+        primary_key=True, related_name='shortlist_stat',
+    )
+    count = models.PositiveIntegerField('Добавлений в shortlist', default=0)
+
+    class Meta:
+        verbose_name = 'Счётчик shortlist'
+        verbose_name_plural = 'Счётчики shortlist'
+
+    def __str__(self):
+        return f'{self.vacancy_id}: {self.count}'
+
+
+class ShortlistEntry(models.Model):
+    student = models.ForeignKey(
+        Student, verbose_name='Студент', on_delete=models.CASCADE, related_name='shortlist_entries',
+    )
+    vacancy = models.ForeignKey(
+        Vacancy, verbose_name='Вакансия', on_delete=models.CASCADE, related_name='shortlist_entries',
+    )
+    created_at = models.DateTimeField('Дата добавления', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Вакансия в shortlist'
+        verbose_name_plural = 'Shortlist студентов'
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'vacancy'], name='unique_shortlist_entry'),
+        ]
+
+    def __str__(self):
+        return f'{self.student_id} → {self.vacancy_id}'
+
+
+class CompanyRating(models.Model):
+    company = models.OneToOneField(
+        Company, verbose_name='Компания', on_delete=models.CASCADE,
+        primary_key=True, related_name='rating',
+    )
+    rating_sum = models.PositiveIntegerField('Сумма оценок', default=0)
+    rating_count = models.PositiveIntegerField('Число оценок', default=0)
+    rating_avg = models.FloatField('Средняя оценка', default=0.0)
+
+    class Meta:
+        verbose_name = 'Рейтинг компании'
+        verbose_name_plural = 'Рейтинги компаний'
+
+    def __str__(self):
+        return f'{self.company_id}: {self.rating_avg}'
+
+
+class Review(models.Model):
+    student = models.ForeignKey(Student, verbose_name='Студент', on_delete=models.CASCADE, related_name='reviews')
+    company = models.ForeignKey(Company, verbose_name='Компания', on_delete=models.CASCADE, related_name='reviews')
+    rating = models.PositiveSmallIntegerField(
+        'Оценка', validators=[MinValueValidator(1), MaxValueValidator(5)],
+    )
+    text = models.TextField('Текст отзыва')
+    is_approved = models.BooleanField('Одобрен', default=False)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+
+    history = BufferedHistoricalRecords()
+
+    class Meta:
+        verbose_name = 'Отзыв'
+        verbose_name_plural = 'Отзывы'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['company', 'is_approved']),
+            models.Index(fields=['student']),
+            models.Index(fields=['is_approved']),
+        ]
+
+    def __str__(self):
+        return f'{self.company} — {self.rating}/5'
+
+
+class AnalyticsSnapshot(models.Model):
+    vacancies_total = models.IntegerField('Всего вакансий', default=0)
+    vacancies_active = models.IntegerField('Активных вакансий', default=0)
+    applications_total = models.IntegerField('Всего заявок', default=0)
+    applications_by_status = models.JSONField('Заявки по статусам', default=dict)
+    students_total = models.IntegerField('Всего студентов', default=0)
+    popular_vacancies = models.JSONField('Популярные вакансии', default=list)
+    updated_at = models.DateTimeField('Дата обновления', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Снимок аналитики'
+        verbose_name_plural = 'Снимки аналитики'
+
+    def __str__(self):
+        return f'Аналитика на {self.updated_at:%d.%m.%Y %H:%M}'
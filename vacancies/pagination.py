@@ -0,0 +1,139 @@
+"""
+Пагинация API: номера страниц по умолчанию и keyset-режим по ?cursor=.
+
+Keyset-страница фильтруется по значениям полей сортировки последней строки
+предыдущей страницы, поэтому глубокие страницы стоят столько же, сколько
+первая, и COUNT(*) не выполняется.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    PageNumberPagination с опциональным keyset-режимом.
+
+    Без параметра cursor работает как обычная постраничная пагинация.
+    С ?cursor= (пустым для первой страницы) порядок фиксируется полями
+    keyset_ordering, а ответ содержит только next, previous и results.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор'
+    keyset_ordering: tuple[str, ...] = ('-id',)
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None,
+    ) -> list[Any] | None:
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.display_page_controls = False
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        position, reverse = self.decode_cursor(request)
+        ordering = [self.flip(field) for field in self.keyset_ordering] if reverse else list(self.keyset_ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.after_position(queryset.model, ordering, position))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_cursor = self.encode_cursor(rows[-1], reverse=False) if has_next and rows else None
+        self.previous_cursor = self.encode_cursor(rows[0], reverse=True) if has_previous and rows else None
+        return rows
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response({
+            'next': self.build_link(self.next_cursor),
+            'previous': self.build_link(self.previous_cursor),
+            'results': data,
+        })
+
+    @staticmethod
+    def flip(field: str) -> str:
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after_position(model: type[Model], ordering: list[str], position: list[Any]) -> Q:
+        """
+        Условие «строго после позиции» для составного ключа сортировки.
+
+        (a, b) после (x, y) ⇔ a > x ИЛИ (a = x И b > y); для полей по убыванию — «<».
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            value = model._meta.get_field(name).to_python(value)
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def decode_cursor(self, request: Request) -> tuple[list[Any] | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = payload['p'], bool(payload.get('r'))
+            if not isinstance(position, list) or len(position) != len(self.keyset_ordering):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, row: Model, reverse: bool) -> str:
+        position = []
+        for field in self.keyset_ordering:
+            value = getattr(row, field.lstrip('-'))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def build_link(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+
+class VacancyPagination(KeysetPagination):
+    """Вакансии: keyset по (published_at, id), от новых к старым."""
+
+    keyset_ordering = ('-published_at', '-id')
+
+
+class ApplicationPagination(KeysetPagination):
+    """Заявки: keyset по (submitted_at, id), от новых к старым."""
+
+    keyset_ordering = ('-submitted_at', '-id')
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.http import HttpRequest
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from rest_framework.request import Request
 from rest_framework.views import APIView
@@ -12,7 +13,12 @@ from .models import Student
 
 def get_user_student(user: AbstractBaseUser | AnonymousUser) -> Student | None:
     """
-    Профиль студента по email текущего пользователя.
+    Профиль студента, привязанный к пользователю через Student.user.
+
+    Если пользователь загружен StudentModelBackend, профиль уже получен
+    через select_related и дополнительного запроса нет. Студент, созданный
+    без пользователя (API, админка), находится по email и привязывается
+    к пользователю при первом обращении.
 
     Args:
         user: Пользователь Django (сессия/API).
@@ -22,7 +28,39 @@ def get_user_student(user: AbstractBaseUser | AnonymousUser) -> Student | None:
     """
     if not user.is_authenticated or user.is_staff:
         return None
-    return Student.objects.filter(email=user.email).first()
+    try:
+        return user.student
+    except Student.DoesNotExist:
+        pass
+    if not user.email:
+        return None
+    student = Student.objects.filter(email=user.email, user__isnull=True).order_by('pk').first()
+    if student is None:
+        return None
+    # update() без сигналов и истории; условие защищает от гонки двух запросов
+    if not Student.objects.filter(pk=student.pk, user__isnull=True).update(user=user):
+        return None
+    student.user = user
+    return student
+
+
+def get_request_student(request: HttpRequest | Request) -> Student | None:
+    """
+    Профиль студента текущего запроса, вычисляемый один раз на запрос.
+
+    Результат кешируется в атрибуте запроса (как request.user в
+    AuthenticationMiddleware), поэтому права, контекст сериализатора и
+    actions не повторяют запрос к Student.
+
+    Args:
+        request: HTTP-запрос Django или DRF.
+
+    Returns:
+        Student или None для гостя/администратора.
+    """
+    if not hasattr(request, '_cached_student'):
+        request._cached_student = get_user_student(request.user)
+    return request._cached_student
 
 
 class IsAdmin(BasePermission):
@@ -60,7 +98,7 @@ class IsAdminOrApplicationOwner(BasePermission):
     def has_object_permission(self, request: Request, view: APIView, obj: Any) -> bool:
         if request.user.is_staff:
             return True
-        student = get_user_student(request.user)
+        student = get_request_student(request)
         return student is not None and obj.student_id == student.id
 
 
@@ -72,5 +110,5 @@ class IsAdminOrStudentOwner(BasePermission):
     def has_object_permission(self, request: Request, view: APIView, obj: Any) -> bool:
         if request.user.is_staff:
             return True
-        student = get_user_student(request.user)
+        student = get_request_student(request)
         return student is not None and obj.id == student.id
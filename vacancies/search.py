@@ -0,0 +1,228 @@
+"""
+Полнотекстовый поиск вакансий.
+
+Инвертированный индекс по title, description и requirements:
+FTS5 для SQLite и tsvector для PostgreSQL. Бэкенд выбирается настройкой
+VACANCY_SEARCH_BACKEND или по типу БД; индекс синхронизируется сигналами
+модели Vacancy (signals.py) и пересобирается командой rebuild_search_index.
+
+Запрос к индексу соединяется с таблицей вакансий (extra(tables=...)), так
+что полнотекстовое условие и ранг вычисляются за один проход по индексу.
+Поэтому annotate_vacancies не группирует строки: bm25() в SQLite нельзя
+вызывать в запросе с GROUP BY.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, QuerySet, Value
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .models import Vacancy
+
+SEARCH_FIELDS = ('title', 'description', 'requirements')
+VACANCY_TABLE = Vacancy._meta.db_table
+
+
+def tokenize(query: str) -> list[str]:
+    """
+    Слова поискового запроса без операторов и кавычек.
+
+    Args:
+        query: Строка из параметра ?search=.
+
+    Returns:
+        Список слов в нижнем регистре.
+    """
+    return [token.lower() for token in re.findall(r'\w+', query)]
+
+
+class BaseSearchBackend:
+    """Поиск без индекса (icontains по всем полям); базовый интерфейс бэкендов."""
+
+    def index(self, vacancies: Iterable[Vacancy]) -> None:
+        """Добавить или обновить вакансии в индексе."""
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        """Удалить вакансии из индекса."""
+
+    def rebuild(self) -> int:
+        """
+        Пересобрать индекс по всей таблице вакансий.
+
+        Returns:
+            Число проиндексированных вакансий.
+        """
+        return Vacancy.objects.count()
+
+    def search(self, queryset: QuerySet[Vacancy], query: str) -> QuerySet[Vacancy]:
+        """
+        Отфильтровать вакансии по запросу и аннотировать search_rank (больше — релевантнее).
+
+        Args:
+            queryset: QuerySet вакансий.
+            query: Поисковый запрос.
+
+        Returns:
+            QuerySet с аннотацией search_rank.
+        """
+        condition = Q()
+        for token in tokenize(query):
+            token_condition = Q()
+            for field in SEARCH_FIELDS:
+                token_condition |= Q(**{f'{field}__icontains': token})
+            condition &= token_condition
+        return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """Индекс FTS5 (виртуальная таблица, rowid = id вакансии), ранжирование bm25."""
+
+    table = 'vacancies_vacancy_fts'
+    # веса колонок bm25: совпадение в названии важнее, чем в описании
+    weights = (10.0, 1.0, 5.0)
+
+    def index(self, vacancies: Iterable[Vacancy]) -> None:
+        rows = [(v.pk, v.title, v.description, v.requirements) for v in vacancies]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE rowid = %s', [(vid,) for vid in vacancy_ids])
+
+    def rebuild(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) '
+                f'SELECT id, {", ".join(SEARCH_FIELDS)} FROM {VACANCY_TABLE}'
+            )
+            return cursor.rowcount
+
+    def build_match(self, query: str) -> str:
+        """Запрос FTS5: каждое слово как префикс, слова через AND."""
+        return ' '.join(f'"{token}"*' for token in tokenize(query))
+
+    def search(self, queryset: QuerySet[Vacancy], query: str) -> QuerySet[Vacancy]:
+        match = self.build_match(query)
+        if not match:
+            return super().search(queryset, query)
+        weights = ', '.join(str(w) for w in self.weights)
+        # соединение с таблицей FTS: MATCH выполняется один раз на запрос, а не
+        # коррелированным подзапросом на каждую найденную вакансию
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table} MATCH %s', f'{self.table}.rowid = {VACANCY_TABLE}.id'],
+            params=[match],
+            select={'search_rank': f'-bm25({self.table}, {weights})'},
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Индекс tsvector с GIN-индексом в отдельной таблице, ранжирование ts_rank."""
+
+    table = 'vacancies_vacancy_search'
+    # веса A/B/C: название, требования, описание
+    document_sql = (
+        "setweight(to_tsvector(%s, coalesce({title}, '')), 'A') || "
+        "setweight(to_tsvector(%s, coalesce({requirements}, '')), 'B') || "
+        "setweight(to_tsvector(%s, coalesce({description}, '')), 'C')"
+    )
+
+    @property
+    def config(self) -> str:
+        return getattr(settings, 'VACANCY_SEARCH_CONFIG', 'russian')
+
+    def index(self, vacancies: Iterable[Vacancy]) -> None:
+        document = self.document_sql.format(title='%s', requirements='%s', description='%s')
+        rows = [
+            (v.pk, self.config, v.title, self.config, v.requirements, self.config, v.description)
+            for v in vacancies
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (vacancy_id, document) VALUES (%s, {document}) '
+                f'ON CONFLICT (vacancy_id) DO UPDATE SET document = EXCLUDED.document',
+                rows,
+            )
+
+    def remove(self, vacancy_ids: Iterable[int]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE vacancy_id = ANY(%s)', [list(vacancy_ids)])
+
+    def rebuild(self) -> int:
+        document = self.document_sql.format(title='title', requirements='requirements', description='description')
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (vacancy_id, document) SELECT id, {document} FROM {VACANCY_TABLE}',
+                [self.config] * 3,
+            )
+            return cursor.rowcount
+
+    def build_tsquery(self, query: str) -> str:
+        """Запрос to_tsquery: каждое слово как префикс, слова через &."""
+        return ' & '.join(f'{token}:*' for token in tokenize(query))
+
+    def search(self, queryset: QuerySet[Vacancy], query: str) -> QuerySet[Vacancy]:
+        tsquery = self.build_tsquery(query)
+        if not tsquery:
+            return super().search(queryset, query)
+        return queryset.extra(
+            tables=[self.table],
+            where=[f'{self.table}.document @@ to_tsquery(%s, %s)', f'{self.table}.vacancy_id = {VACANCY_TABLE}.id'],
+            params=[self.config, tsquery],
+            select={'search_rank': f'ts_rank({self.table}.document, to_tsquery(%s, %s))'},
+            select_params=[self.config, tsquery],
+        )
+
+
+DEFAULT_BACKENDS = {
+    'sqlite': 'vacancies.search.SQLiteFTS5Backend',
+    'postgresql': 'vacancies.search.PostgresSearchBackend',
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> BaseSearchBackend:
+    """
+    Бэкенд поиска из VACANCY_SEARCH_BACKEND или по типу основной БД.
+
+    Returns:
+        Экземпляр бэкенда поиска.
+    """
+    path = getattr(settings, 'VACANCY_SEARCH_BACKEND', None)
+    if path is None:
+        path = DEFAULT_BACKENDS.get(connection.vendor, 'vacancies.search.BaseSearchBackend')
+    return import_string(path)()
+
+
+class VacancySearchFilter(SearchFilter):
+    """?search= через индекс бэкенда; без ?ordering= результаты сортируются по релевантности."""
+
+    def filter_queryset(self, request: Request, queryset: QuerySet[Vacancy], view: APIView) -> QuerySet[Vacancy]:
+        query = request.query_params.get(self.search_param, '')
+        if not tokenize(query):
+            return queryset
+        queryset = get_search_backend().search(queryset, query)
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            queryset = queryset.order_by('-search_rank', '-published_at')
+        return queryset
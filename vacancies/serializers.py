@@ -4,14 +4,20 @@ from typing import Any
 
 from rest_framework import serializers
 
-from .models import Student, Company, Vacancy, Resume, Application
+from .matching import MATCH_LIMIT, MAX_MATCH_LIMIT
+from .models import Student, Company, Vacancy, Resume, Application, Review
+from .permissions import get_request_student
+
+# максимум заявок в одном запросе массовой смены статуса
+BULK_STATUS_LIMIT = 1000
 
 
 class VacancySerializers(serializers.ModelSerializer):
     """Сериализатор вакансии с аннотациями и флагом shortlist."""
 
     company = serializers.PrimaryKeyRelatedField(queryset=Company.objects.all())
-    is_favorite = serializers.SerializerMethodField()
+    # аннотация Exists() из annotate_vacancies; без аннотации — False
+    is_favorite = serializers.BooleanField(read_only=True, default=False)
     applications_count = serializers.IntegerField(read_only=True)
     shortlist_count = serializers.IntegerField(read_only=True)
     company_avg_rating = serializers.FloatField(read_only=True)
@@ -28,16 +34,6 @@ class VacancySerializers(serializers.ModelSerializer):
 
         read_only_fields = ['created_at', 'updated_at']
 
-    def get_is_favorite(self, obj: Vacancy) -> bool:
-        """
-        Вакансия в shortlist текущего студента (из context).
-
-        Args:
-            obj: Объект вакансии.
-        """
-        favorite_vacancies = self.context.get('favorite_vacancies', [])
-        return obj.id in favorite_vacancies
-
     def validate_salary(self, value: int | None) -> int:
         """Зарплата должна быть положительной."""
         if value is None or value <= 0:
@@ -61,6 +57,35 @@ class VacancySerializers(serializers.ModelSerializer):
         return data
 
 
+class PrefetchedCompanyField(serializers.PrimaryKeyRelatedField):
+    """Компания по id из context['companies'] вместо запроса к БД на каждую строку."""
+
+    def to_internal_value(self, data: Any) -> Company:
+        companies = self.context.get('companies')
+        if companies is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            company = companies.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if company is None:
+            self.fail('does_not_exist', pk_value=data)
+        return company
+
+
+class VacancyImportSerializer(VacancySerializers):
+    """
+    Правила VacancySerializers для массового импорта.
+
+    Компании порции строк загружаются заранее одним запросом и передаются
+    в context['companies'] ({id: Company}).
+    """
+
+    company = PrefetchedCompanyField(queryset=Company.objects.all())
+
+
 class StudentSerializers(serializers.ModelSerializer):
     """Сериализатор профиля студента."""
 
@@ -105,6 +130,12 @@ class ResumeSerializers(serializers.ModelSerializer):
         ]
 
 
+class ResumeMatchQuerySerializer(serializers.Serializer):
+    """Параметры подбора вакансий под резюме: limit — размер топа."""
+
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_MATCH_LIMIT, default=MATCH_LIMIT)
+
+
 class ApplicationSerializers(serializers.ModelSerializer):
     """Сериализатор заявки на вакансию с бизнес-валидацией."""
 
@@ -157,31 +188,48 @@ class ApplicationSerializers(serializers.ModelSerializer):
 
         request = self.context.get('request')
         if request and request.user.is_authenticated and not request.user.is_staff:
-            from .permissions import get_user_student
-            user_student = get_user_student(request.user)
+            user_student = get_request_student(request)
             if user_student and student.id != user_student.id:
                 raise serializers.ValidationError({'student': 'Нельзя подать заявку за другого студента'})
 
         return data
 
 
-class ReviewSerializers(serializers.Serializer):
-    """Создание отзыва о компании (хранится в JSON)."""
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """Массовая смена статуса: id заявок и новый статус."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_STATUS_LIMIT,
+    )
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+
+class ReviewSerializers(serializers.ModelSerializer):
+    """Отзыв студента о компании: создание студентом и модерация администратором."""
 
     company_id = serializers.IntegerField()
+    student_id = serializers.IntegerField(read_only=True)
     rating = serializers.IntegerField(min_value=1, max_value=5)
-    text = serializers.CharField()
+
+    class Meta:
+        model = Review
+        fields = ['id', 'student_id', 'company_id', 'rating', 'text', 'is_approved', 'created_at']
+        read_only_fields = ['created_at']
 
     def validate(self, data: dict[str, Any]) -> dict[str, Any]:
         """
         Отзыв только если студент подавал заявку в эту компанию.
 
+        Новый отзыв всегда попадает на модерацию (is_approved=False).
+        При правке существующего отзыва администратором проверки не нужны.
+
         Args:
             data: company_id, rating, text.
         """
+        if self.instance is not None:
+            return data
         request = self.context.get('request')
-        from .permissions import get_user_student
-        student = get_user_student(request.user) if request else None
+        student = get_request_student(request) if request else None
         if not student:
             raise serializers.ValidationError('Отзыв могут оставлять только студенты')
 
@@ -194,4 +242,5 @@ class ReviewSerializers(serializers.Serializer):
                 'Отзыв можно оставить только о компании, на вакансию которой вы подавали заявку.'
             )
         data['student_id'] = student.id
+        data['is_approved'] = False
         return data
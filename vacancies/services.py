@@ -0,0 +1,425 @@
+"""
+Агрегаты по статусам заявок и вакансий, снимок аналитики и рейтинги компаний.
+
+Разбивка считается одним запросом: Count с filter=Q(status=...) на каждый
+статус из STATUS_CHOICES плюс общий Count, вместо отдельного COUNT(*) на
+каждое число.
+
+Дашборды читают готовый AnalyticsSnapshot (одна строка, pk=1). Сигналы
+моделей (signals.py) применяют к нему изменения инкрементально. Счётчики
+и разбивка по статусам меняются одним UPDATE ... WHERE pk=1 выражениями
+F() и JSONIncrement без блокировки строки, поэтому параллельные записи не
+теряют изменений.
+
+Топ популярных вакансий сигналы не меняют: они запоминают затронутые
+вакансии, а после коммита транзакции refresh_popular_vacancies() один раз
+обновляет топ под блокировкой строки снимка. Число заявок кандидатов
+(текущий топ и затронутые вакансии) берётся из БД, а если вакансия из
+топа потеряла заявки или удалена, топ считается заново целиком. Каскадное
+удаление вакансии с заявками обновляет топ один раз. Команда
+refresh_analytics периодически пересчитывает снимок целиком.
+
+set_application_status() меняет статус многих заявок одним UPDATE и сама
+учитывает изменение в снимке, истории и кэше: update() не вызывает
+сигналы моделей.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import transaction
+from django.db.models import (
+    Case, Count, Expression, F, FloatField, Func, JSONField, Model, Q, QuerySet, Value, When,
+)
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+
+from .cache import invalidate_vacancy_cache, on_commit_once
+from .models import AnalyticsSnapshot, Application, CompanyRating, Student, Vacancy
+
+SNAPSHOT_PK = 1
+POPULAR_LIMIT = 5
+
+
+def status_counts(queryset: QuerySet[Model], choices: list[tuple[str, str]]) -> dict[str, int]:
+    """
+    Число записей всего и по каждому статусу одним агрегирующим запросом.
+
+    Args:
+        queryset: QuerySet модели с полем status.
+        choices: STATUS_CHOICES модели.
+
+    Returns:
+        Словарь {'total': n, '<status>': n, ...}; статусы без записей — 0.
+    """
+    aggregates = {'total': Count('pk')}
+    for code, _ in choices:
+        aggregates[code] = Count('pk', filter=Q(status=code))
+    return queryset.order_by().aggregate(**aggregates)
+
+
+def application_status_counts(queryset: QuerySet[Application] | None = None) -> dict[str, int]:
+    """
+    Разбивка заявок по статусам.
+
+    Args:
+        queryset: Заявки для подсчёта (по умолчанию все).
+
+    Returns:
+        Словарь {'total': n, 'sent': n, 'viewed': n, ...}.
+    """
+    if queryset is None:
+        queryset = Application.objects.all()
+    return status_counts(queryset, Application.STATUS_CHOICES)
+
+
+def vacancy_status_counts(queryset: QuerySet[Vacancy] | None = None) -> dict[str, int]:
+    """
+    Разбивка вакансий по статусам.
+
+    Args:
+        queryset: Вакансии для подсчёта (по умолчанию все).
+
+    Returns:
+        Словарь {'total': n, 'draft': n, 'active': n, ...}.
+    """
+    if queryset is None:
+        queryset = Vacancy.objects.all()
+    return status_counts(queryset, Vacancy.STATUS_CHOICES)
+
+
+def popular_vacancies(limit: int = POPULAR_LIMIT) -> list[dict]:
+    """
+    Вакансии с наибольшим числом заявок.
+
+    Args:
+        limit: Размер топа.
+
+    Returns:
+        Список словарей {'id', 'title', 'app_count'} по убыванию app_count.
+    """
+    rows = (
+        Vacancy.objects.annotate(app_count=Count('applications'))
+        .filter(app_count__gt=0)
+        .order_by('-app_count', 'id')
+        .values('id', 'title', 'app_count')[:limit]
+    )
+    return list(rows)
+
+
+def refresh_analytics_snapshot() -> AnalyticsSnapshot:
+    """
+    Полностью пересчитать снимок аналитики.
+
+    Returns:
+        Обновлённый AnalyticsSnapshot.
+    """
+    vacancies = vacancy_status_counts()
+    applications = application_status_counts()
+    snapshot, _ = AnalyticsSnapshot.objects.update_or_create(
+        pk=SNAPSHOT_PK,
+        defaults={
+            'vacancies_total': vacancies['total'],
+            'vacancies_active': vacancies['active'],
+            'applications_total': applications.pop('total'),
+            'applications_by_status': applications,
+            'students_total': Student.objects.count(),
+            'popular_vacancies': popular_vacancies(),
+        },
+    )
+    return snapshot
+
+
+def get_analytics_snapshot() -> AnalyticsSnapshot:
+    """
+    Снимок аналитики для дашбордов (выборка по первичному ключу).
+
+    Returns:
+        AnalyticsSnapshot; при первом обращении он пересчитывается.
+    """
+    snapshot = AnalyticsSnapshot.objects.filter(pk=SNAPSHOT_PK).first()
+    return snapshot or refresh_analytics_snapshot()
+
+
+class JSONIncrement(Func):
+    """
+    Прибавить delta к числу под ключом JSON-объекта прямо в UPDATE.
+
+    Отсутствующий ключ считается нулём. Выражения можно вкладывать друг в
+    друга, чтобы изменить несколько ключей одним запросом.
+    """
+
+    output_field = JSONField()
+
+    def __init__(self, expression: Expression, key: str, delta: int) -> None:
+        super().__init__(expression)
+        self.key = key
+        self.delta = delta
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # SQLite и MySQL
+        sql, params = compiler.compile(self.source_expressions[0])
+        path = f'$."{self.key}"'
+        return (
+            f'JSON_SET({sql}, %s, COALESCE(JSON_EXTRACT({sql}, %s), 0) + %s)',
+            (*params, path, *params, path, self.delta),
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        return (
+            f'JSONB_SET({sql}, ARRAY[%s], TO_JSONB(COALESCE(({sql} ->> %s)::integer, 0) + %s))',
+            (*params, self.key, *params, self.key, self.delta),
+        )
+
+
+def counter_changes(**deltas: int) -> dict[str, Any]:
+    """Выражения F(field) + delta для ненулевых изменений счётчиков снимка."""
+    return {field: F(field) + delta for field, delta in deltas.items() if delta}
+
+
+def status_changes(deltas: Counter) -> dict[str, Any]:
+    """Изменение applications_by_status на deltas ({статус: delta}) одним выражением."""
+    expression = F('applications_by_status')
+    for status, delta in sorted(deltas.items()):
+        if delta:
+            expression = JSONIncrement(expression, status, delta)
+    if isinstance(expression, F):
+        return {}
+    return {'applications_by_status': expression}
+
+
+def update_analytics_snapshot(**changes: Any) -> None:
+    """
+    Применить изменения к снимку одним UPDATE ... WHERE pk=1 без блокировки строки.
+
+    Если снимка ещё нет, он считается целиком (изменение уже в БД).
+
+    Args:
+        changes: Значения или выражения полей снимка.
+    """
+    if not changes:
+        return
+    updated = AnalyticsSnapshot.objects.filter(pk=SNAPSHOT_PK).update(updated_at=timezone.now(), **changes)
+    if not updated:
+        refresh_analytics_snapshot()
+
+
+_popular = threading.local()
+
+
+def popular_counts(vacancy_ids: Iterable[int]) -> dict[int, dict]:
+    """Записи топа {'id', 'title', 'app_count'} для указанных вакансий, у которых есть заявки."""
+    rows = (
+        Vacancy.objects.filter(pk__in=vacancy_ids)
+        .annotate(app_count=Count('applications'))
+        .filter(app_count__gt=0)
+        .values('id', 'title', 'app_count')
+    )
+    return {row['id']: row for row in rows}
+
+
+def refresh_popular_vacancies() -> None:
+    # вызывается после коммита через on_commit_once(): один раз на транзакцию
+    touched = getattr(_popular, 'touched', None)
+    if not touched:
+        return
+    _popular.touched = set()
+    with transaction.atomic():
+        snapshot = AnalyticsSnapshot.objects.select_for_update().filter(pk=SNAPSHOT_PK).first()
+        if snapshot is None:
+            return
+        current = {entry['id']: entry['app_count'] for entry in snapshot.popular_vacancies}
+        candidates = popular_counts(current.keys() | touched)
+        if any(vacancy_id not in candidates or candidates[vacancy_id]['app_count'] < count
+               for vacancy_id, count in current.items()):
+            # вакансия из топа потеряла заявки: её место может занять любая другая
+            popular = popular_vacancies()
+        else:
+            popular = sort_popular(list(candidates.values()))
+        AnalyticsSnapshot.objects.filter(pk=SNAPSHOT_PK).update(
+            popular_vacancies=popular, updated_at=timezone.now(),
+        )
+
+
+def touch_popular(*vacancy_ids: int | None) -> None:
+    """Обновить топ популярных вакансий с учётом указанных вакансий после коммита транзакции."""
+    touched = getattr(_popular, 'touched', None)
+    if touched is None:
+        touched = _popular.touched = set()
+    touched.update(vacancy_id for vacancy_id in vacancy_ids if vacancy_id is not None)
+    on_commit_once(refresh_popular_vacancies)
+
+
+def sort_popular(entries: list[dict]) -> list[dict]:
+    return sorted(entries, key=lambda entry: (-entry['app_count'], entry['id']))[:POPULAR_LIMIT]
+
+
+def record_vacancy_change(vacancy_id: int, old: dict | None, new: dict | None) -> None:
+    """
+    Учесть создание, изменение или удаление вакансии в снимке.
+
+    Args:
+        vacancy_id: Id вакансии.
+        old: {'status', 'title'} до изменения или None для новой вакансии.
+        new: {'status', 'title'} после изменения или None для удалённой.
+    """
+    if old == new:
+        return
+    changes = counter_changes(
+        vacancies_total=(old is None) - (new is None),
+        vacancies_active=(
+            (new is not None and new['status'] == 'active') - (old is not None and old['status'] == 'active')
+        ),
+    )
+    if old is not None and (new is None or new['title'] != old['title']):
+        touch_popular(vacancy_id)
+    update_analytics_snapshot(**changes)
+
+
+def record_vacancies_created(vacancies: Iterable[Vacancy]) -> None:
+    """
+    Учесть в снимке вакансии, созданные bulk_create (без сигналов post_save).
+
+    У новых вакансий нет заявок, поэтому топ популярных не меняется.
+
+    Args:
+        vacancies: Созданные вакансии.
+    """
+    statuses = [vacancy.status for vacancy in vacancies]
+    update_analytics_snapshot(**counter_changes(
+        vacancies_total=len(statuses), vacancies_active=statuses.count('active'),
+    ))
+
+
+def record_application_change(old: dict | None, new: dict | None) -> None:
+    """
+    Учесть создание, изменение или удаление заявки в снимке.
+
+    Args:
+        old: {'status', 'vacancy_id'} до изменения или None для новой заявки.
+        new: {'status', 'vacancy_id'} после изменения или None для удалённой.
+    """
+    if old == new:
+        return
+    old_vacancy = old['vacancy_id'] if old else None
+    new_vacancy = new['vacancy_id'] if new else None
+    moved = Counter()
+    if old is not None:
+        moved[old['status']] -= 1
+    if new is not None:
+        moved[new['status']] += 1
+    changes = {
+        **counter_changes(applications_total=(old is None) - (new is None)),
+        **status_changes(moved),
+    }
+    if old_vacancy != new_vacancy:
+        touch_popular(old_vacancy, new_vacancy)
+    update_analytics_snapshot(**changes)
+
+
+def record_student_change(delta: int) -> None:
+    """
+    Учесть создание (+1) или удаление (-1) студента в снимке.
+
+    Args:
+        delta: Изменение числа студентов.
+    """
+    update_analytics_snapshot(**counter_changes(students_total=delta))
+
+
+def update_company_rating(company_id: int, rating_delta: int, count_delta: int) -> None:
+    """
+    Инкрементально изменить агрегат рейтинга компании.
+
+    Сумма, число оценок и среднее пересчитываются одним UPDATE через F(),
+    без чтения всех отзывов компании. Строка агрегата создаётся только при
+    добавлении оценки: при каскадном удалении компании её не нужно создавать.
+
+    Args:
+        company_id: Id компании.
+        rating_delta: Изменение суммы оценок.
+        count_delta: Изменение числа оценок.
+    """
+    new_sum = F('rating_sum') + rating_delta
+    new_count = F('rating_count') + count_delta
+    ratings = CompanyRating.objects.filter(company_id=company_id)
+    values = {
+        'rating_sum': new_sum,
+        'rating_count': new_count,
+        'rating_avg': Case(
+            When(rating_count__gt=-count_delta, then=Round(Cast(new_sum, FloatField()) / new_count, 1)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    }
+    if not ratings.update(**values) and count_delta > 0:
+        CompanyRating.objects.get_or_create(company_id=company_id)
+        ratings.update(**values)
+    invalidate_vacancy_cache()
+
+
+def record_review_change(old: dict | None, new: dict | None) -> None:
+    """
+    Учесть создание, изменение или удаление отзыва в рейтинге компании.
+
+    В рейтинг входят только одобренные отзывы.
+
+    Args:
+        old: {'is_approved', 'rating', 'company_id'} до изменения или None для нового отзыва.
+        new: {'is_approved', 'rating', 'company_id'} после изменения или None для удалённого.
+    """
+    if old == new:
+        return
+    for values, sign in ((old, -1), (new, 1)):
+        if values is not None and values['is_approved']:
+            update_company_rating(values['company_id'], sign * values['rating'], sign)
+
+
+def set_application_status(
+    ids: Iterable[int], status: str, user: AbstractBaseUser | None = None,
+) -> int:
+    """
+    Сменить статус заявок одним UPDATE ... WHERE id IN (...) с response_date.
+
+    Заявки, уже имеющие этот статус, не трогаются. Строки блокируются
+    select_for_update, исторические записи пишутся bulk_history_create,
+    снимок аналитики получает разницу по статусам одним UPDATE.
+
+    Args:
+        ids: Id заявок.
+        status: Новый статус из Application.STATUS_CHOICES.
+        user: Пользователь для истории изменений.
+
+    Returns:
+        Число изменённых заявок.
+    """
+    if status not in dict(Application.STATUS_CHOICES):
+        raise ValueError(f'Неверный статус: {status}')
+    now = timezone.now()
+    with transaction.atomic():
+        previous = dict(
+            Application.objects.select_for_update()
+            .filter(pk__in=list(ids)).exclude(status=status)
+            .values_list('pk', 'status')
+        )
+        if not previous:
+            return 0
+        updated = Application.objects.filter(pk__in=previous).update(status=status, response_date=now)
+        Application.history.bulk_history_create(
+            list(Application.objects.filter(pk__in=previous)),
+            default_user=user,
+            default_change_reason='Массовая смена статуса',
+            default_date=now,
+            update=True,
+        )
+        moved = Counter({old_status: -count for old_status, count in Counter(previous.values()).items()})
+        moved[status] += updated
+        update_analytics_snapshot(**status_changes(moved))
+    invalidate_vacancy_cache()
+    return updated
@@ -0,0 +1,124 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_vacancy_cache
+from .matching import invalidate_matching_index
+from .models import Application, Company, Review, Skill, Student, Vacancy
+from .search import get_search_backend
+from .services import (
+    record_application_change, record_review_change, record_student_change, record_vacancy_change,
+)
+
+
+@receiver(post_save, sender=Vacancy)
+def index_vacancy(sender, instance, **kwargs):
+    get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Vacancy)
+def unindex_vacancy(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+# --- снимок аналитики: значения до сохранения берутся из БД в pre_save ---
+VACANCY_TRACKED = ('status', 'title')
+APPLICATION_TRACKED = ('status', 'vacancy_id')
+
+
+def tracked_values(instance, fields):
+    return {field: getattr(instance, field) for field in fields}
+
+
+def previous_values(sender, instance, fields, update_fields=None):
+    if instance._state.adding:
+        return None
+    names = set(fields) | {field.removesuffix('_id') for field in fields}
+    if update_fields is not None and not names & set(update_fields):
+        # save(update_fields=...) не трогает отслеживаемые поля — запрос не нужен
+        return tracked_values(instance, fields)
+    return sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Vacancy)
+def remember_vacancy(sender, instance, update_fields=None, **kwargs):
+    instance._analytics_previous = previous_values(sender, instance, VACANCY_TRACKED, update_fields)
+
+
+@receiver(post_save, sender=Vacancy)
+def count_vacancy(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_analytics_previous', None)
+    record_vacancy_change(instance.pk, previous, tracked_values(instance, VACANCY_TRACKED))
+
+
+@receiver(post_delete, sender=Vacancy)
+def uncount_vacancy(sender, instance, **kwargs):
+    record_vacancy_change(instance.pk, tracked_values(instance, VACANCY_TRACKED), None)
+
+
+@receiver(pre_save, sender=Application)
+def remember_application(sender, instance, update_fields=None, **kwargs):
+    instance._analytics_previous = previous_values(sender, instance, APPLICATION_TRACKED, update_fields)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_analytics_previous', None)
+    record_application_change(previous, tracked_values(instance, APPLICATION_TRACKED))
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    record_application_change(tracked_values(instance, APPLICATION_TRACKED), None)
+
+
+@receiver(post_save, sender=Student)
+def count_student(sender, instance, created, **kwargs):
+    if created:
+        record_student_change(1)
+
+
+@receiver(post_delete, sender=Student)
+def uncount_student(sender, instance, **kwargs):
+    record_student_change(-1)
+
+
+# --- рейтинг компании: одобренные отзывы, в том числе удаляемые каскадом ---
+REVIEW_TRACKED = ('is_approved', 'rating', 'company_id')
+
+
+@receiver(pre_save, sender=Review)
+def remember_review(sender, instance, update_fields=None, **kwargs):
+    instance._rating_previous = previous_values(sender, instance, REVIEW_TRACKED, update_fields)
+
+
+@receiver(post_save, sender=Review)
+def rate_review(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_rating_previous', None)
+    record_review_change(previous, tracked_values(instance, REVIEW_TRACKED))
+
+
+@receiver(post_delete, sender=Review)
+def unrate_review(sender, instance, **kwargs):
+    record_review_change(tracked_values(instance, REVIEW_TRACKED), None)
+
+
+# --- кэш списков вакансий ---
+@receiver(post_save, sender=Vacancy)
+@receiver(post_delete, sender=Vacancy)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_vacancy_lists(sender, **kwargs):
+    invalidate_vacancy_cache()
+
+
+# --- индекс подбора вакансий по навыкам ---
+@receiver(post_save, sender=Vacancy)
+@receiver(post_delete, sender=Vacancy)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_index(sender, **kwargs):
+    invalidate_matching_index()
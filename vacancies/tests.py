@@ -1,16 +1,47 @@
 from __future__ import annotations
 
-from datetime import date
+import io
+import json
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import Any
+from unittest import mock
 
 from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
 from django.core.exceptions import ValidationError
-from django.test import TestCase
-from rest_framework import status
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework import serializers, status
 from rest_framework.response import Response
 from rest_framework.test import APITestCase, APIRequestFactory
 
-from .models import Student, Company, Vacancy, Resume, Application
-from .serializers import VacancySerializers, ReviewSerializers
+from .admin import VacancyResource
+from .backends import StudentModelBackend
+from .benchmarks import compare_results
+from .cache import get_generation, get_vacancy_cache
+from .fastread import serialize_rows
+from .history import history_buffer
+from .matching import SkillExtractor, get_index_version, get_skill_index, invalidate_matching_index, resume_skill_ids
+from .models import (
+    AnalyticsSnapshot, Student, Company, Vacancy, Resume, Application, VacancyShortlistStat, CompanyRating, Review,
+    ShortlistEntry, Skill,
+)
+from .permissions import get_request_student, get_user_student
+from .serializers import ApplicationSerializers, ResumeSerializers, VacancySerializers, ReviewSerializers
+from .services import application_status_counts, get_analytics_snapshot
+from .views import add_shortlist_stat, remove_shortlist_stat, annotate_vacancies
+
+
+def db_queries(context: CaptureQueriesContext) -> list[dict]:
+    """Запросы из CaptureQueriesContext без EXPLAIN, которые добавляет профилировщик silk."""
+    return [query for query in context.captured_queries if not query['sql'].startswith('EXPLAIN')]
 
 
 class VacancyModelTest(TestCase):
@@ -46,7 +77,7 @@ class ReviewSerializerTest(TestCase):
             username='student', password='pass', email='st@test.ru'
         )
         self.student = Student.objects.create(
-            first_name='Ann', last_name='Lee', email='st@test.ru',
+            user=self.user, first_name='Ann', last_name='Lee', email='st@test.ru',
             birth_date=date(2004, 5, 5), specialty='IT',
         )
         self.company = Company.objects.create(
@@ -76,6 +107,7 @@ class VacancyAPITest(APITestCase):
 
     def setUp(self) -> None:
         """Создать две вакансии у разных компаний для списка и фильтра."""
+        get_vacancy_cache().clear()
         self.it_company = Company.objects.create(
             name='IT Co', email='it@co.ru', industry='IT'
         )
@@ -120,7 +152,7 @@ class VacancyAPITest(APITestCase):
 
 
 class ShortlistAPITest(APITestCase):
-    """Тесты shortlist студента (сессия + action add_to_shortlist)."""
+    """Тесты shortlist студента (таблица ShortlistEntry + actions add/remove_from_shortlist)."""
 
     def setUp(self) -> None:
         """Создать студента, пользователя и активную вакансию."""
@@ -128,7 +160,7 @@ class ShortlistAPITest(APITestCase):
             username='student', password='pass', email='st@test.ru'
         )
         self.student = Student.objects.create(
-            first_name='Ann', last_name='Ann', email='st@test.ru',
+            user=self.user, first_name='Ann', last_name='Ann', email='st@test.ru',
             birth_date=date(2004, 5, 5), specialty='IT',
         )
         company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
@@ -139,18 +171,47 @@ class ShortlistAPITest(APITestCase):
 
     def test_add_vacancy_to_shortlist(self) -> None:
         """
-        POST add_to_shortlist добавляет id вакансии в shortlist сессии студента.
+        POST add_to_shortlist добавляет строку ShortlistEntry студента.
 
         """
         self.client.force_authenticate(user=self.user)
-        session = self.client.session
-        session[f'shortlist_{self.student.id}'] = []
-        session.save()
 
         url = f'/api/vacancies/{self.vacancy.id}/add_to_shortlist/'
         response: Response = self.client.post(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn(self.vacancy.id, response.data['shortlist'])
+        self.assertTrue(ShortlistEntry.objects.filter(student=self.student, vacancy=self.vacancy).exists())
+
+    def test_repeat_add_and_remove(self) -> None:
+        """
+        Повторное добавление не дублирует строку и счётчик; удаление убирает строку и уменьшает счётчик.
+        """
+        self.client.force_authenticate(user=self.user)
+        url = f'/api/vacancies/{self.vacancy.id}/add_to_shortlist/'
+        self.client.post(url)
+        self.client.post(url)
+        self.assertEqual(ShortlistEntry.objects.filter(student=self.student).count(), 1)
+        self.assertEqual(VacancyShortlistStat.objects.get(vacancy=self.vacancy).count, 1)
+
+        response = self.client.get(f'/api/vacancies/{self.vacancy.id}/')
+        self.assertTrue(response.data['is_favorite'])
+        response = self.client.get('/api/vacancies/my_shortlist/')
+        self.assertEqual([item['id'] for item in response.data], [self.vacancy.id])
+
+        response = self.client.post(f'/api/vacancies/{self.vacancy.id}/remove_from_shortlist/')
+        self.assertEqual(response.data['shortlist'], [])
+        self.assertEqual(VacancyShortlistStat.objects.get(vacancy=self.vacancy).count, 0)
+        response = self.client.get(f'/api/vacancies/{self.vacancy.id}/')
+        self.assertFalse(response.data['is_favorite'])
+
+    def test_complex_vacancy_marks_favorites(self) -> None:
+        """
+        complex_vacancy отмечает is_favorite для вакансий из shortlist текущего студента.
+        """
+        ShortlistEntry.objects.create(student=self.student, vacancy=self.vacancy)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/vacancies/complex_vacancy/')
+        self.assertEqual([(item['id'], item['is_favorite']) for item in response.data], [(self.vacancy.id, True)])
 
 
 class ApplicationAPITest(APITestCase):
@@ -162,7 +223,7 @@ class ApplicationAPITest(APITestCase):
             username='student', password='pass', email='st@test.ru'
         )
         self.student = Student.objects.create(
-            first_name='Ann', last_name='Lee', email='st@test.ru',
+            user=self.user, first_name='Ann', last_name='Lee', email='st@test.ru',
             birth_date=date(2004, 5, 5), specialty='IT',
         )
         company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
@@ -223,7 +284,7 @@ class ApplicationAPITest(APITestCase):
             username='other', password='pass', email='other@test.ru'
         )
         Student.objects.create(
-            first_name='Other', last_name='User', email='other@test.ru',
+            user=other_user, first_name='Other', last_name='User', email='other@test.ru',
             birth_date=date(2004, 1, 1), specialty='IT',
         )
         self.client.force_authenticate(user=other_user)
@@ -246,7 +307,7 @@ class ApplicationAPITest(APITestCase):
 
 
 class SerializerTest(TestCase):
-    """Тесты сериализаторов VacancySerializers (валидация и context)."""
+    """Тесты сериализаторов VacancySerializers (валидация и аннотация is_favorite)."""
 
     def setUp(self) -> None:
         """Создать компанию для данных сериализатора вакансии."""
@@ -267,18 +328,1368 @@ class SerializerTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn('salary', serializer.errors)
 
-    def test_is_favorite_from_context(self) -> None:
+    def test_is_favorite_from_annotation(self) -> None:
         """
-        is_favorite=True, если id вакансии передан в context favorite_vacancies.
+        is_favorite читается из аннотации annotate_vacancies; без аннотации — False.
 
-        Проверяет SerializerMethodField get_is_favorite и передачу через context.
+        Проверяет, что поле обычное read-only, а не SerializerMethodField с поиском в списке.
         """
         vacancy = Vacancy.objects.create(
             company=self.company, title='Dev', description='d',
             salary=50000, status='active',
         )
-        serializer = VacancySerializers(
-            vacancy,
-            context={'favorite_vacancies': [vacancy.id]},
+        other = Vacancy.objects.create(
+            company=self.company, title='QA', description='d',
+            salary=50000, status='active',
+        )
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        ShortlistEntry.objects.create(student=student, vacancy=vacancy)
+        self.assertNotIsInstance(VacancySerializers().fields['is_favorite'], serializers.SerializerMethodField)
+
+        annotated = annotate_vacancies(Vacancy.objects.order_by('id'), student)
+        data = VacancySerializers(annotated, many=True).data
+        self.assertEqual([item['is_favorite'] for item in data], [True, False])
+        self.assertFalse(VacancySerializers(other).data['is_favorite'])
+
+
+class ShortlistStatTest(TestCase):
+    """Тесты счётчиков shortlist в таблице VacancyShortlistStat."""
+
+    def setUp(self) -> None:
+        """Создать вакансию для счётчика."""
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(
+            company=company, title='Dev', description='d',
+            salary=50000, status='active',
+        )
+
+    def test_counter_increments_and_never_goes_negative(self) -> None:
+        """
+        add/remove_shortlist_stat меняют счётчик через F(), не опуская его ниже нуля.
+        """
+        add_shortlist_stat(self.vacancy.id)
+        add_shortlist_stat(self.vacancy.id)
+        remove_shortlist_stat(self.vacancy.id)
+        remove_shortlist_stat(self.vacancy.id)
+        remove_shortlist_stat(self.vacancy.id)
+        add_shortlist_stat(self.vacancy.id)
+        self.assertEqual(VacancyShortlistStat.objects.get(vacancy=self.vacancy).count, 1)
+
+    def test_import_shortlist_stats_command(self) -> None:
+        """
+        import_shortlist_stats переносит JSON в таблицу и пропускает несуществующие вакансии.
+        """
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump({str(self.vacancy.id): 7, '999999': 3}, f)
+        self.addCleanup(os.remove, f.name)
+
+        call_command('import_shortlist_stats', path=f.name, stdout=io.StringIO())
+        self.assertEqual(VacancyShortlistStat.objects.get(vacancy=self.vacancy).count, 7)
+        self.assertEqual(VacancyShortlistStat.objects.count(), 1)
+
+    def test_shortlist_annotation_query_does_not_grow(self) -> None:
+        """
+        shortlist_count берётся через JOIN: текст SQL не зависит от числа счётчиков.
+        """
+        add_shortlist_stat(self.vacancy.id)
+        sql_before = str(annotate_vacancies(Vacancy.objects.all()).query)
+        for i in range(5):
+            vacancy = Vacancy.objects.create(
+                company=self.vacancy.company, title=f'Dev {i}', description='d',
+                salary=50000, status='active',
+            )
+            add_shortlist_stat(vacancy.id)
+        self.assertEqual(sql_before, str(annotate_vacancies(Vacancy.objects.all()).query))
+        self.assertEqual(annotate_vacancies(Vacancy.objects.filter(pk=self.vacancy.pk)).get().shortlist_count, 1)
+
+
+class CompanyRatingTest(TestCase):
+    """Тесты инкрементального агрегата CompanyRating."""
+
+    def setUp(self) -> None:
+        """Создать компанию с вакансией и студента."""
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(
+            company=self.company, title='Dev', description='d',
+            salary=50000, status='active',
+        )
+        self.student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+
+    def review(self, rating: int, is_approved: bool = True) -> Review:
+        return Review.objects.create(
+            student=self.student, company=self.company, rating=rating, text='t', is_approved=is_approved,
+        )
+
+    def rating(self) -> tuple[int, int, float]:
+        rating = CompanyRating.objects.get(company=self.company)
+        return rating.rating_sum, rating.rating_count, rating.rating_avg
+
+    def test_rating_follows_approve_and_delete(self) -> None:
+        """
+        Одобренные отзывы меняют сумму, число и среднее; неодобренные игнорируются.
+        """
+        first, second, pending = self.review(5), self.review(4), self.review(1, is_approved=False)
+        self.assertEqual(self.rating(), (9, 2, 4.5))
+        self.assertEqual(annotate_vacancies(Vacancy.objects.filter(pk=self.vacancy.pk)).get().company_avg_rating, 4.5)
+
+        second.rating = 2
+        second.save()
+        pending.is_approved = True
+        pending.save(update_fields=['is_approved'])
+        self.assertEqual(self.rating(), (8, 3, 2.7))
+
+        first.delete()
+        Review.objects.filter(pk=second.pk).delete()
+        pending.delete()
+        self.assertEqual(self.rating(), (0, 0, 0.0))
+
+    def test_student_delete_removes_review_rating(self) -> None:
+        """
+        Удаление студента каскадом удаляет его одобренные отзывы и их оценки из рейтинга компании.
+        """
+        self.review(5)
+        other = Student.objects.create(
+            first_name='Bob', last_name='Ray', email='b@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        Review.objects.create(student=other, company=self.company, rating=3, text='t', is_approved=True)
+        self.student.delete()
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertEqual(self.rating(), (3, 1, 3.0))
+
+        self.company.delete()
+        self.assertFalse(CompanyRating.objects.exists())
+
+    def test_import_reviews_validates_rows(self) -> None:
+        """
+        import_reviews пропускает неполные записи и оценки вне 1..5 с номером записи и считает вставленные.
+        """
+        student = self.student
+        Review.objects.create(id=50, student=student, company=self.company, rating=3, text='old')
+        rows = [
+            {'id': 100, 'student_id': student.pk, 'company_id': self.company.pk, 'rating': 5, 'is_approved': True},
+            {'id': 101, 'student_id': student.pk, 'company_id': self.company.pk},
+            {'id': 102, 'student_id': student.pk, 'company_id': self.company.pk, 'rating': 9},
+            {'id': 50, 'student_id': student.pk, 'company_id': self.company.pk, 'rating': 4},
+        ]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump(rows, f)
+        self.addCleanup(os.unlink, f.name)
+        out = io.StringIO()
+        call_command('import_reviews', path=f.name, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Импортировано отзывов: 1', output)
+        self.assertIn('id уже занят): 1', output)
+        self.assertIn('Запись 2 пропущена: нет полей rating', output)
+        self.assertIn('Запись 3 пропущена: rating', output)
+        self.assertEqual(sorted(Review.objects.values_list('id', flat=True)), [50, 100])
+        self.assertEqual(CompanyRating.objects.get(company=self.company).rating_avg, 5.0)
+
+
+class ReviewAPITest(APITestCase):
+    """Тесты отзывов в таблице Review: создание, модерация, пагинация."""
+
+    def setUp(self) -> None:
+        """Студент с заявкой в компанию и администратор."""
+        self.user = User.objects.create_user(
+            username='student', password='pass', email='st@test.ru'
+        )
+        self.student = Student.objects.create(
+            user=self.user, first_name='Ann', last_name='Lee', email='st@test.ru',
+            birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        vacancy = Vacancy.objects.create(
+            company=self.company, title='Dev', description='d',
+            salary=50000, status='active',
+        )
+        resume = Resume.objects.create(
+            student=self.student, experience='exp', contacts='mail', status='active',
+        )
+        Application.objects.create(
+            student=self.student, vacancy=vacancy, resume=resume, employer_comment='-',
+        )
+
+    def test_review_create_approve_and_list(self) -> None:
+        """
+        Новый отзыв скрыт до одобрения; PATCH одобряет его и обновляет рейтинг компании.
+        """
+        self.client.force_authenticate(user=self.user)
+        response: Response = self.client.post(
+            '/api/reviews/create/', {'company_id': self.company.id, 'rating': 4, 'text': 'ok'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response.data['is_approved'])
+        review_id = response.data['id']
+        self.assertEqual(self.client.get('/api/reviews/').data['count'], 0)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.patch(f'/api/reviews/{review_id}/', {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_approved'])
+        self.assertEqual(CompanyRating.objects.get(company=self.company).rating_avg, 4.0)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get('/api/reviews/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['rating'], 4)
+
+        self.client.force_authenticate(user=self.admin)
+        self.client.delete(f'/api/reviews/{review_id}/')
+        self.assertEqual(CompanyRating.objects.get(company=self.company).rating_count, 0)
+
+
+class RequestStudentTest(TestCase):
+    """Тесты мемоизации студента в рамках одного запроса."""
+
+    def test_student_resolved_once_per_request(self) -> None:
+        """
+        Повторные вызовы get_request_student ищут студента в БД только один раз.
+        """
+        user = User.objects.create_user(username='student', password='pass', email='st@test.ru')
+        student = Student.objects.create(
+            user=user, first_name='Ann', last_name='Lee', email='st@test.ru',
+            birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        request = APIRequestFactory().get('/api/vacancies/')
+        request.user = user
+        with mock.patch('vacancies.permissions.get_user_student', wraps=get_user_student) as resolver:
+            self.assertEqual(get_request_student(request), student)
+            self.assertEqual(get_request_student(request), student)
+        resolver.assert_called_once_with(user)
+
+
+class StudentUserLinkTest(TestCase):
+    """Тесты связи Student.user и загрузки профиля вместе с пользователем сессии."""
+
+    def test_session_user_loads_student_without_extra_query(self) -> None:
+        """
+        StudentModelBackend подгружает студента через select_related вместе с пользователем.
+        """
+        user = User.objects.create_user(username='student', password='pass', email='st@test.ru')
+        student = Student.objects.create(
+            user=user, first_name='Ann', last_name='Lee', email='st@test.ru',
+            birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        session_user = StudentModelBackend().get_user(user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_student(session_user), student)
+
+    def test_unlinked_student_is_linked_by_email(self) -> None:
+        """
+        Студент, созданный через API без пользователя, привязывается по email при первом обращении.
+        """
+        admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.client.force_login(admin)
+        response = self.client.post('/api/students/', {
+            'first_name': 'Ann', 'last_name': 'Lee', 'email': 'st@test.ru',
+            'birth_date': '2004-05-05', 'specialty': 'IT', 'course': 2,
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.create_user(username='student', password='pass', email='st@test.ru')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/api/vacancies/my_shortlist/').status_code, status.HTTP_200_OK)
+        self.assertEqual(Student.objects.get(email='st@test.ru').user, user)
+
+        other = User.objects.create_user(username='other', password='pass', email='st@test.ru')
+        self.assertIsNone(get_user_student(StudentModelBackend().get_user(other.id)))
+
+    def test_register_logs_in_with_student_backend(self) -> None:
+        """
+        Регистрация входит через StudentModelBackend при нескольких бэкендах аутентификации.
+        """
+        response = self.client.post('/register/', {
+            'username': 'new', 'password': 'pass', 'email': 'new@test.ru', 'first_name': 'Ann',
+            'last_name': 'Lee', 'birth_date': '2004-05-05', 'course': 2, 'specialty': 'IT',
+        })
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(self.client.session['_auth_user_backend'], 'vacancies.backends.StudentModelBackend')
+
+
+class VacancySearchTest(APITestCase):
+    """Тесты полнотекстового поиска вакансий (FTS5 на SQLite)."""
+
+    def setUp(self) -> None:
+        """Вакансии с разными совпадениями в названии и описании."""
+        get_vacancy_cache().clear()
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.in_title = Vacancy.objects.create(
+            company=company, title='Python разработчик', description='backend',
+            salary=80000, status='active',
+        )
+        self.in_description = Vacancy.objects.create(
+            company=company, title='Аналитик', description='немного python для отчётов',
+            salary=60000, status='active',
+        )
+        Vacancy.objects.create(
+            company=company, title='Бухгалтер', description='1С',
+            salary=50000, status='active',
+        )
+
+    def test_search_uses_prefix_match_and_ranking(self) -> None:
+        """
+        ?search= находит вакансии по префиксу слова, совпадение в названии выше.
+        """
+        response: Response = self.client.get('/api/vacancies/?search=pyth')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [self.in_title.id, self.in_description.id])
+
+    def test_match_runs_once_per_query(self) -> None:
+        """
+        MATCH выполняется один раз на SQL-запрос: таблица FTS сканируется в плане один раз, а не на каждую строку.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/vacancies/?search=python')
+        self.assertEqual(response.data['count'], 2)
+        search_queries = [
+            q['sql'] for q in db_queries(queries) if q['sql'].startswith('SELECT') and 'MATCH' in q['sql']
+        ]
+        self.assertTrue(search_queries)
+        with connection.cursor() as cursor:
+            for sql in search_queries:
+                self.assertEqual(sql.count('MATCH'), 1)
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+                self.assertEqual(plan.count('vacancies_vacancy_fts VIRTUAL TABLE'), 1)
+
+    def test_index_follows_save_and_delete(self) -> None:
+        """
+        Сигналы обновляют индекс при изменении и удалении вакансии.
+        """
+        self.in_title.title = 'Go разработчик'
+        self.in_title.description = 'backend на Go'
+        self.in_title.save()
+        self.in_description.delete()
+        self.assertEqual(self.client.get('/api/vacancies/?search=python').data['count'], 0)
+        self.assertEqual(self.client.get('/api/vacancies/?search=разработ').data['count'], 1)
+
+    def test_rebuild_search_index_command(self) -> None:
+        """
+        rebuild_search_index восстанавливает индекс после массовых изменений в обход сигналов.
+        """
+        Vacancy.objects.filter(pk=self.in_title.pk).update(title='Java разработчик')
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self.client.get('/api/vacancies/?search=java').data['count'], 1)
+
+
+class KeysetPaginationTest(APITestCase):
+    """Тесты keyset-пагинации вакансий по ?cursor=."""
+
+    def setUp(self) -> None:
+        """25 вакансий с тремя одинаковыми датами публикации (проверка связок по id)."""
+        get_vacancy_cache().clear()
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        dates = [timezone.now() - timedelta(days=d) for d in range(3)]
+        for i in range(25):
+            Vacancy.objects.create(
+                company=company, title=f'Dev {i}', description='d',
+                salary=50000, status='active', published_at=dates[i % 3],
+            )
+        self.expected = list(Vacancy.objects.order_by('-published_at', '-id').values_list('id', flat=True))
+
+    def test_cursor_walks_all_pages_without_count(self) -> None:
+        """
+        Проход по next-ссылкам возвращает все вакансии по порядку без COUNT(*), previous ведёт назад.
+        """
+        seen = []
+        url = '/api/vacancies/?cursor='
+        pages = []
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                response: Response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn('count', response.data)
+                pages.append(response.data)
+                seen.extend(item['id'] for item in response.data['results'])
+                url = response.data['next']
+        self.assertEqual(seen, self.expected)
+        self.assertFalse(any('COUNT(*)' in q['sql'] for q in queries.captured_queries))
+
+        previous = self.client.get(pages[-1]['previous']).data
+        self.assertEqual([item['id'] for item in previous['results']], self.expected[10:20])
+
+    def test_invalid_cursor_returns_404(self) -> None:
+        """
+        Испорченный курсор даёт 404, а без ?cursor= работает обычная постраничная пагинация.
+        """
+        self.assertEqual(self.client.get('/api/vacancies/?cursor=garbage').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get('/api/vacancies/?page=3').data['count'], 25)
+
+
+class WebListPaginationTest(TestCase):
+    """Тесты постраничного вывода и потокового CSV-экспорта в веб-интерфейсе администратора."""
+
+    def setUp(self) -> None:
+        """Администратор и 25 студентов."""
+        self.admin = User.objects.create_user(username='admin', password='pass', is_staff=True)
+        Student.objects.bulk_create([
+            Student(
+                first_name=f'Name{i}', last_name=f'Last{i:02d}', email=f's{i}@test.ru',
+                birth_date=date(2004, 5, 5), specialty='IT',
+            )
+            for i in range(25)
+        ])
+        self.client.force_login(self.admin)
+
+    def test_student_list_is_paginated(self) -> None:
+        """
+        Список студентов выводится страницами по PAGE_SIZE.
+        """
+        response = self.client.get('/manage/students/')
+        self.assertEqual(len(response.context['students']), 20)
+        response = self.client.get('/manage/students/?page=2')
+        self.assertEqual(len(response.context['students']), 5)
+
+    def test_student_list_csv_export_is_streamed(self) -> None:
+        """
+        ?export=csv отдаёт StreamingHttpResponse со всеми строками.
+        """
+        response = self.client.get('/manage/students/?export=csv')
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8').strip().splitlines()
+        self.assertEqual(len(lines), 26)
+        self.assertIn('Last00', lines[1])
+
+
+class AdminChangelistQueriesTest(TestCase):
+    """Тесты отсутствия N+1 в колонках-счётчиках changelist админки."""
+
+    def setUp(self) -> None:
+        """Суперпользователь и компания."""
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.client.force_login(self.admin)
+
+    def add_vacancies(self, count: int) -> None:
+        for i in range(count):
+            Vacancy.objects.create(
+                company=self.company, title=f'Dev {i}', description='d',
+                salary=50000, status='active',
+            )
+
+    def count_queries(self, url: str) -> int:
+        """Запросы к таблицам приложения (без служебных запросов silk и сессий)."""
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sum(
+            1 for query in queries.captured_queries
+            if 'vacancies_' in query['sql'] and 'silk_' not in query['sql']
+        )
+
+    def test_counts_do_not_depend_on_row_count(self) -> None:
+        """
+        Число запросов changelist вакансий и компаний не растёт с числом строк; колонка сортируется.
+        """
+        self.add_vacancies(2)
+        vacancies_small = self.count_queries('/admin/vacancies/vacancy/')
+        companies_small = self.count_queries('/admin/vacancies/company/')
+        self.add_vacancies(8)
+        self.assertEqual(self.count_queries('/admin/vacancies/vacancy/'), vacancies_small)
+        self.assertEqual(self.count_queries('/admin/vacancies/company/'), companies_small)
+        self.assertEqual(self.client.get('/admin/vacancies/vacancy/?o=6').status_code, status.HTTP_200_OK)
+
+
+class VacancyExportTest(TestCase):
+    """Тесты выгрузки вакансий из админки."""
+
+    def setUp(self) -> None:
+        """Суперпользователь, компания, две активные вакансии с заявками."""
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        resume = Resume.objects.create(student=student, experience='exp', contacts='mail', status='active')
+        for i in range(2):
+            vacancy = Vacancy.objects.create(
+                company=self.company, title=f'Dev {i}', description='d', salary=50000, status='active',
+            )
+            Application.objects.create(student=student, vacancy=vacancy, resume=resume)
+        self.client.force_login(self.admin)
+
+    def test_resource_export_without_per_row_queries(self) -> None:
+        """
+        VacancyResource выгружает компанию и число заявок без запросов на каждую строку.
+        """
+        resource = VacancyResource()
+        with CaptureQueriesContext(connection) as queries:
+            dataset = resource.export(resource.get_export_queryset(None))
+        self.assertEqual(len(dataset), 2)
+        self.assertEqual(len(db_queries(queries)), 1)
+        self.assertIn('Co (IT)', dataset.csv)
+
+    def test_stream_csv_and_xlsx(self) -> None:
+        """
+        Потоковые выгрузки отдают все строки в CSV и читаемую книгу XLSX.
+        """
+        response = self.client.get('/admin/vacancies/vacancy/export-stream/csv/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[1].endswith(',1'))
+
+        response = self.client.get('/admin/vacancies/vacancy/export-stream/xlsx/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        self.assertEqual(len(list(workbook.active.rows)), 3)
+
+        response = self.client.get('/admin/vacancies/vacancy/export-stream/pdf/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stream_exports_only_active(self) -> None:
+        """
+        Потоковая выгрузка, как и VacancyResource, пропускает неактивные вакансии.
+        """
+        Vacancy.objects.create(company=self.company, title='Old', description='d', salary=50000, status='closed')
+        response = self.client.get('/admin/vacancies/vacancy/export-stream/csv/')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertNotIn('Old', ''.join(lines))
+
+        response = self.client.get('/admin/vacancies/vacancy/export-stream/csv/?status__exact=closed')
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines()[1:], [])
+
+
+class StatusCountsTest(APITestCase):
+    """Тесты агрегатов по статусам заявок."""
+
+    def setUp(self) -> None:
+        """Студент с тремя заявками в разных статусах."""
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        resume = Resume.objects.create(student=self.student, experience='exp', contacts='mail', status='active')
+        for i, app_status in enumerate(['sent', 'invited', 'invited']):
+            vacancy = Vacancy.objects.create(
+                company=company, title=f'Dev {i}', description='d', salary=50000, status='active',
+            )
+            Application.objects.create(student=self.student, vacancy=vacancy, resume=resume, status=app_status)
+
+    def test_application_status_counts_single_query(self) -> None:
+        """
+        Разбивка по всем статусам считается одним запросом, пустые статусы равны 0.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            counts = application_status_counts()
+        self.assertEqual(len(db_queries(queries)), 1)
+        self.assertEqual(counts['total'], 3)
+        self.assertEqual(counts['invited'], 2)
+        self.assertEqual(counts['accepted'], 0)
+
+    def test_statistics_endpoints_and_command(self) -> None:
+        """
+        Статистика студента, аналитика администратора и команда application_stats согласованы.
+        """
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f'/api/students/{self.student.id}/applications_statistics/')
+        self.assertEqual(response.data, {'total_sent': 3, 'invited': 2, 'rejected': 0, 'accepted': 0})
+
+        response = self.client.get('/api/applications/analytics/')
+        self.assertEqual(response.data['applications_total'], 3)
+        self.assertEqual(response.data['applications_by_status']['invited'], 2)
+        self.assertEqual(response.data['vacancies_active'], 3)
+
+        out = io.StringIO()
+        call_command('application_stats', stdout=out)
+        self.assertIn('Всего заявок: 3', out.getvalue())
+        self.assertIn('Приглашение: 2', out.getvalue())
+
+
+class AnalyticsSnapshotTest(APITestCase):
+    """Тесты инкрементального снимка аналитики."""
+
+    def setUp(self) -> None:
+        """Студент, резюме и три активные вакансии."""
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.resume = Resume.objects.create(student=self.student, experience='exp', contacts='mail', status='active')
+        self.other = Student.objects.create(
+            first_name='Bob', last_name='Ray', email='b@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        self.vacancies = [
+            Vacancy.objects.create(company=company, title=f'Dev {i}', description='d', salary=50000, status='active')
+            for i in range(3)
+        ]
+
+    def apply(self, vacancy: Vacancy, app_status: str = 'sent', student: Student | None = None) -> Application:
+        return Application.objects.create(
+            student=student or self.student, vacancy=vacancy, resume=self.resume, status=app_status,
+        )
+
+    def assert_matches_full_refresh(self) -> None:
+        incremental = AnalyticsSnapshot.objects.values().get(pk=1)
+        call_command('refresh_analytics', stdout=io.StringIO())
+        refreshed = AnalyticsSnapshot.objects.values().get(pk=1)
+        incremental.pop('updated_at')
+        refreshed.pop('updated_at')
+        self.assertEqual(incremental, refreshed)
+
+    def test_incremental_updates_match_full_refresh(self) -> None:
+        """
+        Создание, смена статуса и удаление заявок и вакансий дают тот же снимок, что полный пересчёт.
+        """
+        first, second, third = self.vacancies
+        with self.captureOnCommitCallbacks(execute=True):
+            applications = [self.apply(second), self.apply(second, 'invited', self.other)]
+        with self.captureOnCommitCallbacks(execute=True):
+            applications.append(self.apply(first))
+        self.assert_matches_full_refresh()
+
+        applications[0].status = 'rejected'
+        applications[0].save()
+        third.status = 'closed'
+        third.title = 'Closed dev'
+        with self.captureOnCommitCallbacks(execute=True):
+            third.save()
+            second.title = 'Popular dev'
+            second.save()
+        self.assert_matches_full_refresh()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            applications[1].delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        snapshot = AnalyticsSnapshot.objects.get(pk=1)
+        self.assertEqual(snapshot.vacancies_total, 2)
+        self.assertEqual(snapshot.vacancies_active, 1)
+        self.assertEqual(snapshot.applications_total, 1)
+        self.assertEqual([entry['id'] for entry in snapshot.popular_vacancies], [second.id])
+        self.assert_matches_full_refresh()
+
+    def test_single_update_without_lock_and_one_refresh_on_cascade(self) -> None:
+        """
+        Смена статуса заявки — один UPDATE снимка без SELECT FOR UPDATE; удаление вакансии
+        с заявками пересчитывает топ популярных один раз после коммита.
+        """
+        first = self.vacancies[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            applications = [self.apply(first), self.apply(first, 'viewed', self.other)]
+        applications[0].status = 'invited'
+        with CaptureQueriesContext(connection) as queries:
+            applications[0].save()
+        snapshot_queries = [q['sql'] for q in db_queries(queries) if 'vacancies_analyticssnapshot' in q['sql']]
+        self.assertEqual(len(snapshot_queries), 1)
+        self.assertTrue(snapshot_queries[0].startswith('UPDATE'))
+        self.assertNotIn('FOR UPDATE', snapshot_queries[0])
+        self.assert_matches_full_refresh()
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                first.delete()
+        popular_updates = [
+            q['sql'] for q in db_queries(queries)
+            if q['sql'].startswith('UPDATE "vacancies_analyticssnapshot"') and 'popular_vacancies' in q['sql']
+        ]
+        self.assertEqual(len(popular_updates), 1)
+        self.assertEqual(AnalyticsSnapshot.objects.get(pk=1).popular_vacancies, [])
+        self.assert_matches_full_refresh()
+
+    def test_dashboard_reads_single_row(self) -> None:
+        """
+        Аналитика API читает снимок одним запросом и не считает заявки.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apply(self.vacancies[1])
+        self.client.force_authenticate(self.admin)
+        self.client.get('/api/applications/analytics/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/applications/analytics/')
+        self.assertEqual(response.data['applications_total'], 1)
+        self.assertEqual(response.data['popular_vacancies'][0]['id'], self.vacancies[1].id)
+        snapshot_queries = [q for q in db_queries(queries) if 'vacancies_' in q['sql'] and 'silk_' not in q['sql']]
+        self.assertEqual(len(snapshot_queries), 1)
+        self.assertIn('vacancies_analyticssnapshot', snapshot_queries[0]['sql'])
+
+
+class VacancyListCacheTest(APITestCase):
+    """Тесты кэша списков вакансий."""
+
+    def setUp(self) -> None:
+        """Чистый кэш, студент и активная вакансия."""
+        get_vacancy_cache().clear()
+        self.user = User.objects.create_user(username='st', password='pass', email='st@test.ru')
+        self.student = Student.objects.create(
+            user=self.user, first_name='Ann', last_name='Lee', email='st@test.ru',
+            birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(
+            company=self.company, title='Dev', description='d', salary=50000, status='active',
+        )
+
+    def vacancy_queries(self, url: str) -> tuple[Response, int]:
+        """Ответ и число запросов, строящих аннотированный список (с JOIN заявок)."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        count = sum(1 for query in db_queries(queries) if '"vacancies_application"' in query['sql'])
+        return response, count
+
+    def test_api_list_cached_and_invalidated(self) -> None:
+        """
+        Повторный запрос списка не обращается к БД; изменения вакансий и shortlist сбрасывают кэш.
+        """
+        _, first = self.vacancy_queries('/api/vacancies/?ordering=salary')
+        response, cached = self.vacancy_queries('/api/vacancies/?ordering=salary')
+        self.assertGreater(first, 0)
+        self.assertEqual(cached, 0)
+        self.assertEqual(response.data['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Vacancy.objects.create(company=self.company, title='QA', description='d', salary=40000, status='active')
+        response, _ = self.vacancy_queries('/api/vacancies/?ordering=salary')
+        self.assertEqual(response.data['count'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            add_shortlist_stat(self.vacancy.id)
+        response, _ = self.vacancy_queries('/api/vacancies/?ordering=salary')
+        shortlist_counts = {item['id']: item['shortlist_count'] for item in response.data['results']}
+        self.assertEqual(shortlist_counts[self.vacancy.id], 1)
+
+    def test_invalidation_waits_for_commit(self) -> None:
+        """
+        Поколение кэша меняется после коммита и один раз на транзакцию, а не внутри неё.
+        """
+        generation = get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                Vacancy.objects.create(company=self.company, title=f'QA {i}', description='d', salary=40000)
+            self.assertEqual(get_generation(), generation)
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_is_favorite_per_student_on_cached_list(self) -> None:
+        """
+        Закэшированный список отдаёт is_favorite текущего студента, а не того, кто заполнил кэш.
+        """
+        self.client.get('/api/vacancies/')
+        self.client.force_login(self.user)
+        ShortlistEntry.objects.create(student=self.student, vacancy=self.vacancy)
+        response = self.client.get('/api/vacancies/')
+        self.assertTrue(response.data['results'][0]['is_favorite'])
+        self.client.logout()
+        response = self.client.get('/api/vacancies/')
+        self.assertFalse(response.data['results'][0]['is_favorite'])
+
+    def test_web_list_with_file_backend(self) -> None:
+        """
+        Веб-список вакансий кэшируется и в файловом бэкенде и сбрасывается изменением вакансии.
+        """
+        with tempfile.TemporaryDirectory() as location:
+            caches_setting = {
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'vacancies': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+            }
+            with self.settings(CACHES=caches_setting):
+                self.client.force_login(self.user)
+                self.vacancy_queries('/vacancies/')
+                response, cached = self.vacancy_queries('/vacancies/')
+                self.assertEqual(cached, 0)
+                self.assertContains(response, 'Dev')
+
+                self.vacancy.title = 'Senior Dev'
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.vacancy.save()
+                response, _ = self.vacancy_queries('/vacancies/')
+                self.assertContains(response, 'Senior Dev')
+
+
+class ConditionalGetTest(APITestCase):
+    """Тесты ETag / Last-Modified для вакансий и компаний."""
+
+    def setUp(self) -> None:
+        """Компания и вакансия."""
+        get_vacancy_cache().clear()
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(
+            company=self.company, title='Dev', description='d', salary=50000, status='active',
+        )
+
+    def test_etag_returns_304_without_serializing(self) -> None:
+        """
+        Совпадающий If-None-Match даёт 304 без вызова сериализатора; изменение вакансии меняет ETag.
+        """
+        for url in ['/api/vacancies/', f'/api/vacancies/{self.vacancy.id}/', '/api/companies/']:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('Last-Modified', response)
+            etag = response['ETag']
+            with mock.patch('rest_framework.serializers.Serializer.to_representation') as to_representation:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            to_representation.assert_not_called()
+
+        etag = self.client.get('/api/vacancies/')['ETag']
+        self.vacancy.salary = 60000
+        with self.captureOnCommitCallbacks(execute=True):
+            self.vacancy.save()
+        response = self.client.get('/api/vacancies/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_invalid_pk_returns_404(self) -> None:
+        """
+        Нечисловой id в URL даёт 404, а не ошибку сервера.
+        """
+        for url in ['/api/vacancies/abc/', '/api/companies/abc/']:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_validators_without_table_aggregate(self) -> None:
+        """
+        Попадание в кэш списка и keyset-страница отдают 304 без запросов к вакансиям;
+        список компаний не считает Max/Count по всей таблице.
+        """
+        for url in ['/api/vacancies/', '/api/vacancies/?cursor=']:
+            etag = self.client.get(url)['ETag']
+            for headers in [{}, {'HTTP_IF_NONE_MATCH': etag}]:
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, **headers)
+                self.assertIn(response.status_code, (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED))
+                self.assertFalse([q for q in db_queries(queries) if '"vacancies_vacancy"' in q['sql']])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/companies/')
+        self.assertFalse([q for q in db_queries(queries) if 'MAX(' in q['sql']])
+
+    def test_if_modified_since_and_related_changes(self) -> None:
+        """
+        If-Modified-Since даёт 304, пока данные не менялись; новая заявка меняет ETag списка вакансий.
+        """
+        response = self.client.get(f'/api/companies/{self.company.id}/')
+        last_modified = response['Last-Modified']
+        response = self.client.get(f'/api/companies/{self.company.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = self.client.get('/api/vacancies/')['ETag']
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        resume = Resume.objects.create(student=student, experience='exp', contacts='mail', status='active')
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.create(student=student, vacancy=self.vacancy, resume=resume)
+        response = self.client.get('/api/vacancies/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['applications_count'], 1)
+
+
+class ImportSessionShortlistsTest(TestCase):
+    """Тест переноса shortlist из сессий в ShortlistEntry."""
+
+    def test_import_from_sessions(self) -> None:
+        """
+        Команда переносит id из ключей shortlist_<id> активных сессий и пропускает удалённые вакансии.
+        """
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        vacancy = Vacancy.objects.create(company=company, title='Dev', description='d', salary=1, status='active')
+        session = SessionStore()
+        session[f'shortlist_{student.id}'] = [vacancy.id, vacancy.id + 100]
+        session.create()
+
+        out = io.StringIO()
+        call_command('import_session_shortlists', stdout=out)
+        call_command('import_session_shortlists', stdout=io.StringIO())
+        self.assertEqual(
+            list(ShortlistEntry.objects.values_list('student_id', 'vacancy_id')), [(student.id, vacancy.id)],
+        )
+        self.assertIn('Пропущено (нет студента или вакансии): 1', out.getvalue())
+
+
+class FastReadTest(APITestCase):
+    """Тесты быстрого пути сериализации list/retrieve."""
+
+    def setUp(self) -> None:
+        self.student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(company=company, title='Dev', description='d', salary=1, status='active')
+        self.closed = Vacancy.objects.create(
+            company=company, title='Old', description='d', salary=2, status='closed', closed_at=timezone.now(),
+        )
+        self.resume = Resume.objects.create(student=self.student, experience='exp', contacts='mail')
+        self.resume.skills.set([Skill.objects.create(name='python'), Skill.objects.create(name='sql')])
+        Resume.objects.create(student=self.student, experience='exp2', contacts='mail')
+        Application.objects.create(student=self.student, vacancy=self.vacancy, resume=self.resume)
+
+    def test_matches_model_serializer(self) -> None:
+        """
+        serialize_rows совпадает с ModelSerializer(many=True).data: FK, даты (в т.ч. None), аннотации, M2M.
+        """
+        cases = [
+            (VacancySerializers, annotate_vacancies(Vacancy.objects.all(), self.student).order_by('id')),
+            (VacancySerializers, Vacancy.objects.order_by('id')),
+            (ResumeSerializers, Resume.objects.prefetch_related('skills').order_by('id')),
+            (ResumeSerializers, Resume.objects.order_by('id')),
+            (ApplicationSerializers, Application.objects.all()),
+        ]
+        for serializer_class, queryset in cases:
+            rows = list(queryset)
+            self.assertEqual(serialize_rows(serializer_class, rows), serializer_class(rows, many=True).data)
+
+    def test_api_and_benchmark_command(self) -> None:
+        """
+        API резюме отдаёт быстрый путь без запросов на каждую строку; команда бенчмарка проходит.
+        """
+        self.client.force_authenticate(User.objects.create_user('u', password='p'))
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/resumes/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        skills = {row['id']: row['skills'] for row in response.data['results']}
+        self.assertEqual(sorted(skills[self.resume.id]), sorted(self.resume.skills.values_list('id', flat=True)))
+        skill_queries = [
+            query for query in db_queries(context)
+            if query['sql'].startswith('SELECT') and 'vacancies_skill' in query['sql']
+        ]
+        self.assertEqual(len(skill_queries), 1)
+
+        out = io.StringIO()
+        call_command('benchmark_serializers', rows=5, repeat=1, stdout=out)
+        self.assertIn('ResumeSerializers', out.getvalue())
+        self.assertEqual(Vacancy.objects.count(), 2)
+
+
+class BenchmarkCommandTest(TestCase):
+    """Тест команды run_benchmarks на маленьком наборе данных."""
+
+    def test_run_and_compare(self) -> None:
+        """
+        Команда проходит все сценарии, пишет JSON и сравнивает его с baseline.
+        """
+        output = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+        out = io.StringIO()
+
+        def run(**kwargs: Any) -> None:
+            # команда работает на текущей тестовой БД вместо отдельной, данные откатываются
+            with mock.patch('vacancies.management.commands.run_benchmarks.setup_databases', return_value=[]), \
+                    mock.patch('vacancies.management.commands.run_benchmarks.teardown_databases'), \
+                    transaction.atomic():
+                try:
+                    call_command(
+                        'run_benchmarks', vacancies=40, students=5, applications=20, repeat=1, stdout=out, **kwargs,
+                    )
+                finally:
+                    transaction.set_rollback(True)
+
+        run(output=output)
+        with open(output, encoding='utf-8') as f:
+            baseline = json.load(f)
+        self.assertEqual(baseline['meta']['vacancies'], 40)
+        self.assertGreater(baseline['results']['api_vacancy_list']['queries'], 0)
+
+        baseline['results']['api_vacancy_list']['queries'] = 0
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f)
+        with self.assertRaises(CommandError):
+            run(compare=output, fail_on_regression=True)
+        self.assertIn('api_vacancy_list: время', out.getvalue())
+
+    def test_compare_results(self) -> None:
+        """
+        Регрессия — рост запросов или времени сверх порога; новый сценарий регрессией не считается.
+        """
+        def result(ms: float, queries: int) -> dict:
+            return {'time_ms': {'median': ms}, 'queries': queries, 'peak_memory_kb': 100}
+
+        report = compare_results(
+            {'a': result(10, 3), 'b': result(10, 3)},
+            {'a': result(11, 3), 'b': result(15, 3), 'c': result(1, 1)},
+            threshold=20,
+        )
+        self.assertEqual([(name, regression) for name, _, regression in report], [
+            ('a', False), ('b', True), ('c', False),
+        ])
+
+
+class GenerateFixturesTest(TestCase):
+    """Тесты генератора синтетических данных."""
+
+    def test_generate_with_and_without_history(self) -> None:
+        """
+        Команда создаёт заданное число объектов с навыками резюме и уникальными парами студент–вакансия;
+        --no-history не пишет исторические записи, повторный запуск не конфликтует по email.
+        """
+        options = {'companies': 3, 'vacancies': 12, 'students': 5, 'applications': 23, 'stdout': io.StringIO()}
+        call_command('generate_fixtures', no_history=True, **options)
+        self.assertEqual(Application.objects.count(), 23)
+        self.assertEqual(Application.history.count(), 0)
+        self.assertEqual(Resume.skills.through.objects.count(), 5 * 3)
+        pairs = Application.objects.values_list('student_id', 'vacancy_id')
+        self.assertEqual(len(set(pairs)), 23)
+        self.assertEqual(get_analytics_snapshot().applications_total, 23)
+
+        call_command('generate_fixtures', **options)
+        self.assertEqual(Student.objects.count(), 10)
+        self.assertEqual(Application.history.count(), 23)
+        self.assertEqual(Vacancy.history.count(), 12)
+
+    def test_too_many_applications(self) -> None:
+        """
+        Заявок больше, чем пар студент–вакансия, — ошибка команды.
+        """
+        with self.assertRaises(CommandError):
+            call_command('generate_fixtures', companies=1, vacancies=2, students=2, applications=5,
+                         stdout=io.StringIO())
+
+
+@override_settings(HISTORY_BUFFER_MODE='request', HISTORY_BUFFER_FLUSH_SIZE=100)
+class BufferedHistoryTest(TestCase):
+    """Тесты буферизованной записи simple_history."""
+
+    def setUp(self) -> None:
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.vacancy = Vacancy.objects.create(company=company, title='Dev', description='d', salary=1)
+        self.addCleanup(history_buffer.take)
+
+    def save_committed(self, times: int) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(times):
+                self.vacancy.salary = i + 2
+                self.vacancy.save()
+
+    def test_buffered_until_flush(self) -> None:
+        """
+        Изменения попадают в историю только при сбросе буфера, одним INSERT; откат не оставляет истории.
+        """
+        self.save_committed(3)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.vacancy.save()
+                transaction.set_rollback(True)
+        self.assertFalse(self.vacancy.history.exists())
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(history_buffer.flush(), 3)
+        inserts = [q for q in db_queries(context) if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(list(self.vacancy.history.values_list('salary', flat=True)), [4, 3, 2])
+
+    def test_flush_size_middleware_and_shutdown(self) -> None:
+        """
+        Буфер сбрасывается при HISTORY_BUFFER_FLUSH_SIZE строках, в конце запроса и при завершении процесса.
+        """
+        with self.settings(HISTORY_BUFFER_FLUSH_SIZE=2):
+            self.save_committed(3)
+        self.assertEqual(self.vacancy.history.count(), 2)
+
+        self.client.get('/api/vacancies/')
+        self.assertEqual(self.vacancy.history.count(), 3)
+
+        self.save_committed(1)
+        history_buffer.shutdown()
+        self.assertEqual(self.vacancy.history.count(), 4)
+
+    @override_settings(HISTORY_BUFFER_MODE='sync')
+    def test_sync_mode(self) -> None:
+        """
+        В режиме sync историческая запись создаётся сразу, как в HistoricalRecords.
+        """
+        self.vacancy.save()
+        self.assertEqual(self.vacancy.history.count(), 1)
+        self.assertEqual(history_buffer.size, 0)
+
+
+@override_settings(HISTORY_BUFFER_MODE='sync')
+class CompactHistoryTest(TestCase):
+    """Тесты очистки исторических таблиц."""
+
+    def setUp(self) -> None:
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        vacancy = Vacancy.objects.create(company=company, title='Dev', description='d', salary=1)
+        resume = Resume.objects.create(student=student, experience='exp', contacts='mail')
+        self.application = Application.objects.create(student=student, vacancy=vacancy, resume=resume)
+        # sent(+) → viewed → viewed (без изменений) → invited → rejected
+        for status_code in ['viewed', 'viewed', 'invited', 'rejected']:
+            self.application.status = status_code
+            self.application.save()
+        old = timezone.now() - timedelta(days=200)
+        self.application.history.filter(status__in=['sent', 'viewed']).update(history_date=old)
+
+    def statuses(self) -> list[str]:
+        return list(self.application.history.order_by('history_date', 'history_id').values_list('status', flat=True))
+
+    def test_collapse_and_retention(self) -> None:
+        """
+        Повторный снимок удаляется всегда, старые версии — только за пределами keep_last.
+        """
+        out = io.StringIO()
+        call_command('compact_history', model=['vacancies.Application'], keep_last=3, keep_days=30,
+                     batch_size=1, dry_run=True, stdout=out)
+        self.assertIn('HistoricalApplication: к удалению 2 из 5', out.getvalue())
+        self.assertEqual(len(self.statuses()), 5)
+
+        call_command('compact_history', model=['vacancies.Application'], keep_last=3, keep_days=30,
+                     batch_size=1, stdout=io.StringIO())
+        self.assertEqual(self.statuses(), ['viewed', 'invited', 'rejected'])
+
+    def test_keep_days_protects_recent(self) -> None:
+        """
+        Версии моложе keep_days сохраняются даже сверх keep_last; без collapse повторы остаются.
+        """
+        call_command('compact_history', model=['vacancies.Application'], keep_last=1, keep_days=30,
+                     no_collapse=True, stdout=io.StringIO())
+        self.assertEqual(self.statuses(), ['invited', 'rejected'])
+
+
+@override_settings(HISTORY_BUFFER_MODE='sync')
+class ApplicationBulkStatusTest(APITestCase):
+    """Тесты массовой смены статуса заявок."""
+
+    def setUp(self) -> None:
+        """Администратор и четыре заявки, одна уже в статусе invited."""
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        resume = Resume.objects.create(student=student, experience='exp', contacts='mail', status='active')
+        self.applications = [
+            Application.objects.create(
+                student=student, resume=resume, status=app_status,
+                vacancy=Vacancy.objects.create(
+                    company=company, title=f'Dev {i}', description='d', salary=50000, status='active',
+                ),
+            )
+            for i, app_status in enumerate(['sent', 'sent', 'viewed', 'invited'])
+        ]
+        self.ids = [application.pk for application in self.applications]
+
+    def test_single_update_history_and_snapshot(self) -> None:
+        """
+        Статус меняется одним UPDATE, история и снимок аналитики согласованы с полным пересчётом.
+        """
+        self.client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/applications/bulk_status/', {'ids': self.ids, 'status': 'invited'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'status': 'invited', 'updated': 3})
+        updates = [q for q in db_queries(queries) if q['sql'].startswith('UPDATE "vacancies_application"')]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(Application.objects.exclude(status='invited').exists())
+        self.assertFalse(Application.objects.filter(pk__in=self.ids[:3], response_date__isnull=True).exists())
+
+        changes = Application.history.filter(history_change_reason='Массовая смена статуса')
+        self.assertEqual(changes.count(), 3)
+        self.assertEqual(set(changes.values_list('history_user', flat=True)), {self.admin.pk})
+
+        snapshot = AnalyticsSnapshot.objects.values('applications_by_status').get(pk=1)
+        call_command('refresh_analytics', stdout=io.StringIO())
+        self.assertEqual(snapshot, AnalyticsSnapshot.objects.values('applications_by_status').get(pk=1))
+
+    def test_validation_and_permissions(self) -> None:
+        """
+        Неверный статус и пустой список дают 400, не администратору — 403.
+        """
+        self.client.force_authenticate(self.admin)
+        response = self.client.post('/api/applications/bulk_status/', {'ids': self.ids, 'status': 'hired'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/api/applications/bulk_status/', {'ids': [], 'status': 'viewed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        user = User.objects.create_user(username='user', password='pass')
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/applications/bulk_status/', {'ids': self.ids, 'status': 'viewed'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Application.objects.filter(status='viewed').count(), 1)
+
+    def test_admin_action(self) -> None:
+        """
+        Действие changelist админки меняет статус выбранных заявок.
+        """
+        self.client.force_login(self.admin)
+        response = self.client.post('/admin/vacancies/application/', {
+            'action': 'set_status_rejected', '_selected_action': self.ids[:2],
+        })
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(
+            list(Application.objects.filter(pk__in=self.ids).order_by('pk').values_list('status', flat=True)),
+            ['rejected', 'rejected', 'viewed', 'invited'],
+        )
+
+
+@override_settings(HISTORY_BUFFER_MODE='sync')
+class VacancyImportTest(APITestCase):
+    """Тесты потокового импорта вакансий."""
+
+    def setUp(self) -> None:
+        """Администратор и компания."""
+        get_vacancy_cache().clear()
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@a.ru')
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        self.client.force_authenticate(self.admin)
+
+    def post(self, body: str, content_type: str) -> Response:
+        return self.client.post('/api/vacancies/import/', body.encode(), content_type=content_type)
+
+    def test_ndjson_valid_rows_and_errors(self) -> None:
+        """
+        Валидные строки создаются порциями и попадают в поиск и снимок, ошибки — с номером строки.
+        """
+        rows = [
+            {'company': self.company.pk, 'title': f'Python dev {i}', 'description': 'd',
+             'salary': 1000 + i, 'status': 'active'}
+            for i in range(5)
+        ]
+        rows.insert(2, {'company': self.company.pk, 'title': 'Bad', 'description': 'd', 'salary': 0})
+        lines = [json.dumps(row) for row in rows] + ['', '{broken', json.dumps({'company': 999, 'title': 'X'})]
+        response = self.post('\n'.join(lines), 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(response.data['failed'], 3)
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 8, 9])
+        self.assertIn('salary', response.data['errors'][0]['errors'])
+        self.assertIn('company', response.data['errors'][2]['errors'])
+
+        imported = Vacancy.objects.filter(company=self.company)
+        self.assertEqual(imported.count(), 5)
+        self.assertEqual(set(imported.values_list('created_by', flat=True)), {self.admin.pk})
+        self.assertEqual(Vacancy.history.count(), 5)
+        search = self.client.get('/api/vacancies/?search=python')
+        self.assertEqual(search.data['count'], 5)
+        snapshot = AnalyticsSnapshot.objects.values('vacancies_total', 'vacancies_active').get(pk=1)
+        call_command('refresh_analytics', stdout=io.StringIO())
+        self.assertEqual(snapshot, AnalyticsSnapshot.objects.values('vacancies_total', 'vacancies_active').get(pk=1))
+
+    def test_csv_import_query_count(self) -> None:
+        """
+        CSV: пустые ячейки берут значения по умолчанию, число запросов не зависит от числа строк.
+        """
+        def csv_body(count: int) -> str:
+            lines = ['company,title,description,salary,closed_at']
+            lines += [f'{self.company.pk},Dev {i},"Описание, с запятой",5000,' for i in range(count)]
+            return '\n'.join(lines)
+
+        # первый импорт создаёт снимок аналитики
+        self.post(csv_body(1), 'text/csv')
+        counts = []
+        for count in (2, 20):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post(csv_body(count), 'text/csv')
+            self.assertEqual(response.data['created'], count)
+            counts.append(len([q for q in db_queries(queries) if 'silk_' not in q['sql']]))
+        self.assertEqual(counts[0], counts[1])
+        vacancy = Vacancy.objects.filter(title='Dev 0').first()
+        self.assertEqual(vacancy.description, 'Описание, с запятой')
+        self.assertEqual(vacancy.status, 'draft')
+        self.assertIsNone(vacancy.closed_at)
+
+    def test_permissions_and_media_type(self) -> None:
+        """
+        Неизвестный Content-Type даёт 415, не администратору — 403.
+        """
+        response = self.post('{}', 'application/xml')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.client.force_authenticate(User.objects.create_user(username='user', password='pass'))
+        response = self.post('{}', 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Vacancy.objects.exists())
+
+
+class ResumeMatchingTest(APITestCase):
+    """Тесты подбора вакансий под резюме по навыкам."""
+
+    def setUp(self) -> None:
+        """Справочник навыков, компания и резюме с навыками python и django."""
+        get_vacancy_cache().clear()
+        self.skills = {
+            name: Skill.objects.create(name=name) for name in ['Python', 'Django', 'Docker', 'Java', 'C', 'C++']
+        }
+        self.company = Company.objects.create(name='Co', email='c@co.ru', industry='IT')
+        student = Student.objects.create(
+            first_name='Ann', last_name='Lee', email='s@s.ru', birth_date=date(2004, 5, 5), specialty='IT',
+        )
+        self.resume = Resume.objects.create(student=student, experience='exp', contacts='mail', status='active')
+        self.resume.skills.set([self.skills['Python'], self.skills['Django']])
+
+    def vacancy(self, requirements: str, vacancy_status: str = 'active', days_ago: int = 0) -> Vacancy:
+        return Vacancy.objects.create(
+            company=self.company, title='Dev', description='d', requirements=requirements,
+            salary=50000, status=vacancy_status, published_at=timezone.now() - timedelta(days=days_ago),
+        )
+
+    def test_extract_skills(self) -> None:
+        """
+        Навыки ищутся целыми словами без учёта регистра; «C++» не считается навыком «C».
+        """
+        extractor = SkillExtractor.load()
+        found = extractor.extract('Опыт с PYTHON, javascript и C++; docker-compose')
+        self.assertEqual(found, {self.skills['Python'].pk, self.skills['C++'].pk, self.skills['Docker'].pk})
+
+    def test_matches_endpoint(self) -> None:
+        """
+        Выдача отсортирована по доле покрытых требований; закрытые и новые вакансии учитываются сразу.
+        """
+        full = self.vacancy('Python, Django', days_ago=2)
+        partial = self.vacancy('Python, Django, Docker')
+        single = self.vacancy('Python', days_ago=1)
+        self.vacancy('Java')
+        self.vacancy('Python, Django', vacancy_status='closed')
+
+        response = self.client.get(f'/api/resumes/{self.resume.pk}/matches/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['skills'], ['Django', 'Python'])
+        results = response.data['results']
+        self.assertEqual([r['vacancy']['id'] for r in results], [full.id, single.id, partial.id])
+        self.assertEqual(
+            [(r['matched'], r['required'], r['score']) for r in results], [(2, 2, 1.0), (1, 1, 1.0), (2, 3, 0.667)],
+        )
+        self.assertEqual(results[0]['vacancy']['applications_count'], 0)
+
+        version = get_index_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            newer = self.vacancy('Django, Python')
+            self.assertEqual(get_index_version(), version)
+        response = self.client.get(f'/api/resumes/{self.resume.pk}/matches/?limit=2')
+        self.assertEqual([r['vacancy']['id'] for r in response.data['results']], [newer.id, full.id])
+        response = self.client.get(f'/api/resumes/{self.resume.pk}/matches/?limit=0')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_top_matches_brute_force(self) -> None:
+        """
+        Битовый подсчёт совпадений даёт тот же порядок, что полный перебор; без skills берётся skills_text.
+        """
+        names = list(self.skills)
+        rng = random.Random(1)
+        requirements = [', '.join(rng.sample(names, rng.randint(0, 4))) for _ in range(200)]
+        Vacancy.objects.bulk_create(
+            Vacancy(company=self.company, title='Dev', description='d', requirements=text, status='active',
+                    published_at=timezone.now() - timedelta(minutes=i))
+            for i, text in enumerate(requirements)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_matching_index()
+        self.resume.skills.clear()
+        self.resume.skills_text = 'Python, Docker, C++'
+        self.resume.save()
+
+        index = get_skill_index()
+        extractor = index.extractor
+        wanted = resume_skill_ids(self.resume, extractor)
+        self.assertEqual(len(wanted), 3)
+        expected = []
+        for position, text in enumerate(requirements):
+            required = extractor.extract(text)
+            matched = len(required & wanted)
+            if matched:
+                expected.append((-matched / len(required), -matched, len(required), position, matched))
+        expected.sort()
+        ids = list(Vacancy.objects.order_by('-published_at', '-id').values_list('id', flat=True))
+        self.assertEqual(
+            index.top(wanted, 50),
+            [(ids[position], matched, required) for _, _, required, position, matched in expected[:50]],
         )
-        self.assertTrue(serializer.data['is_favorite'])
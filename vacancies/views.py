@@ -1,221 +1,202 @@
 """
 REST API центра карьеры: вакансии, заявки, shortlist, отзывы.
 
-ViewSet'ы и вспомогательные функции для аннотаций и JSON-хранилища отзывов.
+ViewSet'ы и вспомогательные функции для аннотаций и счётчиков shortlist.
 """
 
 from __future__ import annotations
 
-import json
-from pathlib import Path
 from typing import Any
 
-from django.conf import settings
-from django.db.models import Q, Count, Case, When, Value, IntegerField, FloatField, QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Q, F, Count, Value, Exists, OuterRef, Subquery, BooleanField, IntegerField, FloatField, QuerySet,
+)
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import UnsupportedMediaType
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from .models import Student, Company, Vacancy, Resume, Application
+from .models import (
+    Student, Company, Vacancy, Resume, Application, Review,
+    VacancyShortlistStat, ShortlistEntry,
+)
 from .permissions import (
     IsAdmin, IsStudent, IsAdminOrReadOnly,
     IsAdminOrApplicationOwner, IsAdminOrStudentOwner,
-    get_user_student,
+    get_request_student,
 )
+from .cache import CachedListMixin, invalidate_vacancy_cache, mark_favorites
+from .conditional import ConditionalGetMixin
+from .fastread import FastReadMixin, compile_row_serializer
+from .imports import IMPORT_READERS, import_vacancies
+from .matching import match_vacancies
+from .pagination import VacancyPagination, ApplicationPagination
+from .search import VacancySearchFilter
+from .services import application_status_counts, get_analytics_snapshot, set_application_status
 from .serializers import (
     StudentSerializers,
     CompanySerializers,
     VacancySerializers,
     ResumeSerializers,
     ApplicationSerializers,
+    ApplicationBulkStatusSerializer,
+    ResumeMatchQuerySerializer,
     ReviewSerializers,
 )
 
-REVIEWS_FILE = Path(settings.BASE_DIR) / 'reviews.json'
-SHORTLIST_STATS_FILE = Path(settings.BASE_DIR) / 'shortlist_stats.json'
 
-
-def load_reviews() -> list[dict[str, Any]]:
-    """
-    Загрузить список отзывов из reviews.json.
-
-    Returns:
-        Список словарей отзывов или пустой список, если файла нет.
+def add_shortlist_stat(vacancy_id: int) -> None:
     """
-    if REVIEWS_FILE.exists():
-        with open(REVIEWS_FILE, encoding='utf-8') as f:
-            return json.load(f)
-    return []
-
+    Увеличить счётчик shortlist для вакансии.
 
-def save_reviews(reviews: list[dict[str, Any]]) -> None:
-    """
-    Сохранить список отзывов в reviews.json.
+    Инкремент выполняется одним UPDATE через F(), поэтому параллельные
+    воркеры не теряют добавления. Строка счётчика создаётся при первом клике.
 
     Args:
-        reviews: Полный список отзывов для записи в файл.
+        vacancy_id: Id вакансии.
     """
-    with open(REVIEWS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(reviews, f, ensure_ascii=False, indent=2)
+    counters = VacancyShortlistStat.objects.filter(vacancy_id=vacancy_id)
+    if not counters.update(count=F('count') + 1):
+        VacancyShortlistStat.objects.get_or_create(vacancy_id=vacancy_id)
+        counters.update(count=F('count') + 1)
+    invalidate_vacancy_cache()
 
 
-def load_shortlist_stats() -> dict[str, int]:
+def remove_shortlist_stat(vacancy_id: int) -> None:
     """
-    Загрузить счётчики добавлений в shortlist по вакансиям.
+    Уменьшить счётчик shortlist для вакансии (не ниже нуля).
 
-    Returns:
-        Словарь {vacancy_id: count} или пустой словарь.
+    Args:
+        vacancy_id: Id вакансии.
     """
-    if SHORTLIST_STATS_FILE.exists():
-        with open(SHORTLIST_STATS_FILE, encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+    VacancyShortlistStat.objects.filter(vacancy_id=vacancy_id, count__gt=0).update(count=F('count') - 1)
+    invalidate_vacancy_cache()
 
 
-def save_shortlist_stats(stats: dict[str, int]) -> None:
+def annotate_vacancies(queryset: QuerySet[Vacancy], student: Student | None = None) -> QuerySet[Vacancy]:
     """
-    Сохранить счётчики shortlist в JSON.
+    Аннотации: число заявок, shortlist, средний рейтинг компании, флаг избранного.
 
     Args:
-        stats: Словарь {vacancy_id: count}.
-    """
-    with open(SHORTLIST_STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
-
+        queryset: QuerySet вакансий.
+        student: Текущий студент для is_favorite (None — флаг всегда False).
 
-def add_shortlist_stat(vacancy_id: int) -> None:
+    Returns:
+        QuerySet с полями applications_count, shortlist_count, company_avg_rating, is_favorite.
     """
-    Увеличить счётчик shortlist для вакансии.
+    # подзапрос по индексу vacancy_id вместо JOIN + GROUP BY: страница считает заявки
+    # только своих строк, а в запросе можно использовать функции вроде bm25()
+    applications = (
+        Application.objects.filter(vacancy=OuterRef('pk'))
+        .order_by().values('vacancy').annotate(count=Count('pk')).values('count')
+    )
+    queryset = queryset.annotate(
+        applications_count=Coalesce(Subquery(applications), Value(0), output_field=IntegerField())
+    )
+
+    # LEFT JOIN по первичному ключу VacancyShortlistStat: текст запроса не растёт с числом вакансий
+    queryset = queryset.annotate(
+        shortlist_count=Coalesce(F('shortlist_stat__count'), Value(0), output_field=IntegerField())
+    )
+
+    queryset = queryset.annotate(
+        company_avg_rating=Coalesce(F('company__rating__rating_avg'), Value(0.0), output_field=FloatField())
+    )
+
+    # EXISTS по уникальному индексу (student, vacancy) вместо поиска id в списке
+    if student is not None:
+        is_favorite = Exists(ShortlistEntry.objects.filter(student=student, vacancy=OuterRef('pk')))
+    else:
+        is_favorite = Value(False, output_field=BooleanField())
+    queryset = queryset.annotate(is_favorite=is_favorite)
 
-    Args:
-        vacancy_id: Id вакансии в shortlist_stats.json.
-    """
-    stats = load_shortlist_stats()
-    key = str(vacancy_id)
-    stats[key] = stats.get(key, 0) + 1
-    save_shortlist_stats(stats)
+    return queryset
 
 
-def remove_shortlist_stat(vacancy_id: int) -> None:
+def get_shortlist_ids(student: Student) -> list[int]:
     """
-    Уменьшить счётчик shortlist для вакансии.
+    Id вакансий в shortlist студента, от недавно добавленных.
 
     Args:
-        vacancy_id: Id вакансии в shortlist_stats.json.
+        student: Студент.
+
+    Returns:
+        Список id вакансий.
     """
-    stats = load_shortlist_stats()
-    key = str(vacancy_id)
-    if stats.get(key, 0) > 0:
-        stats[key] -= 1
-    save_shortlist_stats(stats)
+    return list(student.shortlist_entries.values_list('vacancy_id', flat=True))
 
 
-def get_company_avg_ratings() -> dict[int, float]:
+def add_to_student_shortlist(student: Student, vacancy_id: int) -> bool:
     """
-    Средний рейтинг по одобренным отзывам для каждой компании.
+    Добавить вакансию в shortlist студента одной вставкой строки.
 
-    Returns:
-        Словарь {company_id: средний rating}.
-    """
-    ratings = {}
-    counts = {}
-    for review in load_reviews():
-        if not review.get('is_approved'):
-            continue
-        cid = review.get('company_id')
-        if cid is None:
-            continue
-        ratings[cid] = ratings.get(cid, 0) + review.get('rating', 0)
-        counts[cid] = counts.get(cid, 0) + 1
-    return {cid: round(ratings[cid] / counts[cid], 1) for cid in ratings}
-
-
-def annotate_vacancies(queryset: QuerySet[Vacancy]) -> QuerySet[Vacancy]:
-    """
-    Аннотации: число заявок, shortlist, средний рейтинг компании.
+    Повторное добавление упирается в уникальный индекс и ничего не меняет.
 
     Args:
-        queryset: QuerySet вакансий.
+        student: Студент.
+        vacancy_id: Id вакансии.
 
     Returns:
-        QuerySet с полями applications_count, shortlist_count, company_avg_rating.
+        True, если вакансия добавлена (счётчик shortlist увеличен).
     """
-    queryset = queryset.annotate(applications_count=Count('applications'))
+    try:
+        with transaction.atomic():
+            ShortlistEntry.objects.create(student=student, vacancy_id=vacancy_id)
+    except IntegrityError:
+        return False
+    add_shortlist_stat(vacancy_id)
+    return True
 
-    stats = load_shortlist_stats()
-    if stats:
-        shortlist_whens = [
-            When(pk=int(vid), then=Value(cnt))
-            for vid, cnt in stats.items()
-        ]
-        queryset = queryset.annotate(
-            shortlist_count=Case(*shortlist_whens, default=Value(0), output_field=IntegerField())
-        )
-    else:
-        queryset = queryset.annotate(
-            shortlist_count=Value(0, output_field=IntegerField())
-        )
 
-    company_ratings = get_company_avg_ratings()
-    if company_ratings:
-        rating_whens = [
-            When(company_id=int(cid), then=Value(avg))
-            for cid, avg in company_ratings.items()
-        ]
-        queryset = queryset.annotate(
-            company_avg_rating=Case(*rating_whens, default=Value(0.0), output_field=FloatField())
-        )
-    else:
-        queryset = queryset.annotate(
-            company_avg_rating=Value(0.0, output_field=FloatField())
-        )
-
-    return queryset
-
-
-def get_shortlist(request: Request) -> tuple[list[int] | None, str | None]:
+def remove_from_student_shortlist(student: Student, vacancy_id: int) -> bool:
     """
-    Id вакансий в shortlist студента из сессии.
+    Удалить вакансию из shortlist студента одним DELETE.
 
     Args:
-        request: HTTP-запрос API.
+        student: Студент.
+        vacancy_id: Id вакансии.
 
     Returns:
-        Кортеж (список id вакансий, None) или (None, текст ошибки).
+        True, если вакансия была в shortlist (счётчик shortlist уменьшен).
     """
-    student = get_user_student(request.user)
-    if not student:
-        return None, 'Доступ только для студента'
-    key = f'shortlist_{student.id}'
-    return request.session.get(key, []), None
+    deleted, _ = ShortlistEntry.objects.filter(student=student, vacancy_id=vacancy_id).delete()
+    if not deleted:
+        return False
+    remove_shortlist_stat(vacancy_id)
+    return True
 
 
-class VacancyViewSet(viewsets.ModelViewSet):
+class VacancyViewSet(ConditionalGetMixin, CachedListMixin, FastReadMixin, viewsets.ModelViewSet):
     """API вакансий: CRUD, фильтры, shortlist, аннотации."""
 
     serializer_class = VacancySerializers
     permission_classes = [IsAdminOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    pagination_class = VacancyPagination
+    # поиск идёт последним: без ?ordering= он сортирует по релевантности
+    filter_backends = [DjangoFilterBackend, OrderingFilter, VacancySearchFilter]
     filterset_fields = ['company', 'employment_type', 'status', 'published_at', 'closed_at']
     search_fields = ['title', 'description', 'requirements']
     ordering_fields = ['salary', 'published_at', 'closed_at']
     ordering = ['-published_at']
+    # счётчики и рейтинг в ответе меняются без изменения updated_at вакансии
+    use_cache_generation = True
 
-    def get_queryset(self) -> QuerySet[Vacancy]:
+    def get_base_queryset(self) -> QuerySet[Vacancy]:
         """
-        Вакансии с компанией, аннотациями и опциональным фильтром автора.
+        Вакансии с опциональным фильтром автора, без аннотаций.
 
         Returns:
-            QuerySet с select_related, annotate и query-параметрами user/created_by.
+            QuerySet с query-параметрами user/created_by.
         """
-        queryset = annotate_vacancies(
-            Vacancy.objects.select_related('company').all()
-        )
+        queryset = Vacancy.objects.all()
         user_id = self.request.query_params.get('user', None)
         if user_id:
             queryset = queryset.filter(created_by_id=user_id)
@@ -224,21 +205,41 @@ class VacancyViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(created_by_id=created_by)
         return queryset
 
-    def get_serializer_context(self) -> dict[str, Any]:
+    def get_queryset(self) -> QuerySet[Vacancy]:
         """
-        Передать favorite_vacancies в сериализатор для поля is_favorite.
+        Вакансии с компанией, аннотациями и опциональным фильтром автора.
 
         Returns:
-            Контекст сериализатора с id вакансий из shortlist студента.
+            QuerySet с select_related, annotate и query-параметрами user/created_by.
         """
-        context = super().get_serializer_context()
-        student = get_user_student(self.request.user)
-        if student:
-            key = f'shortlist_{student.id}'
-            context['favorite_vacancies'] = self.request.session.get(key, [])
-        else:
-            context['favorite_vacancies'] = []
-        return context
+        return annotate_vacancies(
+            self.get_base_queryset().select_related('company'), get_request_student(self.request),
+        )
+
+    def get_conditional_queryset(self) -> QuerySet[Vacancy]:
+        return self.get_base_queryset()
+
+    def get_favorite_ids(self) -> frozenset[int]:
+        """
+        Id вакансий в shortlist текущего студента (один запрос на запрос API).
+
+        Нужны только для закэшированного списка и ETag; при сериализации
+        is_favorite берётся из аннотации.
+
+        Returns:
+            Множество id вакансий.
+        """
+        if not hasattr(self, '_favorite_ids'):
+            student = get_request_student(self.request)
+            self._favorite_ids = frozenset(get_shortlist_ids(student)) if student else frozenset()
+        return self._favorite_ids
+
+    def personalize(self, data: Any) -> Any:
+        """Список из кэша общий для всех; is_favorite проставляется для текущего студента."""
+        return mark_favorites(data, self.get_favorite_ids())
+
+    def get_etag_extra(self) -> str:
+        return ','.join(map(str, sorted(self.get_favorite_ids())))
 
     # --- студент: shortlist ---
     @action(detail=True, methods=['post'], permission_classes=[IsStudent])
@@ -259,15 +260,9 @@ class VacancyViewSet(viewsets.ModelViewSet):
                 {'error': 'Вакансия недоступна (не активна).'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        student = get_user_student(request.user)
-        key = f'shortlist_{student.id}'
-        shortlist = request.session.get(key, [])
-        vid = int(pk)
-        if vid not in shortlist:
-            shortlist.append(vid)
-            add_shortlist_stat(vid)
-        request.session[key] = shortlist
-        return Response({'shortlist': shortlist})
+        student = get_request_student(request)
+        add_to_student_shortlist(student, vacancy.id)
+        return Response({'shortlist': get_shortlist_ids(student)})
 
     @action(detail=False, methods=['get'], permission_classes=[IsStudent])
     def my_shortlist(self, request: Request) -> Response:
@@ -278,18 +273,18 @@ class VacancyViewSet(viewsets.ModelViewSet):
             request: HTTP-запрос студента.
 
         Returns:
-            Response с сериализованными вакансиями из сессии.
+            Response с сериализованными вакансиями, от недавно добавленных.
         """
-        shortlist, err = get_shortlist(request)
-        if err:
-            return Response({'error': err}, status=status.HTTP_400_BAD_REQUEST)
+        student = get_request_student(request)
+        if not student:
+            return Response({'error': 'Доступ только для студента'}, status=status.HTTP_400_BAD_REQUEST)
         vacancies = annotate_vacancies(
-            Vacancy.objects.filter(id__in=shortlist).select_related('company')
-        )
-        serializer = self.get_serializer(
-            vacancies, many=True,
-            context={'favorite_vacancies': shortlist, 'request': request},
+            Vacancy.objects.filter(shortlist_entries__student=student)
+            .select_related('company')
+            .order_by('-shortlist_entries__created_at'),
+            student,
         )
+        serializer = self.get_serializer(vacancies, many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[IsStudent])
@@ -306,15 +301,9 @@ class VacancyViewSet(viewsets.ModelViewSet):
         Returns:
             Response с обновлённым списком id в shortlist.
         """
-        student = get_user_student(request.user)
-        key = f'shortlist_{student.id}'
-        shortlist = request.session.get(key, [])
-        vid = int(pk)
-        if vid in shortlist:
-            shortlist.remove(vid)
-            remove_shortlist_stat(vid)
-        request.session[key] = shortlist
-        return Response({'shortlist': shortlist})
+        student = get_request_student(request)
+        remove_from_student_shortlist(student, int(pk))
+        return Response({'shortlist': get_shortlist_ids(student)})
 
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def close(self, request: Request, pk: int | None = None) -> Response:
@@ -337,6 +326,28 @@ class VacancyViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(vacancy)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmin], url_path='import')
+    def bulk_import(self, request: Request) -> Response:
+        """
+        Массовый импорт вакансий из тела запроса в NDJSON или CSV.
+
+        Формат задаётся Content-Type (application/x-ndjson, application/jsonl
+        или text/csv). Тело читается потоком, строки проверяются правилами
+        VacancySerializers и вставляются порциями bulk_create.
+
+        Args:
+            request: HTTP-запрос администратора.
+
+        Returns:
+            Response с числом созданных и отклонённых строк и ошибками по номерам строк.
+        """
+        media_type = request.content_type.split(';')[0].strip().lower()
+        reader = IMPORT_READERS.get(media_type)
+        if reader is None:
+            raise UnsupportedMediaType(media_type)
+        report = import_vacancies(reader(request.stream or []), request.user)
+        return Response(report.as_dict())
+
     @action(detail=True, methods=['get'])
     def applications_count(
         self, request: Request, pk: int | None = None,
@@ -373,13 +384,13 @@ class VacancyViewSet(viewsets.ModelViewSet):
         )
 
         vacancies = annotate_vacancies(
-            Vacancy.objects.filter(query).select_related('company').distinct()
+            Vacancy.objects.filter(query).select_related('company').distinct(), get_request_student(request),
         )
         serializer = self.get_serializer(vacancies, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class CompanyViewSet(viewsets.ModelViewSet):
+class CompanyViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """API компаний-работодателей: CRUD для админа, чтение для всех."""
 
     queryset = Company.objects.all()
@@ -419,12 +430,12 @@ class StudentViewSet(viewsets.ModelViewSet):
             Response: total_sent, invited, rejected, accepted.
         """
         student = self.get_object()
-        applications = student.applications.all()
+        counts = application_status_counts(student.applications.all())
         stats = {
-            'total_sent': applications.count(),
-            'invited': applications.filter(status='invited').count(),
-            'rejected': applications.filter(status='rejected').count(),
-            'accepted': applications.filter(status='accepted').count()
+            'total_sent': counts['total'],
+            'invited': counts['invited'],
+            'rejected': counts['rejected'],
+            'accepted': counts['accepted'],
         }
         return Response(stats, status=status.HTTP_200_OK)
 
@@ -488,7 +499,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ResumeViewSet(viewsets.ModelViewSet):
+class ResumeViewSet(FastReadMixin, viewsets.ModelViewSet):
     """API резюме студентов."""
 
     serializer_class = ResumeSerializers
@@ -500,8 +511,8 @@ class ResumeViewSet(viewsets.ModelViewSet):
     ordering = ['title']
 
     def get_queryset(self) -> QuerySet[Resume]:
-        """Резюме с данными студента (select_related)."""
-        return Resume.objects.select_related('student')
+        """Резюме с данными студента (select_related) и навыками (prefetch_related)."""
+        return Resume.objects.select_related('student').prefetch_related('skills')
 
     @action(detail=True, methods=['post'])
     def resume_activate(self, request: Request, pk: int | None = None) -> Response:
@@ -521,11 +532,48 @@ class ResumeViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(resume)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['get'])
+    def matches(self, request: Request, pk: int | None = None) -> Response:
+        """
+        Активные вакансии, лучше всего подходящие резюме по навыкам.
+
+        Оценка — доля требований вакансии, которые покрывают навыки резюме;
+        подбор идёт по индексу навыков в памяти (matching.py).
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+        Args:
+            request: HTTP-запрос с необязательным ?limit= (по умолчанию 20, не больше 100).
+            pk: Id резюме.
+
+        Returns:
+            Response с навыками резюме и вакансиями с оценкой, или 400 при неверном limit.
+        """
+        resume = self.get_object()
+        query = ResumeMatchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        skills, matches = match_vacancies(resume, query.validated_data['limit'])
+        vacancies = annotate_vacancies(
+            Vacancy.objects.filter(pk__in=[vacancy_id for vacancy_id, _, _ in matches]).select_related('company'),
+            get_request_student(request),
+        ).in_bulk()
+        row = compile_row_serializer(VacancySerializers)
+        results = [
+            {
+                'score': round(matched / required, 3),
+                'matched': matched,
+                'required': required,
+                'vacancy': row(vacancies[vacancy_id]),
+            }
+            for vacancy_id, matched, required in matches
+            if vacancy_id in vacancies
+        ]
+        return Response({'resume': resume.pk, 'skills': skills, 'results': results})
+
+
+class ApplicationViewSet(FastReadMixin, viewsets.ModelViewSet):
     """API заявок: создание студентом, просмотр с проверкой прав, статусы."""
 
     serializer_class = ApplicationSerializers
+    pagination_class = ApplicationPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['student', 'vacancy', 'status']
     search_fields = ['cover_letter']
@@ -539,7 +587,9 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         Returns:
             Список экземпляров permission-классов для текущего action.
         """
-        if self.action in ['list', 'change_status', 'analytics', 'update', 'partial_update', 'destroy']:
+        if self.action in [
+            'list', 'change_status', 'bulk_status', 'analytics', 'update', 'partial_update', 'destroy',
+        ]:
             return [IsAdmin()]
         if self.action in ['create', 'my_applications', 'withdraw']:
             return [IsStudent()]
@@ -556,8 +606,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         """
         application = self.get_object()
         self.check_object_permissions(request, application)
-        serializer = self.get_serializer(application)
-        return Response(serializer.data)
+        return Response(compile_row_serializer(self.get_serializer_class())(application))
 
     def get_queryset(self) -> QuerySet[Application]:
         """
@@ -587,7 +636,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         Returns:
             Response со всеми заявками студента.
         """
-        student = get_user_student(request.user)
+        student = get_request_student(request)
         applications = Application.objects.filter(student=student).select_related(
             'student', 'vacancy', 'resume'
         )
@@ -617,6 +666,23 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(application)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmin])
+    def bulk_status(self, request: Request) -> Response:
+        """
+        Массовая смена статуса заявок администратором одним UPDATE.
+
+        Args:
+            request: HTTP-запрос с полями ids (список id заявок) и status.
+
+        Returns:
+            Response с числом изменённых заявок или 400 при неверных данных.
+        """
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        updated = set_application_status(serializer.validated_data['ids'], new_status, request.user)
+        return Response({'status': new_status, 'updated': updated})
+
     # --- администратор: аналитика ---
     @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
     def analytics(self, request: Request) -> Response:
@@ -627,13 +693,18 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             request: HTTP-запрос администратора.
 
         Returns:
-            Response: число вакансий, активных вакансий, заявок и студентов.
+            Response: число вакансий, активных вакансий, заявок (с разбивкой по статусам),
+            студентов и топ вакансий по числу заявок из снимка аналитики.
         """
+        snapshot = get_analytics_snapshot()
         stats = {
-            'vacancies_total': Vacancy.objects.count(),
-            'vacancies_active': Vacancy.objects.filter(status='active').count(),
-            'applications_total': Application.objects.count(),
-            'students_total': Student.objects.count(),
+            'vacancies_total': snapshot.vacancies_total,
+            'vacancies_active': snapshot.vacancies_active,
+            'applications_total': snapshot.applications_total,
+            'applications_by_status': snapshot.applications_by_status,
+            'students_total': snapshot.students_total,
+            'popular_vacancies': snapshot.popular_vacancies,
+            'updated_at': snapshot.updated_at,
         }
         return Response(stats)
 
@@ -650,7 +721,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
             Response с заявкой или 403, если не автор.
         """
         application = self.get_object()
-        student = get_user_student(request.user)
+        student = get_request_student(request)
         if application.student_id != student.id:
             return Response({'error': 'Нет доступа'}, status=status.HTTP_403_FORBIDDEN)
         application.status = 'withdrawn'
@@ -664,18 +735,24 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 @permission_classes([AllowAny])
 def reviews_list(request: Request) -> Response:
     """
-    Список отзывов; гостям и студентам — только одобренные.
+    Список отзывов постранично; гостям и студентам — только одобренные.
 
     Args:
-        request: HTTP-запрос.
+        request: HTTP-запрос с опциональными page и company.
 
     Returns:
-        Response со списком отзывов из reviews.json.
+        Response со страницей отзывов.
     """
-    reviews = load_reviews()
+    reviews = Review.objects.all()
     if not request.user.is_authenticated or not request.user.is_staff:
-        reviews = [r for r in reviews if r.get('is_approved')]
-    return Response(reviews)
+        reviews = reviews.filter(is_approved=True)
+    company_id = request.query_params.get('company')
+    if company_id:
+        reviews = reviews.filter(company_id=company_id)
+    paginator = PageNumberPagination()
+    page = paginator.paginate_queryset(reviews, request)
+    serializer = ReviewSerializers(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['POST'])
@@ -692,14 +769,8 @@ def reviews_create(request: Request) -> Response:
     """
     serializer = ReviewSerializers(data=request.data, context={'request': request})
     serializer.is_valid(raise_exception=True)
-    reviews = load_reviews()
-    new_id = max([r.get('id', 0) for r in reviews], default=0) + 1
-    review = serializer.validated_data.copy()
-    review['id'] = new_id
-    review['is_approved'] = False
-    reviews.append(review)
-    save_reviews(reviews)
-    return Response(review, status=status.HTTP_201_CREATED)
+    serializer.save()
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 @api_view(['PATCH', 'DELETE'])
@@ -708,32 +779,29 @@ def review_moderate(request: Request, review_id: int) -> Response:
     """
     Модерация отзыва: PATCH (одобрение/правка) или DELETE.
 
+    Строка отзыва блокируется до проверки и изменения, поэтому параллельные
+    одобрения или удаления одного отзыва не учитывают его в рейтинге компании
+    дважды; сам рейтинг меняют сигналы Review в той же транзакции.
+
     Args:
         request: HTTP-запрос администратора.
-        review_id: Id отзыва в reviews.json.
+        review_id: Id отзыва.
 
     Returns:
         Response с отзывом, 204 при DELETE или 404, если не найден.
     """
-    reviews = load_reviews()
-    review = None
-    for r in reviews:
-        if r.get('id') == review_id:
-            review = r
-            break
-    if not review:
-        return Response({'error': 'Отзыв не найден'}, status=status.HTTP_404_NOT_FOUND)
-
-    if request.method == 'DELETE':
-        reviews.remove(review)
-        save_reviews(reviews)
-        return Response(status=status.HTTP_204_NO_CONTENT)
-
-    review['is_approved'] = request.data.get('is_approved', True)
-    if 'text' in request.data:
-        review['text'] = request.data['text']
-    if 'rating' in request.data:
-        review['rating'] = request.data['rating']
-    save_reviews(reviews)
-    return Response(review)
-
+    with transaction.atomic():
+        review = Review.objects.select_for_update().filter(pk=review_id).first()
+        if not review:
+            return Response({'error': 'Отзыв не найден'}, status=status.HTTP_404_NOT_FOUND)
+
+        if request.method == 'DELETE':
+            review.delete()
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        data = request.data.copy()
+        data.setdefault('is_approved', True)
+        serializer = ReviewSerializers(review, data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+    return Response(serializer.data)
@@ -4,13 +4,23 @@ from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
-from django.db.models import Count
+from django.core.paginator import Paginator
+from django.db import transaction
 from django.utils import timezone
 from django.shortcuts import render, redirect, get_object_or_404
 from django.core.exceptions import ValidationError
 
-from .models import Student, Company, Vacancy, Resume, Application
-from .views import load_reviews, save_reviews, add_shortlist_stat, remove_shortlist_stat, annotate_vacancies
+from .models import Student, Company, Vacancy, Resume, Application, Review, ShortlistEntry
+from .cache import cached_page
+from .exports import EXPORT_CHUNK_SIZE, stream_csv
+from .permissions import get_request_student
+from .services import get_analytics_snapshot
+from .views import (
+    add_to_student_shortlist, annotate_vacancies, get_shortlist_ids,
+    remove_from_student_shortlist,
+)
+
+PAGE_SIZE = 20
 
 
 def is_admin(user):
@@ -22,9 +32,7 @@ def admin_required(view):
 
 
 def get_current_student(request):
-    if not request.user.is_authenticated or request.user.is_staff:
-        return None
-    return Student.objects.filter(email=request.user.email).first()
+    return get_request_student(request)
 
 
 def student_required(view):
@@ -40,21 +48,27 @@ def student_required(view):
     return wrapper
 
 
-def get_shortlist_ids(request, student):
-    return request.session.get(f'shortlist_{student.id}', [])
+def get_shortlist_vacancies(student):
+    return (
+        Vacancy.objects.filter(shortlist_entries__student=student)
+        .select_related('company')
+        .order_by('-shortlist_entries__created_at')
+    )
+
 
+def paginate(request, queryset, per_page=PAGE_SIZE, scope=None):
+    if scope is None:
+        page_obj = Paginator(queryset, per_page).get_page(request.GET.get('page'))
+    else:
+        page_obj = cached_page(request, queryset, per_page, scope)
+    params = request.GET.copy()
+    params.pop('page', None)
+    page_query = params.urlencode()
+    return page_obj, f'{page_query}&' if page_query else ''
 
-def enrich_reviews(reviews):
-    if not reviews:
-        return []
-    company_ids = {r.get('company_id') for r in reviews if r.get('company_id') is not None}
-    names = dict(Company.objects.filter(id__in=company_ids).values_list('id', 'name'))
-    result = []
-    for r in reviews:
-        item = dict(r)
-        item['company_name'] = names.get(r.get('company_id'), '—')
-        result.append(item)
-    return result
+
+def wants_export(request):
+    return request.GET.get('export') == 'csv'
 
 
 def index(request):
@@ -94,6 +108,7 @@ def register_view(request):
             try:
                 user = User.objects.create_user(username=username, password=password, email=email)
                 student = Student(
+                    user=user,
                     first_name=request.POST.get('first_name'),
                     last_name=request.POST.get('last_name'),
                     email=email,
@@ -104,7 +119,7 @@ def register_view(request):
                 )
                 student.full_clean()
                 student.save()
-                login(request, user)
+                login(request, user, backend='vacancies.backends.StudentModelBackend')
                 return redirect('student_cabinet')
             except (ValidationError, ValueError) as e:
                 error = str(e)
@@ -120,34 +135,34 @@ def logout_view(request):
 @login_required
 def vacancy_list(request):
     vacancies = annotate_vacancies(
-        Vacancy.objects.select_related('company').all()
+        Vacancy.objects.select_related('company').order_by('-published_at', '-id')
     )
     if not request.user.is_staff:
         vacancies = vacancies.filter(status='active')
+    scope = 'web:staff' if request.user.is_staff else 'web:public'
+    page_obj, page_query = paginate(request, vacancies, scope=scope)
     student = get_current_student(request)
-    shortlist = get_shortlist_ids(request, student) if student else []
+    shortlist = set(get_shortlist_ids(student)) if student else set()
     return render(request, 'vacancies/vacancy_list.html', {
-        'vacancies': vacancies,
+        'vacancies': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
         'shortlist': shortlist,
     })
 
 
 @login_required
 def vacancy_detail(request, pk):
+    student = get_current_student(request)
     vacancy = get_object_or_404(
-        annotate_vacancies(Vacancy.objects.select_related('company')),
+        annotate_vacancies(Vacancy.objects.select_related('company'), student),
         pk=pk,
     )
-    student = get_current_student(request)
-    shortlist = get_shortlist_ids(request, student) if student else []
-    reviews = enrich_reviews([
-        r for r in load_reviews()
-        if r.get('is_approved') and r.get('company_id') == vacancy.company_id
-    ])
+    reviews = Review.objects.filter(company_id=vacancy.company_id, is_approved=True)[:PAGE_SIZE]
     return render(request, 'vacancies/vacancy_detail.html', {
         'vacancy': vacancy,
         'is_student': student is not None,
-        'is_favorite': pk in shortlist,
+        'is_favorite': vacancy.is_favorite,
         'reviews': reviews,
     })
 
@@ -158,33 +173,19 @@ def favorite_add(request, pk, student):
     if vacancy.status != 'active':
         messages.error(request, 'Вакансия недоступна (не активна).')
         return redirect('vacancy_detail', pk=pk)
-    key = f'shortlist_{student.id}'
-    shortlist = request.session.get(key, [])
-    if pk not in shortlist:
-        shortlist.append(pk)
-        add_shortlist_stat(pk)
-    request.session[key] = shortlist
+    add_to_student_shortlist(student, pk)
     return redirect('vacancy_detail', pk=pk)
 
 
 @student_required
 def favorite_remove(request, pk, student):
-    key = f'shortlist_{student.id}'
-    shortlist = request.session.get(key, [])
-    if pk in shortlist:
-        shortlist.remove(pk)
-        remove_shortlist_stat(pk)
-    request.session[key] = shortlist
+    remove_from_student_shortlist(student, pk)
     return redirect('favorites_list')
 
 
 @student_required
 def favorites_list(request, student):
-    ids = get_shortlist_ids(request, student)
-    vacancies = (
-        annotate_vacancies(Vacancy.objects.filter(id__in=ids).select_related('company'))
-        if ids else Vacancy.objects.none()
-    )
+    vacancies = annotate_vacancies(get_shortlist_vacancies(student), student)
     return render(request, 'vacancies/favorites_list.html', {'vacancies': vacancies})
 
 
@@ -210,11 +211,8 @@ def application_add(request, vacancy_id, student):
                 cover_letter=request.POST.get('cover_letter', ''),
                 employer_comment='',
             )
-            key = f'shortlist_{student.id}'
-            shortlist = request.session.get(key, [])
-            if vacancy_id in shortlist:
-                shortlist.remove(vacancy_id)
-                request.session[key] = shortlist
+            # вакансия, на которую подана заявка, уходит из shortlist (счётчик добавлений не меняется)
+            ShortlistEntry.objects.filter(student=student, vacancy=vacancy).delete()
             return redirect('student_cabinet')
     return render(request, 'vacancies/application_form.html', {
         'vacancy': vacancy,
@@ -229,9 +227,8 @@ def application_add(request, vacancy_id, student):
 def student_cabinet(request, student):
     applications = student.applications.select_related('vacancy').all()
     resumes = student.resumes.all()
-    ids = get_shortlist_ids(request, student)
-    favorites = Vacancy.objects.filter(id__in=ids).select_related('company') if ids else Vacancy.objects.none()
-    my_reviews = enrich_reviews([r for r in load_reviews() if r.get('student_id') == student.id])
+    favorites = get_shortlist_vacancies(student)
+    my_reviews = student.reviews.select_related('company')
     return render(request, 'vacancies/student_cabinet.html', {
         'student': student,
         'applications': applications,
@@ -265,6 +262,8 @@ def student_form(request, pk=None):
             student.faculty = request.POST.get('faculty', '')
             if request.user.is_staff:
                 student.email = request.POST.get('email')
+            if student.user_id is None:
+                student.user = User.objects.filter(email=student.email, student__isnull=True).order_by('id').first()
             student.full_clean()
             student.save()
             if request.user.is_staff:
@@ -310,16 +309,18 @@ def resume_form(request, student, pk=None, student_id=None):
 # --- студент: отзывы ---
 @login_required
 def review_list(request):
-    reviews = load_reviews()
+    reviews = Review.objects.select_related('company')
     if not request.user.is_staff:
-        reviews = [r for r in reviews if r.get('is_approved')]
+        reviews = reviews.filter(is_approved=True)
     company_id = request.GET.get('company')
     if company_id:
-        reviews = [r for r in reviews if str(r.get('company_id')) == company_id]
-    reviews = enrich_reviews(reviews)
+        reviews = reviews.filter(company_id=company_id)
+    page_obj, page_query = paginate(request, reviews)
     student = get_current_student(request)
     return render(request, 'vacancies/review_list.html', {
-        'reviews': reviews,
+        'reviews': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
         'companies': Company.objects.all(),
         'company_id': company_id or '',
         'is_student': student is not None,
@@ -338,17 +339,12 @@ def review_add(request, student):
         if not has_app:
             error = 'Отзыв можно оставить только о компании, на вакансию которой вы подавали заявку'
         else:
-            reviews = load_reviews()
-            new_id = max([r.get('id', 0) for r in reviews], default=0) + 1
-            reviews.append({
-                'id': new_id,
-                'student_id': student.id,
-                'company_id': company_id,
-                'rating': int(request.POST.get('rating', 5)),
-                'text': request.POST.get('text'),
-                'is_approved': False,
-            })
-            save_reviews(reviews)
+            Review.objects.create(
+                student=student,
+                company_id=company_id,
+                rating=int(request.POST.get('rating', 5)),
+                text=request.POST.get('text'),
+            )
             return redirect('student_cabinet')
     return render(request, 'vacancies/review_form.html', {'companies': companies, 'error': error})
 
@@ -405,8 +401,20 @@ def vacancy_delete(request, pk):
 
 @admin_required
 def company_list(request):
+    companies = Company.objects.order_by('industry', 'id')
+    if wants_export(request):
+        return stream_csv(
+            'companies.csv',
+            ['id', 'Название', 'Отрасль', 'Email', 'Телефон', 'Сайт'],
+            companies.values_list('id', 'name', 'industry', 'email', 'phone', 'website').iterator(
+                chunk_size=EXPORT_CHUNK_SIZE,
+            ),
+        )
+    page_obj, page_query = paginate(request, companies)
     return render(request, 'vacancies/company_list.html', {
-        'companies': Company.objects.all(),
+        'companies': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
     })
 
 
@@ -454,14 +462,26 @@ def company_delete(request, pk):
 # --- админ: заявки и студенты ---
 @admin_required
 def application_list(request):
-    applications = Application.objects.select_related(
-        'student', 'vacancy', 'vacancy__company', 'resume'
-    ).all()
+    applications = Application.objects.order_by('-submitted_at', '-id')
     status_filter = request.GET.get('status')
     if status_filter:
         applications = applications.filter(status=status_filter)
+    if wants_export(request):
+        return stream_csv(
+            'applications.csv',
+            ['id', 'Фамилия', 'Имя', 'Email', 'Вакансия', 'Компания', 'Дата подачи', 'Статус'],
+            applications.values_list(
+                'id', 'student__last_name', 'student__first_name', 'student__email',
+                'vacancy__title', 'vacancy__company__name', 'submitted_at', 'status',
+            ).iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        )
+    page_obj, page_query = paginate(
+        request, applications.select_related('student', 'vacancy', 'vacancy__company'),
+    )
     return render(request, 'vacancies/application_list.html', {
-        'applications': applications,
+        'applications': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
         'status_choices': Application.STATUS_CHOICES,
         'status_filter': status_filter or '',
     })
@@ -498,15 +518,40 @@ def application_quick_status(request, pk, status):
 
 @admin_required
 def student_list(request):
+    students = Student.objects.order_by('last_name', 'first_name', 'id')
+    if wants_export(request):
+        return stream_csv(
+            'students.csv',
+            ['id', 'Фамилия', 'Имя', 'Email', 'Курс', 'Специальность', 'Группа', 'Факультет'],
+            students.values_list(
+                'id', 'last_name', 'first_name', 'email', 'course', 'specialty', 'group', 'faculty',
+            ).iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        )
+    page_obj, page_query = paginate(request, students)
     return render(request, 'vacancies/student_list.html', {
-        'students': Student.objects.all(),
+        'students': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
     })
 
 
 @admin_required
 def user_list(request):
-    users = User.objects.all().order_by('username')
-    return render(request, 'vacancies/user_list.html', {'users': users})
+    users = User.objects.order_by('username')
+    if wants_export(request):
+        return stream_csv(
+            'users.csv',
+            ['id', 'Логин', 'Email', 'Активен', 'Админ', 'Последний вход'],
+            users.values_list('id', 'username', 'email', 'is_active', 'is_staff', 'last_login').iterator(
+                chunk_size=EXPORT_CHUNK_SIZE,
+            ),
+        )
+    page_obj, page_query = paginate(request, users)
+    return render(request, 'vacancies/user_list.html', {
+        'users': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
+    })
 
 
 @admin_required
@@ -530,31 +575,38 @@ def user_toggle_staff(request, pk):
 # --- админ: отзывы и аналитика ---
 @admin_required
 def review_moderate_list(request):
+    reviews = Review.objects.select_related('company').order_by('is_approved', '-created_at', '-id')
+    page_obj, page_query = paginate(request, reviews)
     return render(request, 'vacancies/review_moderate_list.html', {
-        'reviews': enrich_reviews(load_reviews()),
+        'reviews': page_obj,
+        'page_obj': page_obj,
+        'page_query': page_query,
     })
 
 
 @admin_required
 def review_moderate(request, review_id, action):
-    reviews = load_reviews()
-    if action == 'approve':
-        for r in reviews:
-            if r.get('id') == review_id:
-                r['is_approved'] = True
-                break
-    elif action == 'delete':
-        reviews = [r for r in reviews if r.get('id') != review_id]
-    save_reviews(reviews)
+    with transaction.atomic():
+        # блокировка строки: параллельное одобрение не учтёт отзыв в рейтинге дважды
+        review = get_object_or_404(Review.objects.select_for_update(), pk=review_id)
+        if action == 'approve' and not review.is_approved:
+            review.is_approved = True
+            review.save(update_fields=['is_approved'])
+        elif action == 'delete':
+            review.delete()
     return redirect('review_moderate_list')
 
 
 @admin_required
 def analytics(request):
-    popular = Vacancy.objects.annotate(app_count=Count('applications')).order_by('-app_count')[:5]
+    snapshot = get_analytics_snapshot()
     return render(request, 'vacancies/analytics.html', {
-        'applications_total': Application.objects.count(),
-        'active_vacancies': Vacancy.objects.filter(status='active').count(),
-        'students_count': Student.objects.count(),
-        'popular_vacancies': popular,
+        'applications_total': snapshot.applications_total,
+        'applications_by_status': [
+            (name, snapshot.applications_by_status.get(code, 0)) for code, name in Application.STATUS_CHOICES
+        ],
+        'active_vacancies': snapshot.vacancies_active,
+        'students_count': snapshot.students_total,
+        'popular_vacancies': snapshot.popular_vacancies,
+        'updated_at': snapshot.updated_at,
     })